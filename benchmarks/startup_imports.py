@@ -0,0 +1,124 @@
+"""
+Startup import benchmark
+
+Measures the cold import cost of Chrona's entry points, tab modules and heavy
+third-party dependencies. Every module is imported in a fresh interpreter with
+``python -X importtime`` so nothing is shared between measurements, the same
+way a new container or Streamlit server process starts.
+
+Usage:
+    python benchmarks/startup_imports.py
+    python benchmarks/startup_imports.py --repeat 5 --modules main components.analytics
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What a cold start imports, then each tab, then the heavy libraries behind them
+DEFAULT_MODULES = [
+    "main",
+    "ui_components",
+    "schedule_optimizer",
+    "components.task_builder",
+    "components.schedule_upload",
+    "components.google_calendar",
+    "components.analytics",
+    "pandas",
+    "numpy",
+    "matplotlib.pyplot",
+    "google.genai",
+    "googleapiclient.discovery",
+]
+
+
+def measure_import(module, python=sys.executable):
+    """
+    Import a module in a fresh interpreter and measure its cost.
+
+    Args:
+        module: Dotted module name to import
+        python: Interpreter to run
+
+    Returns:
+        dict: wall_ms for the whole process, import_ms from -X importtime
+        (cumulative time of the module itself), modules (number of modules
+        loaded) and error (None, or the last line of stderr on failure)
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    import_us = None
+    loaded = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [part.strip() for part in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        loaded += 1
+        if parts[2].strip() == module:
+            import_us = int(parts[1])
+
+    error = None
+    if completed.returncode != 0:
+        lines = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        error = lines[-1] if lines else f"exit code {completed.returncode}"
+
+    return {
+        "wall_ms": wall_ms,
+        "import_ms": import_us / 1000 if import_us is not None else None,
+        "modules": loaded,
+        "error": error
+    }
+
+
+def run_benchmark(modules, repeat):
+    """Measure every module repeat times and return median results, costliest first"""
+    results = []
+    for module in modules:
+        runs = [measure_import(module) for _ in range(repeat)]
+        errors = [run["error"] for run in runs if run["error"]]
+        import_times = [run["import_ms"] for run in runs if run["import_ms"] is not None]
+        results.append({
+            "module": module,
+            "import_ms": statistics.median(import_times) if import_times and not errors else None,
+            "wall_ms": statistics.median(run["wall_ms"] for run in runs),
+            "modules": runs[-1]["modules"],
+            "error": errors[0] if errors else None
+        })
+    return sorted(results, key=lambda result: -(result["import_ms"] or 0))
+
+
+def print_report(results, repeat):
+    """Print results as a table"""
+    print(f"Cold import cost (median of {repeat} fresh interpreter(s))\n")
+    print(f"{'Module':<32} {'Import ms':>10} {'Process ms':>11} {'Modules':>8}")
+    print("-" * 64)
+    for result in results:
+        if result["error"]:
+            print(f"{result['module']:<32} {'unavailable':>10}   {result['error'][:60]}")
+            continue
+        print(f"{result['module']:<32} {result['import_ms']:>10.1f} {result['wall_ms']:>11.1f} {result['modules']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import cost per module")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module (default 3)")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES, help="Modules to measure")
+    args = parser.parse_args()
+
+    print_report(run_benchmark(args.modules, max(1, args.repeat)), max(1, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
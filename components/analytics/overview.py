@@ -6,6 +6,7 @@ import datetime
 from datetime import timedelta
 
 from .data_manager import get_analytics_data, calculate_key_metrics
+from ..figure_cache import FigureCache, display_cached_figure, display_figure
 
 def render_overview_analytics():
     """Render overview analytics dashboard"""
@@ -52,6 +53,11 @@ def _render_empty_state():
     demo_dates = [datetime.datetime.now() - timedelta(days=x) for x in range(7, 0, -1)]
     demo_scores = [78, 82, 85, 79, 88, 91, 85]
     
+    # The demo only changes when the date does
+    cache_key = FigureCache.make_key("demo_trend", datetime.date.today(), demo_scores)
+    if display_cached_figure(cache_key):
+        return
+    
     fig, ax = plt.subplots(figsize=(10, 4))
     ax.plot(mdates.date2num(demo_dates), demo_scores, marker='o', linewidth=2, markersize=6, color='#4CAF50')
     ax.set_title('Weekly Productivity Trend (Demo)', fontsize=14, fontweight='bold')
@@ -60,8 +66,7 @@ def _render_empty_state():
     ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
     plt.xticks(rotation=45)
     plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+    display_figure(fig, cache_key)
 
 def _render_key_metrics(metrics):
     """Render key metrics display"""
@@ -84,6 +89,10 @@ def _render_productivity_trend(sessions):
     dates = [s['timestamp'] for s in sessions]
     scores = [s.get('productivity_score', 0) for s in sessions]
     
+    cache_key = FigureCache.make_key("productivity_trend", dates, scores)
+    if display_cached_figure(cache_key):
+        return
+    
     fig, ax = plt.subplots(figsize=(12, 6))
     ax.plot(dates, scores, marker='o', linewidth=2, markersize=6, color='#2196F3')
     ax.set_title('Productivity Score Over Time', fontsize=16, fontweight='bold')
@@ -105,8 +114,7 @@ def _render_productivity_trend(sessions):
         ax.legend()
     
     plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+    display_figure(fig, cache_key)
 
 def _render_recent_insights(sessions):
     """Render recent insights section"""
@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from .data_manager import get_analytics_data
+from ..figure_cache import FigureCache, display_cached_figure, display_figure
 
 def render_productivity_metrics():
     """Render productivity metrics and patterns"""
@@ -39,6 +40,10 @@ def _render_productivity_distribution(sessions):
 
 def _render_productivity_histogram(scores):
     """Render productivity score histogram"""
+    cache_key = FigureCache.make_key("productivity_histogram", scores)
+    if display_cached_figure(cache_key):
+        return
+    
     fig, ax = plt.subplots(figsize=(8, 6))
     ax.hist(scores, bins=10, alpha=0.7, color='#4CAF50', edgecolor='black')
     ax.set_title('Productivity Score Distribution', fontweight='bold')
@@ -47,8 +52,7 @@ def _render_productivity_histogram(scores):
     ax.axvline(float(np.mean(scores)), color='red', linestyle='--', label=f'Average: {np.mean(scores):.1f}')
     ax.legend()
     plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+    display_figure(fig, cache_key)
 
 def _render_productivity_statistics(scores):
     """Render productivity statistics"""
@@ -69,6 +73,11 @@ def _render_session_patterns(sessions):
     # Tasks per session trend
     task_counts = [s.get('total_tasks', 0) for s in sessions]
     session_numbers = list(range(1, len(sessions) + 1))
+    time_per_session = [s.get('total_duration', 0) for s in sessions]
+    
+    cache_key = FigureCache.make_key("session_patterns", task_counts, time_per_session)
+    if display_cached_figure(cache_key):
+        return
     
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
     
@@ -79,7 +88,6 @@ def _render_session_patterns(sessions):
     ax1.grid(True, alpha=0.3)
     
     # Time per session
-    time_per_session = [s.get('total_duration', 0) for s in sessions]
     ax2.plot(session_numbers, time_per_session, marker='s', color='#FF9800')
     ax2.set_title('Total Time per Session Over Time', fontweight='bold')
     ax2.set_xlabel('Session Number')
@@ -87,5 +95,4 @@ def _render_session_patterns(sessions):
     ax2.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig) 
\ No newline at end of file
+    display_figure(fig, cache_key) 
\ No newline at end of file
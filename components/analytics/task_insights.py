@@ -5,6 +5,7 @@ import numpy as np
 import datetime
 
 from .data_manager import clear_analytics_data
+from ..figure_cache import FigureCache, display_cached_figure, display_figure
 
 def render_task_insights(optimizer):
     """Render task-specific insights and analysis"""
@@ -41,6 +42,10 @@ def _render_task_patterns(tasks):
     st.metric("Longest Task", f"{max(durations)} minutes")
     
     # Duration distribution
+    cache_key = FigureCache.make_key("duration_histogram", durations)
+    if display_cached_figure(cache_key):
+        return
+    
     fig, ax = plt.subplots(figsize=(8, 5))
     ax.hist(durations, bins=8, alpha=0.7, color='#9C27B0', edgecolor='black')
     ax.set_title('Task Duration Distribution', fontweight='bold')
@@ -49,8 +54,7 @@ def _render_task_patterns(tasks):
     ax.axvline(float(avg_duration), color='red', linestyle='--', label=f'Average: {avg_duration:.0f}m')
     ax.legend()
     plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+    display_figure(fig, cache_key)
 
 def _render_recommendations(tasks):
     """Render smart recommendations based on task patterns"""
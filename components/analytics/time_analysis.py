@@ -3,6 +3,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 
+from ..figure_cache import FigureCache, display_cached_figure, display_figure
+
 def render_time_analysis(optimizer):
     """Render time analysis charts and insights"""
     st.markdown("### ⏰ Time Distribution Analysis")
@@ -33,20 +35,10 @@ def _render_category_analysis(tasks):
     if not category_time:
         return
     
-    # Create pie chart
-    fig, ax = plt.subplots(figsize=(10, 8))
-    
     categories = list(category_time.keys())
     durations = list(category_time.values())
-    colors = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC', '#99CCFF']
     
-    pie_result = ax.pie(durations, labels=categories, autopct='%1.1f%%', 
-                       colors=colors[:len(categories)], startangle=90)
-    ax.set_title('Time Distribution by Category', fontsize=16, fontweight='bold')
-    
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+    _render_category_chart(categories, durations)
     
     # Category breakdown table
     category_df = pd.DataFrame([
@@ -61,6 +53,24 @@ def _render_category_analysis(tasks):
     
     st.dataframe(category_df, use_container_width=True)
 
+def _render_category_chart(categories, durations):
+    """Render category distribution pie chart"""
+    cache_key = FigureCache.make_key("category_pie", categories, durations)
+    if display_cached_figure(cache_key):
+        return
+    
+    # Create pie chart
+    fig, ax = plt.subplots(figsize=(10, 8))
+    
+    colors = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC', '#99CCFF']
+    
+    pie_result = ax.pie(durations, labels=categories, autopct='%1.1f%%', 
+                       colors=colors[:len(categories)], startangle=90)
+    ax.set_title('Time Distribution by Category', fontsize=16, fontweight='bold')
+    
+    plt.tight_layout()
+    display_figure(fig, cache_key)
+
 def _render_priority_analysis(tasks):
     """Render priority time distribution analysis"""
     st.markdown("#### 🎯 Time by Priority")
@@ -84,6 +94,10 @@ def _render_priority_analysis(tasks):
 
 def _render_priority_chart(priority_time):
     """Render priority distribution bar chart"""
+    cache_key = FigureCache.make_key("priority_bars", priority_time)
+    if display_cached_figure(cache_key):
+        return
+    
     fig, ax = plt.subplots(figsize=(8, 6))
     
     priorities = list(priority_time.keys())
@@ -102,8 +116,7 @@ def _render_priority_chart(priority_time):
                f'{int(height)}m', ha='center', va='bottom')
     
     plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+    display_figure(fig, cache_key)
 
 def _render_priority_insights(priority_time):
     """Render priority insights and recommendations"""
@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
+from models.schedule_model import parse_duration_text
+from .figure_cache import FigureCache, display_cached_figure, display_figure
 
 def render_daily_summary(optimized_result):
     """
@@ -36,14 +38,9 @@ def render_daily_summary(optimized_result):
         with st.container():
             st.subheader("⏰ Time Breakdown")
             
-            # Parse time strings to get hours
+            # Parse summary durations to hours
             def parse_time(time_str):
-                if "hour" in time_str:
-                    parts = time_str.split()
-                    hours = float(parts[0])  # Use float to handle decimal hours like "7.5"
-                    minutes = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 0
-                    return hours + minutes/60
-                return 0
+                return parse_duration_text(time_str) / 60
             
             work_hours = parse_time(summary.get("total_work_time", "0 hours"))
             personal_hours = parse_time(summary.get("personal_time", "0 hours"))
@@ -63,59 +60,69 @@ def render_daily_summary(optimized_result):
             # Filter out activities with 0 hours to prevent 0.0% slices
             time_df = time_df[time_df['Hours'] > 0]
             
-            # Create matplotlib pie chart with legend instead of direct labels
-            plt.style.use('dark_background')
-            fig, ax = plt.subplots(figsize=(10, 8))
-            
-            colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
-            # Use only the colors we need based on filtered data
-            filtered_colors = colors[:len(time_df)]
-            
-            # Create pie chart with legend instead of direct labels
-            pie_result = ax.pie(time_df['Hours'].tolist(), 
-                               colors=filtered_colors, 
-                               autopct='%1.1f%%', 
-                               startangle=90,
-                               textprops={'fontsize': 12, 'fontweight': 'bold'},
-                               pctdistance=0.75)
-            
-            # Handle variable return values from pie()
-            if len(pie_result) == 3:
-                wedges, texts, autotexts = pie_result
-                # Enhance percentage text styling
-                for autotext in autotexts:
-                    autotext.set_color('white')
-                    autotext.set_fontweight('bold')
-                    autotext.set_fontsize(12)
-            else:
-                wedges, texts = pie_result
-                autotexts = []
-            
-            # Create legend instead of direct labels to prevent overlap
-            ax.legend(wedges, time_df['Activity'].tolist(),
-                     title="Activities",
-                     title_fontsize=14,
-                     fontsize=12,
-                     loc="center left",
-                     bbox_to_anchor=(1, 0, 0.5, 1),
-                     frameon=True,
-                     facecolor='#1a1a1a',
-                     edgecolor='white',
-                     labelcolor='white')
-            
-            ax.set_title('Daily Time Distribution', fontsize=18, color='white', fontweight='bold', pad=30)
-            
-            # Equal aspect ratio ensures that pie is drawn as a circle
-            ax.axis('equal')
-            
-            # Style the plot with better margins
-            fig.patch.set_facecolor('#0F0F0F')
-            plt.tight_layout(pad=2.0)
-            
-            # Display the chart
-            st.pyplot(fig)
-            
-            # Clear the figure to free memory
-            plt.close(fig)
+            _render_time_breakdown_chart(time_df)
+    
+    # Recommendations moved to schedule display area (above chat)
+
+def _render_time_breakdown_chart(time_df):
+    """
+    Render the daily time breakdown pie chart, reusing the cached image when unchanged.
+    
+    Args:
+        time_df: DataFrame with Activity and Hours columns
+    """
+    # Create matplotlib pie chart with legend instead of direct labels
+    plt.style.use('dark_background')
+    cache_key = FigureCache.make_key("time_breakdown", time_df)
+    if display_cached_figure(cache_key):
+        return
+    
+    fig, ax = plt.subplots(figsize=(10, 8))
+    
+    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
+    # Use only the colors we need based on filtered data
+    filtered_colors = colors[:len(time_df)]
+    
+    # Create pie chart with legend instead of direct labels
+    pie_result = ax.pie(time_df['Hours'].tolist(), 
+                       colors=filtered_colors, 
+                       autopct='%1.1f%%', 
+                       startangle=90,
+                       textprops={'fontsize': 12, 'fontweight': 'bold'},
+                       pctdistance=0.75)
+    
+    # Handle variable return values from pie()
+    if len(pie_result) == 3:
+        wedges, texts, autotexts = pie_result
+        # Enhance percentage text styling
+        for autotext in autotexts:
+            autotext.set_color('white')
+            autotext.set_fontweight('bold')
+            autotext.set_fontsize(12)
+    else:
+        wedges, texts = pie_result
+        autotexts = []
+    
+    # Create legend instead of direct labels to prevent overlap
+    ax.legend(wedges, time_df['Activity'].tolist(),
+             title="Activities",
+             title_fontsize=14,
+             fontsize=12,
+             loc="center left",
+             bbox_to_anchor=(1, 0, 0.5, 1),
+             frameon=True,
+             facecolor='#1a1a1a',
+             edgecolor='white',
+             labelcolor='white')
+    
+    ax.set_title('Daily Time Distribution', fontsize=18, color='white', fontweight='bold', pad=30)
+    
+    # Equal aspect ratio ensures that pie is drawn as a circle
+    ax.axis('equal')
+    
+    # Style the plot with better margins
+    fig.patch.set_facecolor('#0F0F0F')
+    plt.tight_layout(pad=2.0)
     
-    # Recommendations moved to schedule display area (above chat) 
\ No newline at end of file
+    # Display the chart and cache the rendered image
+    display_figure(fig, cache_key)
\ No newline at end of file
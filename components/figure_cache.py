@@ -0,0 +1,134 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import matplotlib
+import matplotlib.pyplot as plt
+import pandas as pd
+import streamlit as st
+
+# Same rasterization settings st.pyplot uses, so cached charts look identical
+FIGURE_DPI = 200
+
+# rcParams that change how a figure looks; part of every key so style changes miss
+STYLE_PARAMS = ("figure.facecolor", "axes.facecolor", "axes.edgecolor", "text.color",
+                "axes.labelcolor", "xtick.color", "ytick.color")
+
+
+class FigureCache:
+    """LRU cache of rendered chart images.
+
+    Streamlit reruns the whole script on every widget change, so without a
+    cache each matplotlib chart is rebuilt and rasterized even when its data
+    did not change. Keys hash the chart's input data together with its
+    display options; values are the PNG bytes of the rendered figure.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max(1, max_entries)
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls) -> "FigureCache":
+        """Get the process-wide cache, configured from the environment"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                try:
+                    max_entries = int(os.getenv("CHRONA_FIGURE_CACHE_SIZE", 64))
+                except ValueError:
+                    max_entries = 64
+                cls._shared = cls(max_entries=max_entries)
+            return cls._shared
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Hash chart inputs and options into a cache key"""
+        digest = hashlib.sha256()
+        for part in parts + tuple(matplotlib.rcParams[param] for param in STYLE_PARAMS):
+            if isinstance(part, pd.DataFrame):
+                digest.update(repr(list(part.columns)).encode("utf-8"))
+                digest.update(pd.util.hash_pandas_object(part.astype(str), index=False).values.tobytes())
+            else:
+                digest.update(repr(part).encode("utf-8"))
+            digest.update(b"\x1f")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a cached image, marking it most recently used"""
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._images.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def set(self, key: str, image: bytes):
+        """Store an image, evicting the least recently used ones over the limit"""
+        with self._lock:
+            self._images[key] = image
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached images"""
+        with self._lock:
+            self._images.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache size and hit/miss counts"""
+        with self._lock:
+            return {
+                "entries": len(self._images),
+                "bytes": sum(len(image) for image in self._images.values()),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+def display_cached_figure(cache_key: str) -> bool:
+    """
+    Show a previously rendered chart if it is cached.
+
+    Args:
+        cache_key: Key from FigureCache.make_key
+
+    Returns:
+        bool: True if the cached image was displayed and drawing can be skipped
+    """
+    image = FigureCache.shared().get(cache_key)
+    if image is None:
+        return False
+    st.image(image)
+    return True
+
+
+def display_figure(fig, cache_key: Optional[str] = None):
+    """
+    Rasterize a figure once, cache it and show it in place of st.pyplot.
+
+    Args:
+        fig: The matplotlib figure to display; it is closed afterwards
+        cache_key: Key from FigureCache.make_key, or None to skip caching
+    """
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format="png", dpi=FIGURE_DPI, bbox_inches="tight")
+    finally:
+        plt.close(fig)
+
+    image = buffer.getvalue()
+    if cache_key is not None:
+        FigureCache.shared().set(cache_key, image)
+    st.image(image)
@@ -6,9 +6,18 @@ broken down into specialized components for better organization and maintainabil
 
 Components:
 - auth: Handles Google Calendar API authentication and authorization
+- service_factory: Shares credentials and a pool of API services across sessions
 - export: Manages exporting tasks to Google Calendar
+- batch: Sends event inserts as batch requests
+- request_executor: Rate-limits and retries every Calendar API call
+- event_store: Stores synced events on disk with start/end indexes
+- incremental: Keeps the event store current with sync tokens
+- reconcile: Sends only the changes between the schedule and exported events
 - import_calendar: Handles importing events from Google Calendar
+- calendars: Caches the calendar list and imports from several calendars concurrently
+- availability: Finds busy time across calendars for the schedulers to avoid
 - sync: Manages sync status, history, and operations
+- auto_sync: Runs automatic sync on a background thread
 - settings: Provides settings and configuration management
 - ui: Handles main UI rendering and dashboard components
 
@@ -34,6 +43,10 @@ from .export import (
     get_calendar_list
 )
 
+from .batch import insert_events
+
+from .availability import get_busy_intervals
+
 from .import_calendar import (
     import_calendar_events,
     import_calendar_events_range,
@@ -65,6 +78,8 @@ __all__ = [
     'export_tasks_to_calendar',
     'sync_tasks_to_calendar',
     'get_calendar_list',
+    'insert_events',
+    'get_busy_intervals',
     'import_calendar_events',
     'import_calendar_events_range',
     'get_upcoming_events',
@@ -5,21 +5,26 @@ This module handles Google Calendar API authentication including:
 - OAuth 2.0 authentication flow
 - Credential management and storage
 - Token refresh handling
-- Service initialization
+- Handing out services from the shared service factory
 """
 
 import streamlit as st
 import os
+from importlib.util import find_spec
 
-# Google Calendar API imports
+from .auto_sync import AutoSyncScheduler
+from .calendars import CalendarListCache
+from .event_store import EventStore
+from .service_factory import SCOPES, CalendarServiceFactory
+
+# Google Calendar API packages are only imported when authenticating; checking
+# for them here keeps the discovery stack out of the import path of every page
 try:
-    from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import Flow
-    from google.auth.transport.requests import Request
-    from googleapiclient.discovery import build
-    from google.oauth2 import service_account
-    GOOGLE_CALENDAR_AVAILABLE = True
-except ImportError:
+    GOOGLE_CALENDAR_AVAILABLE = all(
+        find_spec(module) is not None
+        for module in ("google.oauth2", "google.auth", "google_auth_oauthlib", "googleapiclient")
+    )
+except (ImportError, ValueError):
     GOOGLE_CALENDAR_AVAILABLE = False
 
 def check_google_calendar_api():
@@ -32,59 +37,47 @@ def authenticate_google_calendar():
         return False
     
     try:
-        # Define scopes
-        SCOPES = ['https://www.googleapis.com/auth/calendar']
+        from google_auth_oauthlib.flow import Flow
         
-        # Load credentials
-        creds = None
-        if os.path.exists('token.json'):
-            creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+        # Load saved credentials, refreshed if they are about to expire
+        factory = CalendarServiceFactory.shared()
         
         # If there are no (valid) credentials available, let the user log in
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                flow = Flow.from_client_secrets_file(
-                    'google_calendar_credentials.json', SCOPES)
-                flow.redirect_uri = 'http://localhost:8501'
-                
-                # Generate authorization URL
-                auth_url, _ = flow.authorization_url(prompt='consent')
-                st.markdown(f"[🔗 Click here to authorize Google Calendar access]({auth_url})")
+        if not factory.load_credentials():
+            flow = Flow.from_client_secrets_file(
+                factory.credentials_path, SCOPES)
+            flow.redirect_uri = 'http://localhost:8501'
+            
+            # Generate authorization URL
+            auth_url, _ = flow.authorization_url(prompt='consent')
+            st.markdown(f"[🔗 Click here to authorize Google Calendar access]({auth_url})")
+            
+            # Get authorization code from user
+            auth_code = st.text_input("Enter the authorization code:")
+            if not auth_code:
+                return False
+            
+            try:
+                flow.fetch_token(code=auth_code)
                 
-                # Get authorization code from user
-                auth_code = st.text_input("Enter the authorization code:")
-                if auth_code:
-                    try:
-                        flow.fetch_token(code=auth_code)
-                        creds = flow.credentials
-                        
-                        # Save credentials for next run
-                        with open('token.json', 'w') as token:
-                            token.write(creds.to_json())
-                        
-                        st.session_state.calendar_service = build('calendar', 'v3', credentials=creds)
-                        return True
-                    except Exception as e:
-                        st.error(f"Authentication failed: {str(e)}")
-                        return False
-                else:
-                    return False
+                # Save credentials for next run
+                factory.save_credentials(flow.credentials)
+            except Exception as e:
+                st.error(f"Authentication failed: {str(e)}")
+                return False
         
         # Create service
-        st.session_state.calendar_service = build('calendar', 'v3', credentials=creds)
-        return True
+        return factory.get_service() is not None
         
     except Exception as e:
         st.error(f"Authentication error: {str(e)}")
         return False
 
 def get_calendar_service():
-    """Get authenticated Google Calendar service"""
-    if 'calendar_service' not in st.session_state:
+    """Get authenticated Google Calendar service for the calling thread"""
+    if not is_authenticated():
         return None
-    return st.session_state.calendar_service
+    return CalendarServiceFactory.shared().get_service()
 
 def is_authenticated():
     """Check if user is authenticated with Google Calendar"""
@@ -92,14 +85,21 @@ def is_authenticated():
 
 def disconnect_calendar():
     """Disconnect from Google Calendar"""
-    if 'calendar_service' in st.session_state:
-        del st.session_state.calendar_service
     if 'calendar_authenticated' in st.session_state:
         del st.session_state.calendar_authenticated
+    if 'calendar_sync_engine' in st.session_state:
+        del st.session_state.calendar_sync_engine
+    if 'calendar_import' in st.session_state:
+        del st.session_state.calendar_import
+    st.session_state.pop('calendar_import_events', None)
+    
+    # Stop background sync and forget events synced from this account
+    AutoSyncScheduler.shared().configure(False, AutoSyncScheduler.shared().interval_seconds)
+    EventStore.shared().clear()
+    CalendarListCache.shared().clear()
     
-    # Remove token file
-    if os.path.exists('token.json'):
-        os.remove('token.json')
+    # Drop cached credentials and services, and remove the token file
+    CalendarServiceFactory.shared().forget()
 
 def render_authentication_section():
     """Render Google Calendar authentication section"""
@@ -111,7 +111,7 @@ def render_authentication_section():
         st.info("🔑 **Connect your Google Calendar account to sync your optimized schedules.**")
         
         # Check if credentials file exists
-        if not os.path.exists('google_calendar_credentials.json'):
+        if not os.path.exists(CalendarServiceFactory.shared().credentials_path):
             st.warning("⚠️ **Google Calendar credentials not found.** Please follow the setup guide to configure OAuth credentials.")
             with st.expander("📖 Setup Instructions"):
                 render_setup_instructions()
@@ -123,6 +123,9 @@ def render_authentication_section():
                 success = authenticate_google_calendar()
                 if success:
                     st.session_state.calendar_authenticated = True
+                    # Background sync is on by default for a newly connected account
+                    scheduler = AutoSyncScheduler.shared()
+                    scheduler.configure(True, scheduler.interval_seconds)
                     st.success("✅ Successfully connected to Google Calendar!")
                     st.rerun()
                 else:
@@ -0,0 +1,184 @@
+"""
+Google Calendar Auto-Sync Module
+
+This module runs automatic sync in the background including:
+- A daemon thread per process syncing at the configured interval
+- Coalescing triggers that arrive while a sync is queued or running
+- Exporting the latest submitted schedule without blocking the page
+- Publishing results for the sync status page to read
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .event_store import EventStore
+from .incremental import IncrementalSync
+from .reconcile import reconcile_events
+from .service_factory import CalendarServiceFactory
+
+# Seconds between background syncs for each Sync Interval setting; incremental
+# syncs are cheap, so "Real-time" polls every minute
+SYNC_INTERVAL_SECONDS = {
+    "Real-time": 60,
+    "Every 15 minutes": 900,
+    "Every hour": 3600,
+    "Daily": 86400
+}
+
+class AutoSyncScheduler:
+    """Background scheduler for automatic calendar sync.
+
+    Sessions only hand over schedule snapshots; the sync itself runs on a
+    daemon thread, so page interactions never wait on the Calendar API. Any
+    number of triggers before a run starts collapse into that one run, and
+    only the newest schedule snapshot is exported. The scheduler owns its
+    settings: they change only when someone edits them, never because a
+    session reran with different widget state.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, calendar_id: str = 'primary', history_size: int = 20):
+        self.calendar_id = calendar_id
+        self.enabled = False
+        self.configured = False
+        self.interval_seconds = SYNC_INTERVAL_SECONDS["Every hour"]
+        self._condition = threading.Condition()
+        self._thread = None
+        self._triggered = False
+        self._running = False
+        self._pending_export = None
+        self._next_run = None
+        self._sequence = 0
+        self._history = deque(maxlen=history_size)
+
+    @classmethod
+    def shared(cls) -> "AutoSyncScheduler":
+        """Get the process-wide scheduler"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def configure(self, enabled: bool, interval_seconds: float):
+        """
+        Turn background sync on or off and set its interval.
+
+        Args:
+            enabled: Whether automatic sync should run
+            interval_seconds: Seconds between syncs
+        """
+        with self._condition:
+            changed = enabled != self.enabled or interval_seconds != self.interval_seconds
+            self.configured = True
+            self.enabled = enabled
+            self.interval_seconds = max(1, interval_seconds)
+            if not enabled:
+                self._pending_export = None
+                self._next_run = None
+            elif self._next_run is None:
+                # Sync as soon as auto-sync is switched on
+                self._next_run = time.monotonic()
+            else:
+                self._next_run = min(self._next_run, time.monotonic() + self.interval_seconds)
+
+            if enabled and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name="calendar-auto-sync", daemon=True)
+                self._thread.start()
+            if changed:
+                self._condition.notify_all()
+
+    def trigger(self):
+        """Ask for a sync as soon as possible; repeated calls before it starts are merged"""
+        with self._condition:
+            if not self.enabled:
+                return
+            self._triggered = True
+            self._condition.notify_all()
+
+    def submit_export(self, events: Dict[str, Dict]):
+        """
+        Queue a schedule snapshot for export and trigger a sync.
+
+        Args:
+            events: Task key to event body, replacing any snapshot not yet exported
+        """
+        with self._condition:
+            if not self.enabled:
+                return
+            self._pending_export = events
+            self._triggered = True
+            self._condition.notify_all()
+
+    def status(self) -> Dict:
+        """Get the scheduler state for display"""
+        with self._condition:
+            next_in = None
+            if self.enabled and self._next_run is not None:
+                next_in = max(0.0, self._next_run - time.monotonic())
+            return {
+                'enabled': self.enabled,
+                'interval_seconds': self.interval_seconds,
+                'running': self._running,
+                'next_run_in': next_in,
+                'last_result': self._history[-1] if self._history else None
+            }
+
+    def latest_sequence(self) -> int:
+        """Get the sequence number of the newest published result (0 if none)"""
+        with self._condition:
+            return self._sequence
+
+    def results_since(self, sequence: int) -> List[Dict]:
+        """Get published results newer than a sequence number, oldest first"""
+        with self._condition:
+            return [result for result in self._history if result['sequence'] > sequence]
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if not self.enabled:
+                        self._condition.wait()
+                        continue
+                    wait = self._next_run - time.monotonic() if self._next_run is not None else self.interval_seconds
+                    if self._triggered or wait <= 0:
+                        break
+                    self._condition.wait(wait)
+
+                self._triggered = False
+                self._running = True
+                events = self._pending_export
+                self._pending_export = None
+
+            result = self._sync_once(events)
+
+            with self._condition:
+                self._running = False
+                if result['error'] and events is not None and self._pending_export is None:
+                    # Keep the snapshot for the next run unless a newer one arrived
+                    self._pending_export = events
+                self._sequence += 1
+                result['sequence'] = self._sequence
+                self._history.append(result)
+                self._next_run = time.monotonic() + self.interval_seconds
+
+    def _sync_once(self, events: Optional[Dict[str, Dict]]) -> Dict:
+        """Pull calendar changes and export the pending schedule, if any"""
+        result = {'time': datetime.now(), 'import': None, 'export': None, 'error': None}
+        try:
+            service = CalendarServiceFactory.shared().get_service()
+            if service is None:
+                result['error'] = "Not connected to Google Calendar"
+                return result
+
+            result['import'] = IncrementalSync(EventStore.shared()).sync(service, self.calendar_id)
+            if events is not None:
+                result['export'] = reconcile_events(service, events, calendar_id=self.calendar_id)
+        except Exception as e:
+            result['error'] = str(e)
+        return result
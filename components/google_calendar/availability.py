@@ -0,0 +1,187 @@
+"""
+Google Calendar Availability Module
+
+This module finds the user's existing calendar commitments including:
+- One freebusy query covering the whole schedule horizon
+- Reading busy time from the local event store when it is fresh
+- Merging busy periods across calendars
+- Splitting busy time into per-day minute intervals for the schedulers
+"""
+
+import datetime
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .event_store import EventStore, parse_event_time
+from .incremental import SYNC_MAX_AGE_SECONDS
+from .reconcile import KEY_PROPERTY
+from .request_executor import execute_request
+from .service_factory import CalendarServiceFactory
+
+Period = Tuple[datetime.datetime, datetime.datetime]
+
+MINUTES_PER_DAY = 24 * 60
+
+def schedule_window(num_days: int, start_date: Optional[datetime.date] = None) -> Period:
+    """Get the local start and end of a schedule whose day 1 is start_date (defaults to today)"""
+    start_date = start_date or datetime.date.today()
+    start = datetime.datetime.combine(start_date, datetime.time.min).astimezone()
+    end = datetime.datetime.combine(start_date + datetime.timedelta(days=num_days), datetime.time.min).astimezone()
+    return start, end
+
+def merge_periods(periods: List[Period]) -> List[Period]:
+    """Merge overlapping or touching busy periods into a sorted list"""
+    merged = []
+    for start, end in sorted(periods):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def is_blocking(event: Dict) -> bool:
+    """Check whether an event occupies time the scheduler must keep free"""
+    if event.get('status') == 'cancelled' or event.get('transparency') == 'transparent':
+        return False
+    # All-day events mark the day (holidays, birthdays) rather than a time slot
+    if 'dateTime' not in event.get('start', {}):
+        return False
+    # Events exported from a previous schedule are replaced, not worked around
+    return KEY_PROPERTY not in event.get('extendedProperties', {}).get('private', {})
+
+def event_period(event: Dict) -> Optional[Period]:
+    """Get an event's start and end, or None if either is missing"""
+    start = parse_event_time(event.get('start'))
+    end = parse_event_time(event.get('end'))
+    return (start, end) if start is not None and end is not None and end > start else None
+
+def busy_periods_from_store(store: EventStore, calendar_ids: List[str],
+                            start: datetime.datetime, end: datetime.datetime) -> List[Period]:
+    """Get merged busy periods from synced events without calling the API"""
+    periods = []
+    for calendar_id in calendar_ids:
+        for event in store.events_between(calendar_id, start, end):
+            period = event_period(event) if is_blocking(event) else None
+            if period is not None:
+                periods.append(period)
+    return merge_periods(periods)
+
+def query_freebusy(service, calendar_ids: List[str], start: datetime.datetime, end: datetime.datetime,
+                   store: Optional[EventStore] = None) -> List[Period]:
+    """
+    Get merged busy periods of several calendars with a single freebusy call.
+
+    Args:
+        service: Google Calendar API service
+        calendar_ids: Calendars to check
+        start: Range start
+        end: Range end
+        store: Event store used to recognize events exported from a previous schedule
+
+    Returns:
+        list: Sorted, non-overlapping (start, end) UTC datetimes
+    """
+    body = {
+        'timeMin': start.astimezone(datetime.timezone.utc).isoformat().replace('+00:00', 'Z'),
+        'timeMax': end.astimezone(datetime.timezone.utc).isoformat().replace('+00:00', 'Z'),
+        'items': [{'id': calendar_id} for calendar_id in calendar_ids]
+    }
+    response = execute_request(service.freebusy().query(body=body))
+
+    periods = []
+    for calendar in response.get('calendars', {}).values():
+        # Calendars the user cannot read report errors instead of busy times
+        for busy in calendar.get('busy', []):
+            period = event_period({'start': {'dateTime': busy.get('start')}, 'end': {'dateTime': busy.get('end')}})
+            if period is not None:
+                periods.append(period)
+
+    # freebusy cannot tell our own exported events apart; drop periods that
+    # lie entirely within one of them so a re-optimization can move them
+    store = store or EventStore.shared()
+    exported = [event_period(event) for calendar_id in calendar_ids
+                for event in store.find_exported_events(calendar_id, KEY_PROPERTY)]
+    exported = [period for period in exported if period is not None]
+    return [
+        period for period in merge_periods(periods)
+        if not any(own_start <= period[0] and period[1] <= own_end for own_start, own_end in exported)
+    ]
+
+def split_by_day(periods: List[Period], start: datetime.datetime, num_days: int) -> List[List[Tuple[int, int]]]:
+    """
+    Split busy periods into per-day intervals in local minutes since midnight.
+
+    Args:
+        periods: Sorted, non-overlapping busy periods
+        start: Local midnight of day 1
+        num_days: Days in the schedule
+
+    Returns:
+        list: One sorted list of (start_minute, end_minute) per day; periods
+        crossing midnight are split, and an end of 1440 means midnight
+    """
+    days = []
+    for day_idx in range(num_days):
+        day_date = start.date() + datetime.timedelta(days=day_idx)
+        day_start = datetime.datetime.combine(day_date, datetime.time.min).astimezone()
+        day_end = datetime.datetime.combine(day_date + datetime.timedelta(days=1), datetime.time.min).astimezone()
+
+        intervals = []
+        for period_start, period_end in periods:
+            if period_end <= day_start or period_start >= day_end:
+                continue
+            local_start = max(period_start, day_start).astimezone()
+            local_end = min(period_end, day_end).astimezone()
+            start_minute = local_start.hour * 60 + local_start.minute
+            end_minute = (MINUTES_PER_DAY if period_end >= day_end
+                          else local_end.hour * 60 + local_end.minute + (1 if local_end.second else 0))
+            if end_minute > start_minute:
+                intervals.append((start_minute, end_minute))
+        days.append(intervals)
+    return days
+
+def store_is_fresh(store: EventStore, calendar_ids: List[str], start: datetime.datetime,
+                   max_age: float = SYNC_MAX_AGE_SECONDS) -> bool:
+    """Check whether every calendar was synced recently and its sync window reaches start"""
+    for calendar_id in calendar_ids:
+        last_synced = store.last_synced(calendar_id)
+        if last_synced is None or time.time() - last_synced >= max_age or not store.covers(calendar_id, start):
+            return False
+    return True
+
+def get_busy_intervals(calendar_ids: List[str], num_days: int, start_date: Optional[datetime.date] = None,
+                       service=None, store: Optional[EventStore] = None,
+                       max_age: float = SYNC_MAX_AGE_SECONDS) -> Dict:
+    """
+    Find the time already taken in the user's calendars over a schedule horizon.
+
+    Reads the local event store when every calendar was synced within
+    max_age; otherwise makes one freebusy call for all calendars and days.
+
+    Args:
+        calendar_ids: Calendars whose events block time
+        num_days: Days in the schedule
+        start_date: Date of day 1 (defaults to today)
+        service: Google Calendar API service (defaults to this thread's)
+        store: Event store to read (defaults to the shared store)
+        max_age: Seconds a sync stays fresh enough to skip the API
+
+    Returns:
+        dict: 'days' with per-day (start_minute, end_minute) busy intervals,
+        and 'source' ('store' or 'freebusy')
+    """
+    store = store or EventStore.shared()
+    calendar_ids = list(dict.fromkeys(calendar_ids))
+    start, end = schedule_window(num_days, start_date)
+
+    if store_is_fresh(store, calendar_ids, start, max_age):
+        periods = busy_periods_from_store(store, calendar_ids, start, end)
+        source = 'store'
+    else:
+        service = service or CalendarServiceFactory.shared().get_service()
+        if service is None:
+            raise RuntimeError("Not connected to Google Calendar")
+        periods = query_freebusy(service, calendar_ids, start, end, store)
+        source = 'freebusy'
+
+    return {'days': split_by_day(periods, start, num_days), 'source': source}
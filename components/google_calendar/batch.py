@@ -0,0 +1,133 @@
+"""
+Google Calendar Batch Module
+
+This module handles sending many Calendar API writes at once including:
+- Grouping event inserts, patches and deletes into batch HTTP requests
+- Per-item success and failure callbacks
+- Retrying rate-limited and failed items through the shared request executor
+- Partial failure reporting
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from .request_executor import RequestExecutor, is_retryable
+
+# The Calendar API accepts at most 50 calls in a single batch request
+MAX_BATCH_SIZE = 50
+
+def insert_events(service, events: List[Dict], calendar_id: str = 'primary',
+                  batched: bool = True, batch_size: int = MAX_BATCH_SIZE,
+                  on_result: Optional[Callable[[int, Optional[Dict], Optional[str]], None]] = None) -> Dict:
+    """
+    Insert events into a calendar, batching the HTTP requests when enabled.
+
+    Args:
+        service: Google Calendar API service
+        events: Event bodies to insert
+        calendar_id: Target calendar ID
+        batched: Send up to batch_size inserts per HTTP request instead of one each
+        batch_size: Inserts per batch, capped at the API limit
+        on_result: Called as on_result(index, created_event, error) for every event
+
+    Returns:
+        dict: 'succeeded' maps event index to the created event, 'failed'
+        maps event index to an error message and 'status' to its HTTP status
+    """
+    requests = [service.events().insert(calendarId=calendar_id, body=event) for event in events]
+    return execute_requests(service, requests, batched=batched, batch_size=batch_size,
+                            on_result=on_result)
+
+def execute_requests(service, requests: List, batched: bool = True, batch_size: int = MAX_BATCH_SIZE,
+                     on_result: Optional[Callable[[int, Optional[Dict], Optional[str]], None]] = None) -> Dict:
+    """
+    Execute prepared API requests, batching them when enabled.
+
+    Args:
+        service: Google Calendar API service the requests were built from
+        requests: Unexecuted HttpRequest objects (insert, patch, delete, ...)
+        batched: Send up to batch_size requests per HTTP request instead of one each
+        batch_size: Requests per batch, capped at the API limit
+        on_result: Called as on_result(index, response, error) for every request
+
+    Returns:
+        dict: 'succeeded' maps request index to its response, 'failed' maps
+        request index to an error message and 'status' maps failed request
+        index to its HTTP status (None when the request never got one)
+    """
+    results = {'succeeded': {}, 'failed': {}, 'status': {}}
+
+    def record(index, response, error=None):
+        if error is None:
+            results['succeeded'][index] = response
+        else:
+            results['failed'][index] = describe_error(error)
+            results['status'][index] = error_status(error)
+        if on_result:
+            on_result(index, response, results['failed'].get(index))
+
+    executor = RequestExecutor.shared()
+
+    if not batched:
+        for index, request in enumerate(requests):
+            try:
+                record(index, executor.execute(request))
+            except Exception as e:
+                record(index, None, e)
+        return results
+
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    for chunk_start in range(0, len(requests), batch_size):
+        chunk = list(range(chunk_start, min(chunk_start + batch_size, len(requests))))
+        _execute_batch(service, requests, chunk, record, executor)
+
+    return results
+
+def _execute_batch(service, requests, indexes, record, executor):
+    """Send one batch of requests, resending items that hit rate limits or server errors"""
+    pending = indexes
+    attempt = 0
+    while pending:
+        outcomes = {}
+
+        def callback(request_id, response, exception):
+            outcomes[int(request_id)] = (response, exception)
+
+        # Quota is charged per item, not per batch request
+        executor.acquire(len(pending))
+        batch = service.new_batch_http_request(callback=callback)
+        for index in pending:
+            batch.add(requests[index], request_id=str(index))
+
+        try:
+            batch.execute()
+        except Exception as e:
+            # The batch request itself failed; items without a response did not go through
+            for index in pending:
+                outcomes.setdefault(index, (None, e))
+
+        retry = []
+        retry_error = None
+        for index in pending:
+            response, error = outcomes.get(index, (None, None))
+            if error is not None and is_retryable(error) and attempt < executor.max_retries:
+                retry.append(index)
+                retry_error = retry_error or error
+            else:
+                if error is not None:
+                    executor.record_failure()
+                record(index, response, error)
+
+        if retry:
+            executor.wait_before_retry(attempt, retry_error)
+            attempt += 1
+        pending = retry
+
+def error_status(error) -> Optional[int]:
+    """Get the HTTP status of an API error, if it has one"""
+    return getattr(getattr(error, 'resp', None), 'status', None)
+
+def describe_error(error) -> str:
+    """Get a short, user-facing message for an API error"""
+    status = error_status(error)
+    reason = error._get_reason() if hasattr(error, '_get_reason') else str(error)
+    return f"HTTP {status}: {reason}" if status else reason
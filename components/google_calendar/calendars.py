@@ -0,0 +1,248 @@
+"""
+Google Calendar Calendars Module
+
+This module handles working with several calendars at once including:
+- A cached calendar list shared by every page
+- Resolving calendar names to calendar IDs
+- Concurrent event import from several calendars
+- Merging and de-duplicating events across calendars, lazily for large ranges
+"""
+
+import datetime
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .event_store import parse_event_time
+from .incremental import SYNC_MAX_AGE_SECONDS, IncrementalSync, iter_events, list_events, sync_if_stale
+from .request_executor import execute_request
+from .service_factory import CalendarServiceFactory
+
+# Label used for the user's primary calendar throughout the UI
+PRIMARY_CALENDAR_NAME = "Primary Calendar"
+
+# Sorts events without a usable start time last
+FAR_FUTURE = datetime.datetime.max.replace(tzinfo=datetime.timezone.utc)
+
+class CalendarListCache:
+    """Process-wide cache of the user's calendar list.
+
+    Settings, export and import all need the same list of calendars; it is
+    fetched once and reused until it is older than max_age_seconds.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_age_seconds: float = 600):
+        self.max_age_seconds = max_age_seconds
+        self._calendars = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "CalendarListCache":
+        """Get the process-wide calendar list cache"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def get(self, service) -> List[Dict]:
+        """
+        Get the user's calendars, fetching them if the cache is empty or stale.
+
+        Args:
+            service: Google Calendar API service
+
+        Returns:
+            list: Dicts with 'id', 'name' (as shown in the UI), 'summary' and
+            'primary', primary calendar first
+        """
+        with self._lock:
+            if self._calendars is not None and time.monotonic() - self._fetched_at < self.max_age_seconds:
+                return self._calendars
+
+            calendars = []
+            page_token = None
+            while True:
+                response = execute_request(service.calendarList().list(pageToken=page_token))
+                for item in response.get('items', []):
+                    summary = item.get('summary', 'Unknown Calendar')
+                    calendars.append({
+                        'id': item['id'],
+                        'name': PRIMARY_CALENDAR_NAME if item.get('primary') else summary,
+                        'summary': summary,
+                        'primary': bool(item.get('primary'))
+                    })
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
+
+            calendars.sort(key=lambda calendar: not calendar['primary'])
+            self._calendars = calendars
+            self._fetched_at = time.monotonic()
+            return calendars
+
+    def clear(self):
+        """Forget the cached list"""
+        with self._lock:
+            self._calendars = None
+
+def get_calendar_names(service) -> List[str]:
+    """Get calendar names for selection widgets, falling back to the primary calendar"""
+    if not service:
+        return [PRIMARY_CALENDAR_NAME]
+    names = [calendar['name'] for calendar in CalendarListCache.shared().get(service)]
+    return names or [PRIMARY_CALENDAR_NAME]
+
+def resolve_calendar_ids(service, names: List[str]) -> List[str]:
+    """
+    Map calendar names from the UI to calendar IDs.
+
+    Args:
+        service: Google Calendar API service
+        names: Calendar names as shown in selection widgets
+
+    Returns:
+        list: Calendar IDs in the same order; unknown names are skipped
+    """
+    ids = {PRIMARY_CALENDAR_NAME: 'primary'}
+    for calendar in CalendarListCache.shared().get(service):
+        if not calendar['primary']:
+            ids.setdefault(calendar['name'], calendar['id'])
+    return [ids[name] for name in names if name in ids]
+
+def get_import_workers() -> int:
+    """Concurrent calendars fetched during a multi-calendar import"""
+    try:
+        return max(1, int(os.getenv('CHRONA_CALENDAR_IMPORT_WORKERS', 4)))
+    except ValueError:
+        return 4
+
+def event_start(event: Dict) -> datetime.datetime:
+    """Sort key for events; events without a start sort last"""
+    return parse_event_time(event.get('start')) or FAR_FUTURE
+
+def dedupe_key(event: Dict):
+    """Identify the same event seen through several calendars"""
+    start = event.get('start', {})
+    return (event.get('iCalUID') or event.get('id'), start.get('dateTime') or start.get('date'))
+
+def iter_merged_events(event_iterables: List[Iterable[Dict]]) -> Iterator[Dict]:
+    """
+    Lazily merge per-calendar event streams into one time-sorted stream.
+
+    Copies of one event share a start time, so only the keys seen at the
+    current start are remembered and memory does not grow with the range.
+
+    Args:
+        event_iterables: Events of each calendar, each already sorted by start
+
+    Yields:
+        dict: Events by start time, keeping the first copy of events that
+        appear in more than one calendar
+    """
+    current_start = None
+    seen = set()
+    for event in heapq.merge(*event_iterables, key=event_start):
+        start = event_start(event)
+        if start != current_start:
+            current_start = start
+            seen.clear()
+        key = dedupe_key(event)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield event
+
+def merge_calendar_events(event_lists: List[List[Dict]]) -> List[Dict]:
+    """
+    Merge per-calendar event lists into one time-sorted list.
+
+    Args:
+        event_lists: Events of each calendar, each already sorted by start
+
+    Returns:
+        list: All events by start time, keeping the first copy of events
+        that appear in more than one calendar
+    """
+    return list(iter_merged_events(event_lists))
+
+def import_events_from_calendars(calendar_ids: List[str], start: datetime.datetime,
+                                 end: Optional[datetime.datetime] = None, max_age: float = 0,
+                                 max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Fetch events from several calendars concurrently and merge them.
+
+    Each worker thread syncs its calendar into the event store using its own
+    Calendar service, since services must not be shared between threads.
+
+    Args:
+        calendar_ids: Calendars to import from
+        start: Range start
+        end: Range end, or None for no upper bound
+        max_age: Seconds a previous sync of a calendar stays fresh
+        max_workers: Concurrent calendars (defaults to CHRONA_CALENDAR_IMPORT_WORKERS)
+
+    Returns:
+        list: Events from every calendar, time-sorted and de-duplicated
+    """
+    calendar_ids = list(dict.fromkeys(calendar_ids))
+    if not calendar_ids:
+        return []
+
+    def fetch(calendar_id):
+        service = CalendarServiceFactory.shared().get_service()
+        return list_events(service, start, end, calendar_id=calendar_id, max_age=max_age,
+                           engine=IncrementalSync())
+
+    workers = min(max_workers or get_import_workers(), len(calendar_ids))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="calendar-import") as executor:
+        event_lists = list(executor.map(fetch, calendar_ids))
+
+    return merge_calendar_events(event_lists)
+
+def iter_events_from_calendars(service, calendar_ids: List[str], start: datetime.datetime,
+                               end: Optional[datetime.datetime] = None,
+                               max_age: float = SYNC_MAX_AGE_SECONDS,
+                               max_workers: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Stream events from several calendars, merged and de-duplicated.
+
+    Stale calendars are synced concurrently first; the events are then read
+    lazily from the event store, or page by page from the API for ranges
+    before the synced window, so any range can be walked with flat memory.
+
+    Args:
+        service: Google Calendar API service for this thread
+        calendar_ids: Calendars to read
+        start: Range start
+        end: Range end, or None for no upper bound
+        max_age: Seconds a previous sync of a calendar stays fresh
+        max_workers: Concurrent syncs (defaults to CHRONA_CALENDAR_IMPORT_WORKERS)
+
+    Returns:
+        iterator: Events from every calendar, time-sorted and de-duplicated
+    """
+    calendar_ids = list(dict.fromkeys(calendar_ids))
+    if not calendar_ids:
+        return iter(())
+
+    def refresh(calendar_id):
+        sync_if_stale(CalendarServiceFactory.shared().get_service(), calendar_id, max_age,
+                      engine=IncrementalSync())
+
+    workers = min(max_workers or get_import_workers(), len(calendar_ids))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="calendar-import") as executor:
+        list(executor.map(refresh, calendar_ids))
+
+    # Every calendar is fresh now, so reading does not sync again
+    engine = IncrementalSync()
+    return iter_merged_events([
+        iter_events(service, start, end, calendar_id=calendar_id, max_age=float('inf'), engine=engine)
+        for calendar_id in calendar_ids
+    ])
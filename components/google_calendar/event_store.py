@@ -0,0 +1,356 @@
+"""
+Google Calendar Event Store Module
+
+This module keeps synced calendar events on disk including:
+- Events keyed by calendar ID and event ID
+- A start/end index for fast range queries
+- The longest event per calendar, bounding range scans
+- Sync tokens and sync times per calendar
+- Which Chrona task each exported event belongs to
+"""
+
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Stored times are UTC in this fixed-width format so they sort as text
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+def parse_event_time(value: Dict) -> Optional[datetime.datetime]:
+    """
+    Parse an event start/end field into an aware UTC datetime.
+
+    Args:
+        value: The event's 'start' or 'end' dict ('dateTime' or all-day 'date')
+
+    Returns:
+        datetime: UTC datetime, or None if the field is missing or invalid
+    """
+    if not value:
+        return None
+    raw = value.get('dateTime') or value.get('date')
+    if not raw:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(raw.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return to_utc(parsed)
+
+def to_utc(value: datetime.datetime) -> datetime.datetime:
+    """Treat naive datetimes as UTC, like the Calendar API's trailing 'Z'"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc)
+
+def format_stored_time(value: Optional[datetime.datetime]) -> Optional[str]:
+    """Format a datetime the way the store indexes it"""
+    return to_utc(value).strftime(TIME_FORMAT) if value is not None else None
+
+class EventStore:
+    """SQLite store of synced calendar events.
+
+    Holds every event seen per calendar together with the calendar's sync
+    token, the start of the window its full sync covered and when it was
+    last synced. Only the sync engine writes to it; previews, imports and
+    conflict checks read from it without touching the network.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path: str = 'chrona_events.db'):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # An in-memory database only lives as long as its connection
+        self._memory_conn = None
+        if db_path == ':memory:':
+            self._memory_conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self._init_db()
+
+    @classmethod
+    def shared(cls) -> "EventStore":
+        """Get the process-wide store configured from the environment"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(db_path=os.getenv('CHRONA_EVENT_STORE_DB', 'chrona_events.db'))
+            return cls._shared
+
+    @contextmanager
+    def _connect(self):
+        with self._lock:
+            if self._memory_conn is not None:
+                with self._memory_conn:
+                    yield self._memory_conn
+                return
+
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            try:
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def _init_db(self):
+        directory = os.path.dirname(self.db_path) if self._memory_conn is None else ''
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS calendar_events (
+                    calendar_id TEXT NOT NULL,
+                    event_id TEXT NOT NULL,
+                    start_utc TEXT,
+                    end_utc TEXT,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (calendar_id, event_id)
+                )
+                """
+            )
+            # Range queries seek on start and filter on end without reading rows
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_calendar_events_range "
+                "ON calendar_events (calendar_id, start_utc, end_utc)"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS calendar_sync_state (
+                    calendar_id TEXT PRIMARY KEY,
+                    sync_token TEXT,
+                    window_start TEXT,
+                    synced_at REAL,
+                    max_span_seconds REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS exported_events (
+                    calendar_id TEXT NOT NULL,
+                    task_key TEXT NOT NULL,
+                    event_id TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    PRIMARY KEY (calendar_id, task_key)
+                )
+                """
+            )
+
+    def get_sync_token(self, calendar_id: str) -> Optional[str]:
+        """Get the stored nextSyncToken for a calendar"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT sync_token FROM calendar_sync_state WHERE calendar_id = ?", (calendar_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_sync_token(self, calendar_id: str, token: str, window_start: Optional[datetime.datetime] = None):
+        """Store a calendar's nextSyncToken, and the window start after a full sync"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO calendar_sync_state (calendar_id, sync_token, window_start, synced_at) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (calendar_id) DO UPDATE SET sync_token = excluded.sync_token, "
+                "window_start = COALESCE(excluded.window_start, window_start), "
+                "synced_at = excluded.synced_at",
+                (calendar_id, token, format_stored_time(window_start), time.time())
+            )
+
+    def last_synced(self, calendar_id: str) -> Optional[float]:
+        """Get when a calendar was last synced as a Unix timestamp"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT synced_at FROM calendar_sync_state WHERE calendar_id = ?", (calendar_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def covers(self, calendar_id: str, start: datetime.datetime) -> bool:
+        """Check whether the store holds every event of a calendar from start onwards"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT window_start FROM calendar_sync_state "
+                "WHERE calendar_id = ? AND sync_token IS NOT NULL", (calendar_id,)
+            ).fetchone()
+        return bool(row and row[0]) and format_stored_time(start) >= row[0]
+
+    def apply(self, calendar_id: str, events: List[Dict]) -> Dict[str, int]:
+        """
+        Merge a page of events, removing cancelled ones.
+
+        Returns:
+            dict: Number of 'changed' and 'deleted' events
+        """
+        upserts = []
+        deletes = []
+        max_span = 0
+        for event in events:
+            event_id = event.get('id')
+            if not event_id:
+                continue
+            if event.get('status') == 'cancelled':
+                deletes.append((calendar_id, event_id))
+                continue
+            start = parse_event_time(event.get('start'))
+            end = parse_event_time(event.get('end')) or start
+            if start is not None:
+                max_span = max(max_span, (end - start).total_seconds())
+            upserts.append((
+                calendar_id, event_id, format_stored_time(start), format_stored_time(end),
+                json.dumps(event, ensure_ascii=False)
+            ))
+
+        with self._connect() as conn:
+            # Range queries only look back as far as the longest event ever stored
+            conn.execute(
+                "INSERT INTO calendar_sync_state (calendar_id, max_span_seconds) VALUES (?, ?) "
+                "ON CONFLICT (calendar_id) DO UPDATE SET "
+                "max_span_seconds = MAX(max_span_seconds, excluded.max_span_seconds)",
+                (calendar_id, max_span)
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO calendar_events "
+                "(calendar_id, event_id, start_utc, end_utc, payload) VALUES (?, ?, ?, ?, ?)",
+                upserts
+            )
+            deleted = 0
+            for key in deletes:
+                deleted += conn.execute(
+                    "DELETE FROM calendar_events WHERE calendar_id = ? AND event_id = ?", key
+                ).rowcount
+        return {'changed': len(upserts), 'deleted': deleted}
+
+    def reset(self, calendar_id: str):
+        """Forget a calendar's events and sync token"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM calendar_events WHERE calendar_id = ?", (calendar_id,))
+            conn.execute("DELETE FROM calendar_sync_state WHERE calendar_id = ?", (calendar_id,))
+
+    def clear(self):
+        """Forget every calendar"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM calendar_events")
+            conn.execute("DELETE FROM calendar_sync_state")
+            conn.execute("DELETE FROM exported_events")
+
+    def get_exported(self, calendar_id: str) -> Dict[str, Dict[str, str]]:
+        """
+        Get the events previously exported to a calendar.
+
+        Returns:
+            dict: Task key to {'event_id', 'content_hash'}
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT task_key, event_id, content_hash FROM exported_events WHERE calendar_id = ?",
+                (calendar_id,)
+            ).fetchall()
+        return {key: {'event_id': event_id, 'content_hash': content_hash} for key, event_id, content_hash in rows}
+
+    def find_exported_events(self, calendar_id: str, property_name: str) -> List[Dict]:
+        """Get synced events carrying a private extended property, e.g. after the export table was lost"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT payload FROM calendar_events WHERE calendar_id = ? AND payload LIKE ?",
+                (calendar_id, f'%"{property_name}"%')
+            ).fetchall()
+        events = [json.loads(row[0]) for row in rows]
+        return [event for event in events
+                if property_name in event.get('extendedProperties', {}).get('private', {})]
+
+    def record_exported(self, calendar_id: str, exported: Dict[str, Dict[str, str]], removed: List[str]):
+        """
+        Update which events belong to which tasks after an export.
+
+        Args:
+            calendar_id: Calendar the events live in
+            exported: Task key to {'event_id', 'content_hash'} for inserted or updated events
+            removed: Task keys whose events were deleted
+        """
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO exported_events (calendar_id, task_key, event_id, content_hash) "
+                "VALUES (?, ?, ?, ?)",
+                [(calendar_id, key, value['event_id'], value['content_hash']) for key, value in exported.items()]
+            )
+            conn.executemany(
+                "DELETE FROM exported_events WHERE calendar_id = ? AND task_key = ?",
+                [(calendar_id, key) for key in removed]
+            )
+
+    def events_between(self, calendar_id: str, start: datetime.datetime,
+                       end: Optional[datetime.datetime] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get stored events overlapping a time range, ordered by start time.
+
+        Args:
+            calendar_id: Calendar to read
+            start: Range start
+            end: Range end, or None for no upper bound
+            limit: Maximum number of events to return
+
+        Returns:
+            list: Event resources as returned by the API
+        """
+        rows = self._range_rows(calendar_id, start, end, limit if limit is not None else -1)
+        return [json.loads(row[2]) for row in rows]
+
+    def iter_events_between(self, calendar_id: str, start: datetime.datetime,
+                            end: Optional[datetime.datetime] = None, batch_size: int = 500) -> Iterator[Dict]:
+        """
+        Yield stored events overlapping a time range, ordered by start time.
+
+        Rows are read batch_size at a time and the store is not locked while
+        the caller consumes them, so memory stays flat for any range.
+
+        Args:
+            calendar_id: Calendar to read
+            start: Range start
+            end: Range end, or None for no upper bound
+            batch_size: Rows fetched per query
+
+        Yields:
+            dict: Event resources as returned by the API
+        """
+        after = None
+        while True:
+            rows = self._range_rows(calendar_id, start, end, batch_size, after)
+            for row in rows:
+                yield json.loads(row[2])
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1][0], rows[-1][1])
+
+    def _range_rows(self, calendar_id: str, start: datetime.datetime, end: Optional[datetime.datetime],
+                    limit: int, after: Optional[Tuple[str, str]] = None) -> List[Tuple[str, str, str]]:
+        """Get (start_utc, event_id, payload) rows in a range, after a (start_utc, event_id) position"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT max_span_seconds FROM calendar_sync_state WHERE calendar_id = ?", (calendar_id,)
+            ).fetchone()
+            if row is None:
+                return []
+
+            # Bounding the start from below keeps this a range scan on the start index
+            earliest_start = format_stored_time(to_utc(start) - datetime.timedelta(seconds=row[0]))
+            after_start, after_id = after or (earliest_start, '')
+            return conn.execute(
+                "SELECT start_utc, event_id, payload FROM calendar_events "
+                "WHERE calendar_id = ? AND start_utc >= ? AND start_utc <= ? AND end_utc >= ? "
+                "AND (start_utc > ? OR event_id > ?) "
+                "ORDER BY start_utc, event_id LIMIT ?",
+                (
+                    calendar_id,
+                    max(earliest_start, after_start),
+                    format_stored_time(end) if end is not None else '9999-12-31T23:59:59',
+                    format_stored_time(start),
+                    after_start,
+                    after_id,
+                    limit
+                )
+            ).fetchall()
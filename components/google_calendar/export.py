@@ -5,6 +5,7 @@ This module handles exporting tasks to Google Calendar including:
 - Task selection interface
 - Export options configuration
 - Calendar event creation
+- Reconciling the optimized schedule with exported events
 - Scheduling and time management
 """
 
@@ -13,7 +14,11 @@ import pandas as pd
 import datetime
 from datetime import timedelta
 
+from models.schedule_model import DaySchedule
 from .auth import get_calendar_service
+from .batch import insert_events
+from .calendars import get_calendar_names, resolve_calendar_ids
+from .reconcile import reconcile_events
 
 def render_export_section(optimizer):
     """Render task export to Google Calendar section"""
@@ -59,7 +64,7 @@ def render_export_section(optimizer):
     with col1:
         calendar_name = st.selectbox(
             "📅 Target Calendar",
-            ["Primary Calendar", "Work Calendar", "Personal Calendar"],
+            get_calendar_list(),
             help="Select which Google Calendar to export tasks to"
         )
         
@@ -81,14 +86,59 @@ def render_export_section(optimizer):
             value=True,
             help="Add 15-minute breaks between tasks"
         )
+        
+        batched = st.checkbox(
+            "⚡ Send in batches",
+            value=True,
+            help="Create up to 50 events per request instead of one request per task"
+        )
     
     # Export button
     selected_tasks = edited_df[edited_df['Select']]['Task'].tolist()
     
     if st.button("📤 Export Selected Tasks", type="primary", disabled=len(selected_tasks) == 0):
-        export_tasks_to_calendar(selected_tasks, calendar_name, start_date, start_time, add_breaks)
+        export_tasks_to_calendar(selected_tasks, calendar_name, start_date, start_time, add_breaks, batched)
+
+def build_task_event(task, summary, start_time):
+    """Build a Calendar event body for a task starting at start_time"""
+    event = {
+        'summary': summary,
+        'description': task.get('notes', ''),
+        'start': {
+            'dateTime': start_time.isoformat(),
+            'timeZone': 'UTC',
+        },
+        'end': {
+            'dateTime': (start_time + timedelta(minutes=task.get('duration', 60))).isoformat(),
+            'timeZone': 'UTC',
+        },
+    }
+    
+    # Add task metadata to description
+    metadata = []
+    if task.get('priority'):
+        metadata.append(f"Priority: {task.get('priority').title()}")
+    if task.get('category'):
+        metadata.append(f"Category: {task.get('category')}")
+    if task.get('duration'):
+        metadata.append(f"Duration: {task.get('duration')} minutes")
+    
+    if metadata:
+        event['description'] = f"{task.get('notes', '')}\n\n" + "\n".join(metadata)
+    
+    return event
+
+def report_failed_events(results, event_names):
+    """Show which events could not be created and why"""
+    failed = results['failed']
+    if not failed:
+        return
+    
+    st.warning(f"⚠️ {len(failed)} of {len(event_names)} events could not be created:")
+    for index in sorted(failed):
+        st.markdown(f"- **{event_names[index]}**: {failed[index]}")
 
-def export_tasks_to_calendar(selected_tasks, calendar_name, start_date, start_time, add_breaks):
+def export_tasks_to_calendar(selected_tasks, calendar_name, start_date, start_time, add_breaks, batched=True):
     """Export selected tasks to Google Calendar"""
     service = get_calendar_service()
     if not service:
@@ -101,7 +151,8 @@ def export_tasks_to_calendar(selected_tasks, calendar_name, start_date, start_ti
             start_datetime = datetime.datetime.combine(start_date, start_time)
             current_time = start_datetime
             
-            exported_count = 0
+            events = []
+            event_names = []
             for task_name in selected_tasks:
                 # Find the task in optimizer.tasks
                 task = next((t for t in st.session_state.optimizer.tasks if t.get('name') == task_name), None)
@@ -110,39 +161,24 @@ def export_tasks_to_calendar(selected_tasks, calendar_name, start_date, start_ti
                 
                 # Create event
                 duration = task.get('duration', 60)
-                event = {
-                    'summary': task_name,
-                    'description': task.get('notes', ''),
-                    'start': {
-                        'dateTime': current_time.isoformat(),
-                        'timeZone': 'UTC',
-                    },
-                    'end': {
-                        'dateTime': (current_time + timedelta(minutes=duration)).isoformat(),
-                        'timeZone': 'UTC',
-                    },
-                }
-                
-                # Add task metadata to description
-                metadata = []
-                if task.get('priority'):
-                    metadata.append(f"Priority: {task.get('priority').title()}")
-                if task.get('category'):
-                    metadata.append(f"Category: {task.get('category')}")
-                if task.get('duration'):
-                    metadata.append(f"Duration: {task.get('duration')} minutes")
-                
-                if metadata:
-                    event['description'] = f"{task.get('notes', '')}\n\n" + "\n".join(metadata)
-                
-                # Insert event
-                service.events().insert(calendarId='primary', body=event).execute()
-                exported_count += 1
+                events.append(build_task_event(task, task_name, current_time))
+                event_names.append(task_name)
                 
                 # Update time for next task
                 current_time += timedelta(minutes=duration)
                 if add_breaks:
                     current_time += timedelta(minutes=15)  # Add 15-minute break
+            
+            # Insert events
+            calendar_ids = resolve_calendar_ids(service, [calendar_name])
+            results = insert_events(service, events, calendar_id=calendar_ids[0] if calendar_ids else 'primary',
+                                    batched=batched)
+            exported_count = len(results['succeeded'])
+            report_failed_events(results, event_names)
+            
+            if events and not exported_count:
+                st.error("❌ Export failed: no events were created")
+                return
                     
             st.success(f"✅ Successfully exported {exported_count} tasks to {calendar_name}!")
             
@@ -159,51 +195,83 @@ def export_tasks_to_calendar(selected_tasks, calendar_name, start_date, start_ti
         except Exception as e:
             st.error(f"❌ Export failed: {str(e)}")
 
-def sync_tasks_to_calendar(optimizer):
-    """Sync all tasks to Google Calendar"""
+def build_schedule_events(schedule_result, start_date=None):
+    """
+    Build Calendar events for every entry of an optimized schedule.
+    
+    Args:
+        schedule_result: Optimizer result with an 'optimized_schedule' list of days
+        start_date: Date of day 1 (defaults to today)
+    
+    Returns:
+        dict: Stable task key to event body; keys stay the same when an entry
+        only moves within its day, so the reconciler patches it instead of
+        recreating it. Occurrences are counted per day, so editing one day
+        leaves the keys of every other day alone.
+    """
+    start_date = start_date or datetime.date.today()
+    events = {}
+    
+    for day_data in schedule_result.get('optimized_schedule', []):
+        day = DaySchedule.from_dict(day_data)
+        day_start = datetime.datetime.combine(start_date + timedelta(days=day.day - 1), datetime.time.min).astimezone()
+        occurrences = {}
+        
+        for entry in sorted(day.entries, key=lambda entry: entry.start):
+            name = str(entry.task_name or 'Unnamed Task')
+            occurrence = occurrences.get(name.lower(), 0)
+            occurrences[name.lower()] = occurrence + 1
+            
+            task = {
+                'notes': entry.notes or '',
+                'priority': entry.priority,
+                'category': entry.category,
+                'duration': entry.duration_minutes
+            }
+            events[f"{day.day}#{name.lower()}#{occurrence}"] = build_task_event(
+                task, name, day_start + timedelta(minutes=entry.start)
+            )
+    
+    return events
+
+def sync_tasks_to_calendar(optimizer, batched=True):
+    """
+    Sync the optimized schedule to Google Calendar.
+    
+    Only entries that are new, changed or removed since the last sync
+    result in API calls, so repeated syncs do not create duplicates.
+    
+    Returns:
+        dict: reconcile_events summary, or None if nothing was sent
+    """
     service = get_calendar_service()
     if not service:
         st.error("❌ Not connected to Google Calendar!")
-        return
+        return None
     
-    with st.spinner("Syncing tasks to Google Calendar..."):
+    if not optimizer.optimized_schedule or not optimizer.optimized_schedule.get('optimized_schedule'):
+        st.warning("⚠️ Optimize your schedule first - the optimized schedule is what gets synced.")
+        return None
+    
+    with st.spinner("Syncing schedule to Google Calendar..."):
         try:
-            synced_count = 0
-            for task in optimizer.tasks:
-                # Create event
-                event = {
-                    'summary': task.get('name', 'Unnamed Task'),
-                    'description': task.get('notes', ''),
-                    'start': {
-                        'dateTime': datetime.datetime.now().isoformat(),
-                        'timeZone': 'UTC',
-                    },
-                    'end': {
-                        'dateTime': (datetime.datetime.now() + timedelta(minutes=task.get('duration', 60))).isoformat(),
-                        'timeZone': 'UTC',
-                    },
-                }
-                
-                # Add task metadata
-                metadata = []
-                if task.get('priority'):
-                    metadata.append(f"Priority: {task.get('priority').title()}")
-                if task.get('category'):
-                    metadata.append(f"Category: {task.get('category')}")
-                if task.get('duration'):
-                    metadata.append(f"Duration: {task.get('duration')} minutes")
-                
-                if metadata:
-                    event['description'] = f"{task.get('notes', '')}\n\n" + "\n".join(metadata)
-                
-                # Insert event
-                service.events().insert(calendarId='primary', body=event).execute()
-                synced_count += 1
-                
-            st.success(f"✅ Successfully synced {synced_count} tasks to Google Calendar!")
+            events = build_schedule_events(optimizer.optimized_schedule)
+            summary = reconcile_events(service, events, calendar_id='primary', batched=batched)
+            
+            if summary['failed']:
+                st.warning(f"⚠️ {len(summary['failed'])} events could not be synced:")
+                for key, error in summary['failed'].items():
+                    st.markdown(f"- **{events[key]['summary'] if key in events else key}**: {error}")
+            
+            st.success(
+                f"✅ Schedule synced: {summary['inserted']} added, {summary['updated']} updated, "
+                f"{summary['deleted']} removed, {summary['unchanged']} unchanged."
+            )
+            return summary
             
         except Exception as e:
             st.error(f"❌ Sync failed: {str(e)}")
+            return None
 
 def get_calendar_list():
     """Get list of available Google Calendars"""
@@ -212,16 +280,7 @@ def get_calendar_list():
         return ["Primary Calendar"]
     
     try:
-        calendar_list = service.calendarList().list().execute()
-        calendars = []
-        
-        for calendar in calendar_list.get('items', []):
-            if calendar.get('primary'):
-                calendars.append("Primary Calendar")
-            else:
-                calendars.append(calendar.get('summary', 'Unknown Calendar'))
-                
-        return calendars if calendars else ["Primary Calendar"]
+        return get_calendar_names(service)
         
     except Exception as e:
         st.error(f"❌ Failed to get calendar list: {str(e)}")
@@ -4,15 +4,23 @@ Google Calendar Import Module
 This module handles importing events from Google Calendar including:
 - Event retrieval from calendar
 - Date range selection
-- Event preview and display
+- Event preview and paginated display of large imports
 - Converting events to tasks
 """
 
 import streamlit as st
 import datetime
+import itertools
 from datetime import timedelta
 
 from .auth import get_calendar_service
+from .calendars import FAR_FUTURE, PRIMARY_CALENDAR_NAME, event_start, iter_events_from_calendars, resolve_calendar_ids
+from .event_store import to_utc
+from .export import get_calendar_list
+from .incremental import list_events
+
+# Imported events shown per page; only that page is ever loaded and rendered
+IMPORT_PAGE_SIZE = 25
 
 def render_import_section(optimizer):
     """Render calendar import section"""
@@ -38,10 +46,12 @@ def render_import_section(optimizer):
     with col2:
         st.markdown("#### 🔽 Import Options")
         
-        import_calendar = st.selectbox(
-            "📅 Source Calendar",
-            ["Primary Calendar", "Work Calendar", "Personal Calendar"],
-            help="Select which Google Calendar to import from"
+        calendar_names = get_calendar_list()
+        import_calendars = st.multiselect(
+            "📅 Source Calendars",
+            calendar_names,
+            default=[PRIMARY_CALENDAR_NAME] if PRIMARY_CALENDAR_NAME in calendar_names else calendar_names[:1],
+            help="Select which Google Calendars to import from"
         )
         
         convert_to_tasks = st.checkbox(
@@ -51,7 +61,9 @@ def render_import_section(optimizer):
         )
     
     if st.button("📥 Import Calendar Events", type="primary"):
-        import_calendar_events_range(import_start, import_end, import_calendar, convert_to_tasks)
+        import_calendar_events_range(import_start, import_end, import_calendars, convert_to_tasks)
+    
+    render_imported_events()
     
     # Show preview of upcoming events
     st.markdown("#### 👀 Preview: Upcoming Events")
@@ -82,18 +94,8 @@ def import_calendar_events(optimizer):
     with st.spinner("Importing events from Google Calendar..."):
         try:
             # Get events for the next 7 days
-            now = datetime.datetime.utcnow().isoformat() + 'Z'
-            end_time = (datetime.datetime.utcnow() + timedelta(days=7)).isoformat() + 'Z'
-            
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=now,
-                timeMax=end_time,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+            now = datetime.datetime.utcnow()
+            events = list_events(service, now, now + timedelta(days=7), max_age=0)
             st.success(f"✅ Successfully imported {len(events)} calendar events!")
             
             # Display imported events
@@ -106,69 +108,171 @@ def import_calendar_events(optimizer):
         except Exception as e:
             st.error(f"❌ Import failed: {str(e)}")
 
-def import_calendar_events_range(start_date, end_date, calendar_name, convert_to_tasks):
-    """Import calendar events from specified date range"""
+def import_calendar_events_range(start_date, end_date, calendar_names, convert_to_tasks):
+    """
+    Import calendar events from specified date range.
+    
+    Events are streamed and only counted here; render_imported_events shows
+    them a page at a time, so ranges of any size stay responsive.
+    
+    Args:
+        start_date: First day to import
+        end_date: Last day to import
+        calendar_names: Calendar name or list of names to import from
+        convert_to_tasks: Whether to convert the events to optimizer tasks
+    """
     service = get_calendar_service()
     if not service:
         st.error("❌ Not connected to Google Calendar!")
         return
     
-    with st.spinner(f"Importing events from {calendar_name}..."):
+    if isinstance(calendar_names, str):
+        calendar_names = [calendar_names]
+    source_label = ", ".join(calendar_names)
+    
+    with st.spinner(f"Importing events from {source_label}..."):
         try:
-            # Convert dates to ISO format
-            start_iso = datetime.datetime.combine(start_date, datetime.time.min).isoformat() + 'Z'
-            end_iso = datetime.datetime.combine(end_date, datetime.time.max).isoformat() + 'Z'
+            calendar_ids = resolve_calendar_ids(service, calendar_names)
+            if not calendar_ids:
+                st.warning("⚠️ Select at least one calendar to import from.")
+                return
             
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=start_iso,
-                timeMax=end_iso,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+            start = datetime.datetime.combine(start_date, datetime.time.min)
+            end = datetime.datetime.combine(end_date, datetime.time.max)
             
-            events = events_result.get('items', [])
-            st.success(f"✅ Successfully imported {len(events)} events from {calendar_name}!")
+            # Calendars are synced concurrently, then counted as one merged stream
+            events = iter_events_from_calendars(service, calendar_ids, start, end, max_age=0)
+            total = sum(1 for _ in events)
+            st.success(f"✅ Successfully imported {total} events from {source_label}!")
             
-            # Display imported events
-            if events:
-                st.markdown("#### 📅 Imported Events:")
+            st.session_state.calendar_import = {
+                'calendar_ids': calendar_ids,
+                'start': start,
+                'end': end,
+                'total': total,
+                'convert_to_tasks': convert_to_tasks,
+                'imported_at': datetime.datetime.now(),
+                # Page number -> (start time, events at that start to skip); page 1 starts at the range start
+                'cursors': {1: None}
+            }
+            # Start the new import on its first page
+            st.session_state.pop('calendar_import_page', None)
+            st.session_state.pop('calendar_import_events', None)
+            
+        except Exception as e:
+            st.error(f"❌ Import failed: {str(e)}")
+
+def load_import_page(service, imported, page):
+    """
+    Load one page of an import, resuming from the nearest stored page cursor.
+    
+    A cursor is the start time of a page's first event plus how many events
+    at that same start come before it, so reading a page walks only from the
+    closest page already visited instead of from the start of the range.
+    Cursors for the pages passed on the way are stored in imported.
+    
+    Args:
+        service: Google Calendar API service
+        imported: The calendar_import session entry
+        page: Page number, from 1
+    
+    Returns:
+        list: The page's events
+    """
+    cursors = imported['cursors']
+    known_page = max(number for number in cursors if number <= page)
+    cursor = cursors[known_page]
+    
+    if cursor is None:
+        events = iter_events_from_calendars(service, imported['calendar_ids'], imported['start'], imported['end'])
+        run_start, run_length = None, 0
+    else:
+        run_start, run_length = cursor
+        events = iter_events_from_calendars(service, imported['calendar_ids'], run_start, imported['end'])
+        # Events that began earlier but overlap the cursor were on earlier pages
+        events = itertools.islice(
+            (event for event in events if event_start(event) >= run_start), run_length, None)
+    
+    range_start = to_utc(imported['start'])
+    first = (page - 1) * IMPORT_PAGE_SIZE
+    page_events = []
+    for position, event in enumerate(events, start=(known_page - 1) * IMPORT_PAGE_SIZE):
+        start = event_start(event)
+        if start != run_start:
+            run_start, run_length = start, 0
+        if position % IMPORT_PAGE_SIZE == 0 and range_start <= start < FAR_FUTURE:
+            cursors.setdefault(position // IMPORT_PAGE_SIZE + 1, (start, run_length))
+        if position >= first + IMPORT_PAGE_SIZE:
+            break
+        if position >= first:
+            page_events.append(event)
+        run_length += 1
+    return page_events
+
+def render_imported_events():
+    """Render the last import one page at a time"""
+    imported = st.session_state.get('calendar_import')
+    if not imported or not imported['total']:
+        return
+    
+    st.markdown("#### 📅 Imported Events:")
+    
+    total = imported['total']
+    pages = (total + IMPORT_PAGE_SIZE - 1) // IMPORT_PAGE_SIZE
+    page = 1
+    if pages > 1:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, key="calendar_import_page")
+    first = (page - 1) * IMPORT_PAGE_SIZE
+    st.caption(f"Showing {first + 1}-{min(first + IMPORT_PAGE_SIZE, total)} of {total} events")
+    
+    # Reruns for anything else reuse the page instead of reading it again
+    page_key = (imported['imported_at'], page)
+    cached = st.session_state.get('calendar_import_events')
+    if cached is not None and cached[0] == page_key:
+        events = cached[1]
+    else:
+        service = get_calendar_service()
+        if not service:
+            return
+        try:
+            events = load_import_page(service, imported, page)
+        except Exception as e:
+            st.error(f"❌ Failed to load imported events: {str(e)}")
+            return
+        st.session_state.calendar_import_events = (page_key, events)
+    
+    # Create a more detailed view of imported events
+    for event in events:
+        with st.expander(f"📅 {event.get('summary', 'Untitled Event')}"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                start_time = event['start'].get('dateTime', event['start'].get('date'))
+                end_time = event['end'].get('dateTime', event['end'].get('date'))
                 
-                # Create a more detailed view of imported events
-                for event in events:
-                    with st.expander(f"📅 {event.get('summary', 'Untitled Event')}"):
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            start_time = event['start'].get('dateTime', event['start'].get('date'))
-                            end_time = event['end'].get('dateTime', event['end'].get('date'))
-                            
-                            st.write(f"**Start:** {start_time}")
-                            st.write(f"**End:** {end_time}")
-                            
-                            if event.get('location'):
-                                st.write(f"**Location:** {event['location']}")
-                        
-                        with col2:
-                            if event.get('description'):
-                                st.write(f"**Description:** {event['description']}")
-                            
-                            if event.get('creator'):
-                                st.write(f"**Creator:** {event['creator'].get('email', 'Unknown')}")
+                st.write(f"**Start:** {start_time}")
+                st.write(f"**End:** {end_time}")
                 
-                if convert_to_tasks:
-                    # Convert events to tasks (this would need to be implemented in the optimizer)
-                    converted_tasks = convert_events_to_tasks(events)
-                    st.info(f"🔄 Converted {len(converted_tasks)} events to optimizer tasks!")
-                    
-                    # Show converted tasks
-                    if converted_tasks:
-                        st.markdown("#### 🔄 Converted Tasks:")
-                        for task in converted_tasks:
-                            st.write(f"- **{task['name']}** ({task['duration']} min)")
+                if event.get('location'):
+                    st.write(f"**Location:** {event['location']}")
+            
+            with col2:
+                if event.get('description'):
+                    st.write(f"**Description:** {event['description']}")
                 
-        except Exception as e:
-            st.error(f"❌ Import failed: {str(e)}")
+                if event.get('creator'):
+                    st.write(f"**Creator:** {event['creator'].get('email', 'Unknown')}")
+    
+    if imported['convert_to_tasks']:
+        # Every event converts to exactly one task
+        st.info(f"🔄 Converted {total} events to optimizer tasks!")
+        
+        # Show converted tasks for this page
+        converted_tasks = convert_events_to_tasks(events)
+        if converted_tasks:
+            st.markdown("#### 🔄 Converted Tasks:")
+            for task in converted_tasks:
+                st.write(f"- **{task['name']}** ({task['duration']} min)")
 
 def get_upcoming_events(days=7):
     """Get upcoming events from Google Calendar"""
@@ -178,19 +282,8 @@ def get_upcoming_events(days=7):
     
     try:
         # Get events for the next specified days
-        now = datetime.datetime.utcnow().isoformat() + 'Z'
-        end_time = (datetime.datetime.utcnow() + timedelta(days=days)).isoformat() + 'Z'
-        
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=now,
-            timeMax=end_time,
-            maxResults=10,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        
-        events = events_result.get('items', [])
+        now = datetime.datetime.utcnow()
+        events = list_events(service, now, now + timedelta(days=days), limit=10)
         
         # Format events for display
         formatted_events = []
@@ -265,18 +358,11 @@ def get_calendar_events_by_date(target_date):
     
     try:
         # Set up date range for the target date
-        start_time = datetime.datetime.combine(target_date, datetime.time.min).isoformat() + 'Z'
-        end_time = datetime.datetime.combine(target_date, datetime.time.max).isoformat() + 'Z'
-        
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=start_time,
-            timeMax=end_time,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        
-        return events_result.get('items', [])
+        return list_events(
+            service,
+            datetime.datetime.combine(target_date, datetime.time.min),
+            datetime.datetime.combine(target_date, datetime.time.max)
+        )
         
     except Exception as e:
         st.error(f"❌ Failed to get events for {target_date}: {str(e)}")
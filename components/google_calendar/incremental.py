@@ -0,0 +1,212 @@
+"""
+Google Calendar Incremental Sync Module
+
+This module keeps a local copy of calendar events up to date including:
+- Full sync with nextPageToken pagination
+- Incremental sync using the stored nextSyncToken
+- Full resync when the sync token expires (410 Gone)
+- Lazy event iteration from the store or the API, one page at a time
+"""
+
+import datetime
+import itertools
+import time
+from datetime import timedelta
+from typing import Dict, Iterator, List, Optional
+
+import streamlit as st
+
+from .event_store import EventStore, to_utc
+from .request_executor import execute_request
+
+# How far back the initial full sync reaches; later syncs only fetch changes
+SYNC_LOOKBACK_DAYS = 30
+
+# Largest page the Calendar API returns for events.list
+PAGE_SIZE = 2500
+
+# Reads within this many seconds of the last sync are served from the store alone
+SYNC_MAX_AGE_SECONDS = 300
+
+# Partial response for event listings: only the fields previews, imports,
+# busy-time lookups and the export reconciler read
+EVENT_FIELDS = (
+    'nextPageToken,nextSyncToken,'
+    'items(id,status,summary,description,location,start,end,creator(email),'
+    'transparency,iCalUID,recurringEventId,extendedProperties)'
+)
+
+class IncrementalSync:
+    """Brings an EventStore up to date with the Calendar API.
+
+    The first sync of a calendar lists every event from SYNC_LOOKBACK_DAYS
+    ago, following nextPageToken, and keeps the final page's nextSyncToken.
+    Later syncs send only that token and receive just the events changed
+    since, so their cost follows the number of changes, not calendar size.
+    """
+
+    def __init__(self, store: Optional[EventStore] = None):
+        self.store = store or EventStore.shared()
+
+    def sync(self, service, calendar_id: str = 'primary') -> Dict:
+        """
+        Sync one calendar into the store.
+
+        Args:
+            service: Google Calendar API service
+            calendar_id: Calendar to sync
+
+        Returns:
+            dict: 'mode' ('full' or 'incremental'), 'changed', 'deleted' and 'pages'
+        """
+        token = self.store.get_sync_token(calendar_id)
+        if token:
+            try:
+                return self._fetch(service, calendar_id, {'syncToken': token}, 'incremental')
+            except Exception as e:
+                if getattr(getattr(e, 'resp', None), 'status', None) != 410:
+                    raise
+                # Sync token expired; the server requires starting over
+                self.store.reset(calendar_id)
+        return self.full_sync(service, calendar_id)
+
+    def full_sync(self, service, calendar_id: str = 'primary') -> Dict:
+        """Discard a calendar's stored state and list it again"""
+        self.store.reset(calendar_id)
+        window_start = datetime.datetime.now(datetime.timezone.utc) - timedelta(days=SYNC_LOOKBACK_DAYS)
+        params = {'timeMin': window_start.isoformat().replace('+00:00', 'Z')}
+        return self._fetch(service, calendar_id, params, 'full', window_start)
+
+    def _fetch(self, service, calendar_id, params, mode, window_start=None):
+        """Follow every page of a list request, merging each one into the store"""
+        totals = {'mode': mode, 'changed': 0, 'deleted': 0, 'pages': 0}
+        page_token = None
+        while True:
+            request_params = dict(params, calendarId=calendar_id, singleEvents=True,
+                                  maxResults=PAGE_SIZE, fields=EVENT_FIELDS)
+            if page_token:
+                request_params['pageToken'] = page_token
+            response = execute_request(service.events().list(**request_params))
+
+            counts = self.store.apply(calendar_id, response.get('items', []))
+            totals['changed'] += counts['changed']
+            totals['deleted'] += counts['deleted']
+            totals['pages'] += 1
+
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+
+        sync_token = response.get('nextSyncToken')
+        if sync_token:
+            self.store.set_sync_token(calendar_id, sync_token, window_start)
+        return totals
+
+def get_sync_engine() -> IncrementalSync:
+    """Get the session's sync engine, creating it on first use"""
+    if 'calendar_sync_engine' not in st.session_state:
+        st.session_state.calendar_sync_engine = IncrementalSync()
+    return st.session_state.calendar_sync_engine
+
+def sync_if_stale(service, calendar_id: str = 'primary', max_age: float = SYNC_MAX_AGE_SECONDS,
+                  engine: Optional[IncrementalSync] = None) -> IncrementalSync:
+    """Sync a calendar unless it was synced within max_age seconds, and return the engine used"""
+    engine = engine or get_sync_engine()
+    last_synced = engine.store.last_synced(calendar_id)
+    if last_synced is None or time.time() - last_synced >= max_age:
+        engine.sync(service, calendar_id)
+    return engine
+
+def iter_api_events(service, start: datetime.datetime, end: Optional[datetime.datetime] = None,
+                    calendar_id: str = 'primary', page_size: int = PAGE_SIZE) -> Iterator[Dict]:
+    """
+    Yield events in a time range straight from the API, ordered by start time.
+
+    Each page is requested only once the previous one has been consumed,
+    with a partial response limited to EVENT_FIELDS.
+
+    Args:
+        service: Google Calendar API service
+        start: Range start
+        end: Range end, or None for no upper bound
+        calendar_id: Calendar to read
+        page_size: Events requested per page
+
+    Yields:
+        dict: Event resources
+    """
+    params = {
+        'calendarId': calendar_id,
+        'timeMin': to_utc(start).isoformat().replace('+00:00', 'Z'),
+        'singleEvents': True,
+        'orderBy': 'startTime',
+        'maxResults': min(page_size, PAGE_SIZE),
+        'fields': EVENT_FIELDS
+    }
+    if end is not None:
+        params['timeMax'] = to_utc(end).isoformat().replace('+00:00', 'Z')
+
+    while True:
+        response = execute_request(service.events().list(**params))
+        yield from response.get('items', [])
+        params['pageToken'] = response.get('nextPageToken')
+        if not params['pageToken']:
+            return
+
+def iter_events(service, start: datetime.datetime, end: Optional[datetime.datetime] = None,
+                calendar_id: str = 'primary', max_age: float = SYNC_MAX_AGE_SECONDS,
+                engine: Optional[IncrementalSync] = None, page_size: int = PAGE_SIZE) -> Iterator[Dict]:
+    """
+    Yield events in a time range lazily, ordered by start time.
+
+    Like list_events, but events are produced a page at a time, so memory
+    stays flat however large the range is.
+
+    Args:
+        service: Google Calendar API service
+        start: Range start
+        end: Range end, or None for no upper bound
+        calendar_id: Calendar to read
+        max_age: Seconds a previous sync stays fresh; 0 always syncs changes first
+        engine: Sync engine to use; defaults to the session's
+        page_size: Events read per store query or API page
+
+    Returns:
+        iterator: Event resources; a stale calendar is synced before returning
+    """
+    engine = sync_if_stale(service, calendar_id, max_age, engine)
+    if engine.store.covers(calendar_id, start):
+        return engine.store.iter_events_between(calendar_id, start, end, batch_size=min(page_size, 500))
+    return iter_api_events(service, start, end, calendar_id, page_size)
+
+def list_events(service, start: datetime.datetime, end: Optional[datetime.datetime] = None,
+                calendar_id: str = 'primary', limit: Optional[int] = None,
+                max_age: float = SYNC_MAX_AGE_SECONDS,
+                engine: Optional[IncrementalSync] = None) -> List[Dict]:
+    """
+    Get events in a time range from the local store.
+
+    The calendar is synced first only when it never was or its last sync is
+    older than max_age, so repeated reads stay off the network. Ranges that
+    start before the synced window are listed directly from the API,
+    following every page.
+
+    Args:
+        service: Google Calendar API service
+        start: Range start
+        end: Range end, or None for no upper bound
+        calendar_id: Calendar to read
+        limit: Maximum number of events to return
+        max_age: Seconds a previous sync stays fresh; 0 always syncs changes first
+        engine: Sync engine to use; defaults to the session's, and must be
+            given when called outside the Streamlit script thread
+
+    Returns:
+        list: Event resources ordered by start time
+    """
+    engine = sync_if_stale(service, calendar_id, max_age, engine)
+    if engine.store.covers(calendar_id, start):
+        return engine.store.events_between(calendar_id, start, end, limit)
+
+    events = iter_api_events(service, start, end, calendar_id, page_size=limit or PAGE_SIZE)
+    return list(itertools.islice(events, limit) if limit else events)
@@ -0,0 +1,145 @@
+"""
+Google Calendar Export Reconciler Module
+
+This module keeps exported schedule events in step with the schedule including:
+- Stable keys and content hashes stored in extendedProperties.private
+- Diffing the schedule against what was exported before
+- Sending only the needed insert, patch and delete calls
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+from .batch import execute_requests
+from .event_store import EventStore
+
+# Private extended properties identifying events created by the reconciler
+KEY_PROPERTY = 'chronaKey'
+HASH_PROPERTY = 'chronaHash'
+
+# Gone events cannot be patched or deleted again
+MISSING_STATUSES = (404, 410)
+
+def content_hash(event: Dict) -> str:
+    """Hash the parts of an event body the reconciler manages"""
+    body = {field: value for field, value in event.items() if field != 'extendedProperties'}
+    return hashlib.sha256(json.dumps(body, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def tag_event(key: str, event: Dict) -> Dict:
+    """Copy an event body with its task key and content hash attached"""
+    tagged = dict(event)
+    tagged['extendedProperties'] = {
+        'private': {KEY_PROPERTY: key, HASH_PROPERTY: content_hash(event)}
+    }
+    return tagged
+
+def plan_export(desired: Dict[str, Dict], exported: Dict[str, Dict[str, str]]) -> Dict[str, List[str]]:
+    """
+    Diff the wanted events against the previously exported ones.
+
+    Args:
+        desired: Task key to event body for the current schedule
+        exported: Task key to {'event_id', 'content_hash'} from the last export
+
+    Returns:
+        dict: Task keys to 'insert', 'patch', 'delete' and leave 'unchanged'
+    """
+    plan = {'insert': [], 'patch': [], 'delete': [], 'unchanged': []}
+    for key, event in desired.items():
+        previous = exported.get(key)
+        if previous is None:
+            plan['insert'].append(key)
+        elif previous['content_hash'] != content_hash(event):
+            plan['patch'].append(key)
+        else:
+            plan['unchanged'].append(key)
+    plan['delete'] = [key for key in exported if key not in desired]
+    return plan
+
+def load_exported(store: EventStore, calendar_id: str) -> Dict[str, Dict[str, str]]:
+    """Get previously exported events, rebuilding the record from synced events if it is empty"""
+    exported = store.get_exported(calendar_id)
+    if exported:
+        return exported
+
+    for event in store.find_exported_events(calendar_id, KEY_PROPERTY):
+        private = event['extendedProperties']['private']
+        exported[private[KEY_PROPERTY]] = {
+            'event_id': event['id'],
+            'content_hash': private.get(HASH_PROPERTY, '')
+        }
+    return exported
+
+def reconcile_events(service, desired: Dict[str, Dict], calendar_id: str = 'primary',
+                     store: Optional[EventStore] = None, batched: bool = True) -> Dict:
+    """
+    Make the calendar match the desired events with as few API calls as possible.
+
+    Args:
+        service: Google Calendar API service
+        desired: Task key to event body for the current schedule
+        calendar_id: Calendar to export to
+        store: Event store holding the export record
+        batched: Send the calls as batch requests
+
+    Returns:
+        dict: Counts of 'inserted', 'updated', 'deleted' and 'unchanged'
+        events, and 'failed' mapping task keys to error messages
+    """
+    store = store or EventStore.shared()
+    exported = load_exported(store, calendar_id)
+    plan = plan_export(desired, exported)
+
+    operations = []
+    events = service.events()
+    for key in plan['insert']:
+        operations.append(('insert', key, events.insert(calendarId=calendar_id, body=tag_event(key, desired[key]))))
+    for key in plan['patch']:
+        # Confirming revives events that were cancelled in Calendar but still exist
+        body = dict(tag_event(key, desired[key]), status='confirmed')
+        operations.append(('patch', key, events.patch(
+            calendarId=calendar_id, eventId=exported[key]['event_id'], body=body
+        )))
+    for key in plan['delete']:
+        operations.append(('delete', key, events.delete(calendarId=calendar_id, eventId=exported[key]['event_id'])))
+
+    results = execute_requests(service, [request for _, _, request in operations], batched=batched)
+
+    summary = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': len(plan['unchanged']), 'failed': {}}
+    recorded = {key: exported[key] for key in plan['unchanged']}
+    removed = []
+    reinserts = []
+    for index, (operation, key, _) in enumerate(operations):
+        if index in results['succeeded']:
+            if operation == 'delete':
+                removed.append(key)
+                summary['deleted'] += 1
+            else:
+                recorded[key] = {
+                    'event_id': results['succeeded'][index]['id'],
+                    'content_hash': content_hash(desired[key])
+                }
+                summary['inserted' if operation == 'insert' else 'updated'] += 1
+        elif results['status'][index] in MISSING_STATUSES and operation != 'insert':
+            # Removed in Calendar since the last export
+            if operation == 'delete':
+                removed.append(key)
+                summary['deleted'] += 1
+            else:
+                reinserts.append(key)
+        else:
+            summary['failed'][key] = results['failed'][index]
+
+    if reinserts:
+        requests = [events.insert(calendarId=calendar_id, body=tag_event(key, desired[key])) for key in reinserts]
+        retry = execute_requests(service, requests, batched=batched)
+        for index, key in enumerate(reinserts):
+            if index in retry['succeeded']:
+                recorded[key] = {'event_id': retry['succeeded'][index]['id'], 'content_hash': content_hash(desired[key])}
+                summary['inserted'] += 1
+            else:
+                summary['failed'][key] = retry['failed'][index]
+
+    store.record_exported(calendar_id, recorded, removed)
+    return summary
@@ -0,0 +1,176 @@
+"""
+Google Calendar Request Executor Module
+
+This module sends every Calendar API call through one shared executor including:
+- A token-bucket rate limiter sized to the project's quota
+- Retries with exponential backoff and jitter for rate limits and server errors
+- Honoring Retry-After
+- Call, retry and throttling metrics
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+# Status codes worth retrying; 403 only when its reason is a rate limit
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+RATE_LIMIT_REASONS = {'ratelimitexceeded', 'userratelimitexceeded'}
+
+class TokenBucket:
+    """Thread-safe token bucket refilling at a fixed rate"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = max(rate, 0.001)
+        self.capacity = max(capacity, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens, waiting until enough have accumulated.
+
+        Args:
+            tokens: Tokens to take, at most the capacity
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+def is_retryable(error) -> bool:
+    """Check whether a failed call may succeed if sent again later"""
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    if status is None:
+        # Connection resets and timeouts never reached the API
+        return isinstance(error, OSError)
+    if status in RETRYABLE_STATUSES:
+        return True
+    if status != 403:
+        return False
+
+    # A 403 is a rate limit only when the error says so; otherwise it is a permission problem
+    details = getattr(error, 'error_details', None)
+    reasons = {str(detail.get('reason', '')).replace('_', '').lower()
+               for detail in details if isinstance(detail, dict)} if isinstance(details, list) else set()
+    message = error._get_reason() if hasattr(error, '_get_reason') else str(error)
+    return bool(reasons & RATE_LIMIT_REASONS) or 'rate limit' in message.lower()
+
+def retry_after(error) -> Optional[float]:
+    """Get the server's requested wait in seconds from a Retry-After header"""
+    resp = getattr(error, 'resp', None)
+    value = resp.get('retry-after') if hasattr(resp, 'get') else None
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+class RequestExecutor:
+    """Shared gateway for Calendar API calls.
+
+    Every call first takes a token from a bucket refilled at the project's
+    sustainable rate, so bulk work runs at full speed without tripping the
+    quota. Calls that still hit a rate limit, a 5xx or a dropped connection
+    are retried with exponential backoff and full jitter, or after the
+    server's Retry-After when it sends one.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, requests_per_second: float = 5.0, burst: Optional[float] = None,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 32.0):
+        self.bucket = TokenBucket(requests_per_second, burst or max(1.0, requests_per_second * 2))
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._metrics = {'calls': 0, 'retries': 0, 'throttled': 0, 'throttle_seconds': 0.0,
+                         'backoff_seconds': 0.0, 'failures': 0}
+
+    @classmethod
+    def shared(cls) -> "RequestExecutor":
+        """Get the process-wide executor configured from the environment"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                try:
+                    rate = float(os.getenv('CHRONA_CALENDAR_QPS', 5))
+                    max_retries = int(os.getenv('CHRONA_CALENDAR_MAX_RETRIES', 5))
+                except ValueError:
+                    rate, max_retries = 5.0, 5
+                cls._shared = cls(requests_per_second=rate, max_retries=max_retries)
+            return cls._shared
+
+    def acquire(self, calls: int = 1):
+        """Wait for quota for a number of calls, e.g. every item of a batch"""
+        waited = sum(self.bucket.acquire() for _ in range(calls))
+        with self._lock:
+            self._metrics['calls'] += calls
+            if waited:
+                self._metrics['throttled'] += 1
+                self._metrics['throttle_seconds'] += waited
+
+    def backoff_delay(self, attempt: int, error=None) -> float:
+        """Seconds to wait before retry number attempt (0-based)"""
+        requested = retry_after(error) if error is not None else None
+        if requested is not None:
+            return min(requested, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def wait_before_retry(self, attempt: int, error=None):
+        """Sleep before a retry and record it"""
+        delay = self.backoff_delay(attempt, error)
+        with self._lock:
+            self._metrics['retries'] += 1
+            self._metrics['backoff_seconds'] += delay
+        time.sleep(delay)
+
+    def record_failure(self):
+        """Count a call that failed for good"""
+        with self._lock:
+            self._metrics['failures'] += 1
+
+    def execute(self, request):
+        """
+        Execute one API request under the rate limit, retrying transient failures.
+
+        Args:
+            request: Unexecuted HttpRequest
+
+        Returns:
+            The API response
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                return request.execute()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self.record_failure()
+                    raise
+                self.wait_before_retry(attempt, e)
+                attempt += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Get call, retry and throttling counters"""
+        with self._lock:
+            return dict(self._metrics)
+
+def execute_request(request):
+    """Execute a Calendar API request through the shared executor"""
+    return RequestExecutor.shared().execute(request)
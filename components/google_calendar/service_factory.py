@@ -0,0 +1,196 @@
+"""
+Google Calendar Service Factory Module
+
+This module hands out Calendar API services for the whole process including:
+- Loading, saving and proactively refreshing OAuth credentials
+- Building services from a discovery document parsed once
+- A pool of services and authorized HTTP transports, reused across threads and reruns
+"""
+
+import datetime
+import json
+import os
+import threading
+import weakref
+
+# Calendar read/write access
+SCOPES = ['https://www.googleapis.com/auth/calendar']
+
+# Credentials are refreshed this long before they expire, not when a call fails
+REFRESH_MARGIN = datetime.timedelta(minutes=5)
+
+class CalendarServiceFactory:
+    """Process-wide source of authorized Calendar services.
+
+    Building a service from discovery and authorizing a fresh transport on
+    every call is the slow part of talking to the API. The factory parses
+    the discovery document once, keeps the user's credentials in memory and
+    refreshes them ahead of expiry, and lends services out of a pool.
+    httplib2 transports are not thread-safe, so a service is leased to one
+    thread at a time: the thread keeps it for every call it makes, and it
+    goes back to the pool when the thread ends. Streamlit reruns and worker
+    pools run on short-lived threads, so the next one picks up the same
+    service with its connections still open.
+
+    There is one set of credentials per process, loaded from the token file,
+    so every session acts as the same Google user and forget() disconnects
+    all of them.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+    _discovery_document = None
+
+    # Idle services kept for reuse; more than this are closed when returned
+    MAX_IDLE_SERVICES = 8
+
+    def __init__(self, token_path: str = 'token.json',
+                 credentials_path: str = 'google_calendar_credentials.json'):
+        self.token_path = token_path
+        self.credentials_path = credentials_path
+        self._credentials = None
+        self._generation = 0
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        # (generation, service) pairs not leased to any thread
+        self._idle = []
+
+    @classmethod
+    def shared(cls) -> "CalendarServiceFactory":
+        """Get the process-wide factory configured from the environment"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    token_path=os.getenv('CHRONA_GOOGLE_TOKEN_PATH', 'token.json'),
+                    credentials_path=os.getenv('CHRONA_GOOGLE_CREDENTIALS_PATH', 'google_calendar_credentials.json')
+                )
+            return cls._shared
+
+    @classmethod
+    def discovery_document(cls) -> dict:
+        """Get the Calendar v3 discovery document bundled with the client library, parsed once"""
+        with cls._shared_lock:
+            if cls._discovery_document is None:
+                from googleapiclient.discovery_cache import get_static_doc
+                cls._discovery_document = json.loads(get_static_doc('calendar', 'v3'))
+            return cls._discovery_document
+
+    def load_credentials(self):
+        """
+        Get the user's credentials, refreshing them if they expire soon.
+
+        Returns:
+            Credentials: Valid credentials, or None if the user still has to authorize
+        """
+        with self._lock:
+            if self._credentials is None and os.path.exists(self.token_path):
+                from google.oauth2.credentials import Credentials
+                self._credentials = Credentials.from_authorized_user_file(self.token_path, SCOPES)
+
+            creds = self._credentials
+            if creds is None:
+                return None
+            if self._expires_soon(creds) and creds.refresh_token:
+                from google.auth.exceptions import RefreshError
+                from google.auth.transport.requests import Request
+                try:
+                    creds.refresh(Request())
+                except RefreshError:
+                    # Revoked or expired refresh token: the user has to authorize again
+                    self._credentials = None
+                    self._generation += 1
+                    return None
+                self._write_token(creds)
+            return creds if creds.valid else None
+
+    def save_credentials(self, creds):
+        """Store newly authorized credentials and persist them for the next run"""
+        with self._lock:
+            self._credentials = creds
+            self._generation += 1
+            self._write_token(creds)
+
+    def get_service(self):
+        """
+        Get this thread's Calendar service for the current user.
+
+        The first call on a thread leases a service from the pool, or builds
+        one if none is idle; it is returned to the pool when the thread ends.
+
+        Returns:
+            Resource: Authorized service, or None if there are no valid credentials
+        """
+        creds = self.load_credentials()
+        if creds is None:
+            return None
+
+        with self._lock:
+            generation = self._generation
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None and lease.generation == generation:
+            return lease.service
+
+        # Hand back a lease from before the credentials changed; it is discarded
+        self._local.lease = None
+        service = self._checkout(generation)
+        if service is None:
+            service = self._build_service(creds)
+        self._local.lease = _ServiceLease(self, generation, service)
+        return service
+
+    def forget(self):
+        """Drop the user's credentials and every pooled service, and delete the token file"""
+        with self._lock:
+            self._credentials = None
+            self._generation += 1
+            self._idle.clear()
+            if os.path.exists(self.token_path):
+                os.remove(self.token_path)
+
+    def _build_service(self, creds):
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+        from googleapiclient.discovery import build_from_document
+
+        return build_from_document(
+            self.discovery_document(),
+            http=AuthorizedHttp(creds, http=httplib2.Http())
+        )
+
+    def _checkout(self, generation: int):
+        """Take an idle service built for the current credentials, if any"""
+        with self._lock:
+            while self._idle:
+                idle_generation, service = self._idle.pop()
+                if idle_generation == generation:
+                    return service
+            return None
+
+    def _checkin(self, generation: int, service):
+        """Return a service whose thread ended; stale or surplus ones are dropped"""
+        with self._lock:
+            if generation == self._generation and len(self._idle) < self.MAX_IDLE_SERVICES:
+                self._idle.append((generation, service))
+
+    def _expires_soon(self, creds) -> bool:
+        if creds.expiry is None:
+            return not creds.valid
+        # google-auth stores expiry as naive UTC
+        return creds.expiry - REFRESH_MARGIN <= datetime.datetime.utcnow()
+
+    def _write_token(self, creds):
+        directory = os.path.dirname(self.token_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.token_path, 'w') as token:
+            token.write(creds.to_json())
+
+
+class _ServiceLease:
+    """A pooled service held by one thread, checked back in when the thread ends"""
+
+    def __init__(self, factory: CalendarServiceFactory, generation: int, service):
+        self.generation = generation
+        self.service = service
+        # Runs when the thread's local storage is cleared or the lease is replaced
+        weakref.finalize(self, factory._checkin, generation, service)
@@ -10,6 +10,9 @@ This module handles calendar integration settings including:
 
 import streamlit as st
 from .auth import disconnect_calendar, get_calendar_service
+from .auto_sync import AutoSyncScheduler
+from .calendars import CalendarListCache, get_calendar_names
+from .sync import apply_auto_sync_settings, get_sync_interval_name
 
 def render_calendar_settings():
     """Render calendar integration settings"""
@@ -31,19 +34,25 @@ def render_sync_preferences():
     col1, col2 = st.columns(2)
     
     with col1:
+        # Background sync is shared by every session, so show its current
+        # settings and only change them when these widgets are edited
+        scheduler = AutoSyncScheduler.shared()
+        st.session_state.auto_sync_enabled = scheduler.enabled
+        st.session_state.sync_interval = get_sync_interval_name(scheduler.interval_seconds)
+        
         auto_sync = st.checkbox(
             "🔄 Auto-sync when tasks change",
-            value=st.session_state.get('auto_sync_enabled', True),
             help="Automatically sync tasks to calendar when modified",
-            key="auto_sync_enabled"
+            key="auto_sync_enabled",
+            on_change=apply_auto_sync_settings
         )
         
         sync_interval = st.selectbox(
             "📅 Sync Interval",
             ["Real-time", "Every 15 minutes", "Every hour", "Daily"],
-            index=get_sync_interval_index(),
             key="sync_interval",
-            help="How often to perform automatic sync"
+            help="How often to perform automatic sync",
+            on_change=apply_auto_sync_settings
         )
         
         default_calendar = st.selectbox(
@@ -162,12 +171,6 @@ def render_account_management():
             st.success("⚙️ Settings reset to default values!")
             st.rerun()
 
-def get_sync_interval_index():
-    """Get index for sync interval selectbox"""
-    interval = st.session_state.get('sync_interval', 'Every hour')
-    intervals = ["Real-time", "Every 15 minutes", "Every hour", "Daily"]
-    return intervals.index(interval) if interval in intervals else 2
-
 def get_default_calendar_index():
     """Get index for default calendar selectbox"""
     calendar = st.session_state.get('default_calendar', 'Primary Calendar')
@@ -205,16 +208,7 @@ def get_available_calendars():
         return ["Primary Calendar"]
     
     try:
-        calendar_list = service.calendarList().list().execute()
-        calendars = []
-        
-        for calendar in calendar_list.get('items', []):
-            if calendar.get('primary'):
-                calendars.append("Primary Calendar")
-            else:
-                calendars.append(calendar.get('summary', 'Unknown Calendar'))
-        
-        return calendars if calendars else ["Primary Calendar"]
+        return get_calendar_names(service)
         
     except Exception as e:
         st.error(f"❌ Failed to get calendar list: {str(e)}")
@@ -228,11 +222,11 @@ def get_account_info():
     
     try:
         # Get calendar info to determine account
-        calendar_list = service.calendarList().list().execute()
-        primary_calendar = next((cal for cal in calendar_list.get('items', []) if cal.get('primary')), None)
+        calendars = CalendarListCache.shared().get(service)
+        primary_calendar = next((cal for cal in calendars if cal['primary']), None)
         
         if primary_calendar:
-            return primary_calendar.get('summary', 'Unknown Account')
+            return primary_calendar['summary']
         
         return "Connected Account"
         
@@ -267,6 +261,7 @@ def reset_settings_to_default():
     
     for key, value in default_settings.items():
         st.session_state[key] = value
+    apply_auto_sync_settings()
 
 def get_user_settings():
     """Get all user settings as a dictionary"""
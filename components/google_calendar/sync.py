@@ -5,16 +5,22 @@ This module handles sync status and management including:
 - Sync status tracking
 - Sync history management
 - Manual sync controls
+- Background auto-sync hand-off
 - Sync error handling
 """
 
+import hashlib
+import json
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 
 from .auth import get_calendar_service
-from .export import sync_tasks_to_calendar
+from .auto_sync import SYNC_INTERVAL_SECONDS, AutoSyncScheduler
+from .export import build_schedule_events, sync_tasks_to_calendar
 from .import_calendar import import_calendar_events
+from .incremental import get_sync_engine
+from .request_executor import RequestExecutor
 
 def render_sync_status():
     """Render sync status and history"""
@@ -51,6 +57,29 @@ def render_sync_status():
     else:
         st.info("📋 No sync history available yet.")
     
+    # Background auto-sync
+    auto_status = AutoSyncScheduler.shared().status()
+    if auto_status['enabled']:
+        if auto_status['running']:
+            st.caption("🤖 Background sync is running...")
+        elif auto_status['next_run_in'] is not None:
+            st.caption(f"🤖 Background sync on - next run in {int(auto_status['next_run_in'] // 60)} min")
+    else:
+        st.caption("🤖 Background sync is off - enable auto-sync in Settings")
+    
+    # API usage since the app started
+    with st.expander("📡 API Usage"):
+        api_stats = RequestExecutor.shared().stats()
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("API Calls", api_stats['calls'])
+        with col2:
+            st.metric("Retries", api_stats['retries'])
+        with col3:
+            st.metric("Throttled", api_stats['throttled'], f"{api_stats['throttle_seconds']:.1f}s waited")
+        with col4:
+            st.metric("Failed Calls", api_stats['failures'])
+    
     # Manual sync controls
     st.markdown("#### 🔧 Manual Sync Controls")
     
@@ -176,24 +205,30 @@ def perform_full_sync():
             # Get current tasks and events
             if 'optimizer' in st.session_state and st.session_state.optimizer.tasks:
                 # Export tasks
-                sync_tasks_to_calendar(st.session_state.optimizer)
-                task_count = len(st.session_state.optimizer.tasks)
-                add_sync_record("Full Sync - Export", "✅ Success", f"Exported {task_count} tasks", task_count)
-            
-            # Import events
-            now = datetime.utcnow().isoformat() + 'Z'
-            end_time = (datetime.utcnow() + timedelta(days=30)).isoformat() + 'Z'
+                results = sync_tasks_to_calendar(st.session_state.optimizer)
+                if results is None:
+                    add_sync_record("Full Sync - Export", "❌ Failed", "Could not export tasks")
+                else:
+                    task_count = results['inserted'] + results['updated'] + results['deleted']
+                    details = (f"{results['inserted']} added, {results['updated']} updated, "
+                               f"{results['deleted']} removed, {results['unchanged']} unchanged")
+                    if results['failed']:
+                        add_sync_record("Full Sync - Export", "⚠️ Partial Error",
+                                        f"{details}, {len(results['failed'])} failed", task_count)
+                    else:
+                        add_sync_record("Full Sync - Export", "✅ Success", details, task_count)
             
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=now,
-                timeMax=end_time,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            add_sync_record("Full Sync - Import", "✅ Success", f"Imported {len(events)} events", len(events))
+            # Import events changed since the last sync (everything on the first one)
+            engine = get_sync_engine()
+            result = engine.sync(service, 'primary')
+            now = datetime.utcnow()
+            events = engine.store.events_between('primary', now, now + timedelta(days=30))
+            add_sync_record(
+                "Full Sync - Import", "✅ Success",
+                f"{result['mode'].title()} sync: {result['changed']} changed, {result['deleted']} removed "
+                f"({len(events)} events in the next 30 days)",
+                len(events)
+            )
             
             st.success(f"✅ Full sync completed! Synced {task_count if 'task_count' in locals() else 0} tasks and imported {len(events)} events.")
             
@@ -249,36 +284,83 @@ def render_sync_statistics():
         st.metric("Success Rate", f"{stats['success_rate']:.1f}%")
 
 def auto_sync_check():
-    """Check if auto-sync should be performed"""
+    """Check if background auto-sync is running for this session's account"""
     if not st.session_state.get('calendar_authenticated', False):
         return False
     
-    # Check auto-sync settings
-    auto_sync_enabled = st.session_state.get('auto_sync_enabled', False)
-    if not auto_sync_enabled:
-        return False
+    return AutoSyncScheduler.shared().enabled
+
+def get_sync_interval_name(interval_seconds):
+    """Get the Sync Interval setting matching a number of seconds"""
+    for name, seconds in SYNC_INTERVAL_SECONDS.items():
+        if seconds == interval_seconds:
+            return name
+    return 'Every hour'
+
+def apply_auto_sync_settings():
+    """Apply the auto-sync settings widgets to the background scheduler"""
+    sync_interval = st.session_state.get('sync_interval', 'Every hour')
+    AutoSyncScheduler.shared().configure(
+        st.session_state.get('auto_sync_enabled', True),
+        SYNC_INTERVAL_SECONDS.get(sync_interval, SYNC_INTERVAL_SECONDS['Every hour'])
+    )
+
+def schedule_auto_sync(optimizer=None):
+    """
+    Hand automatic sync to the background scheduler.
     
-    # Check last sync time
-    last_sync = st.session_state.get('sync_data', {}).get('last_sync')
-    if not last_sync:
-        return True
+    Runs on every rerun but never calls the Calendar API itself: it queues
+    the optimized schedule when it changed and publishes finished background
+    syncs to the sync history. The scheduler is shared by every session, so
+    its settings only change through the Settings widgets; until anyone sets
+    them it starts with the defaults those widgets show.
     
-    # Check sync interval
-    sync_interval = st.session_state.get('sync_interval', 'Every hour')
-    now = datetime.now()
+    Args:
+        optimizer: The ScheduleOptimizer whose optimized schedule is exported
+    """
+    scheduler = AutoSyncScheduler.shared()
+    if not scheduler.configured:
+        scheduler.configure(True, SYNC_INTERVAL_SECONDS['Every hour'])
+    enabled = auto_sync_check()
     
-    if sync_interval == "Real-time":
-        return True
-    elif sync_interval == "Every 15 minutes":
-        return (now - last_sync).total_seconds() > 900  # 15 minutes
-    elif sync_interval == "Every hour":
-        return (now - last_sync).total_seconds() > 3600  # 1 hour
-    elif sync_interval == "Daily":
-        return (now - last_sync).total_seconds() > 86400  # 24 hours
+    if enabled and optimizer is not None and optimizer.optimized_schedule \
+            and optimizer.optimized_schedule.get('optimized_schedule'):
+        events = build_schedule_events(optimizer.optimized_schedule)
+        export_key = hashlib.sha256(json.dumps(events, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        if st.session_state.get('auto_sync_export_key') != export_key:
+            st.session_state.auto_sync_export_key = export_key
+            scheduler.submit_export(events)
     
-    return False
+    publish_auto_sync_results()
 
-def schedule_auto_sync():
-    """Schedule automatic sync if conditions are met"""
-    if auto_sync_check():
-        perform_full_sync() 
\ No newline at end of file
+def publish_auto_sync_results():
+    """Add background syncs finished since the last rerun to the sync history"""
+    scheduler = AutoSyncScheduler.shared()
+    if 'auto_sync_last_seen' not in st.session_state:
+        # A new session only reports syncs that finish from now on
+        st.session_state.auto_sync_last_seen = scheduler.latest_sequence()
+    last_seen = st.session_state.auto_sync_last_seen
+    
+    for result in scheduler.results_since(last_seen):
+        last_seen = result['sequence']
+        if result['error']:
+            add_sync_record("Auto Sync", "❌ Failed", result['error'])
+            continue
+        
+        imported = result['import']
+        add_sync_record(
+            "Auto Sync - Import", "✅ Success",
+            f"{imported['mode'].title()} sync: {imported['changed']} changed, {imported['deleted']} removed",
+            imported['changed']
+        )
+        exported = result['export']
+        if exported:
+            status = "⚠️ Partial Error" if exported['failed'] else "✅ Success"
+            add_sync_record(
+                "Auto Sync - Export", status,
+                f"{exported['inserted']} added, {exported['updated']} updated, "
+                f"{exported['deleted']} removed, {exported['unchanged']} unchanged",
+                exported['inserted'] + exported['updated'] + exported['deleted']
+            )
+    
+    st.session_state.auto_sync_last_seen = last_seen
@@ -12,7 +12,7 @@ import streamlit as st
 from .auth import is_authenticated, render_authentication_section, render_setup_instructions, check_google_calendar_api
 from .export import render_export_section, sync_tasks_to_calendar
 from .import_calendar import render_import_section, import_calendar_events
-from .sync import render_sync_status
+from .sync import render_sync_status, schedule_auto_sync
 from .settings import render_calendar_settings
 
 def render_google_calendar_integration(optimizer):
@@ -44,6 +44,9 @@ def render_calendar_dashboard(optimizer):
     """Render the main calendar dashboard when authenticated"""
     st.success("✅ Connected to Google Calendar")
     
+    # Keep background sync in step with the settings and the latest schedule
+    schedule_auto_sync(optimizer)
+    
     # Action buttons
     render_action_buttons(optimizer)
     
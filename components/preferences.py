@@ -37,6 +37,12 @@ def render_preferences_sidebar():
                 help="How long should breaks be between tasks?"
             )
 
+            avoid_calendar_conflicts = st.checkbox(
+                "Work around my calendar events",
+                value=True,
+                help="Keep times already taken in your Google Calendar free (when connected)"
+            )
+
         st.markdown("**🎯 Work Style**")
         work_type = st.selectbox(
             "Work priority style", 
@@ -54,6 +60,30 @@ def render_preferences_sidebar():
             1, 5, 3,
             help="1 = Strict schedule, 5 = Very flexible"
         )
+
+        st.markdown("**⚡ Performance**")
+        optimization_mode = st.selectbox(
+            "Generation mode",
+            ["Auto", "Standard", "Parallel days", "Local solver"],
+            help="Auto builds very small single-day schedules instantly on this machine and sends the rest to the AI. "
+                 "Parallel days plans each day of a multi-day schedule with its own request, all at once. "
+                 "Local solver skips the AI and builds the schedule instantly on this machine."
+        )
+        background_optimization = st.checkbox(
+            "Run optimization in background",
+            value=True,
+            help="Keep the app responsive while the AI builds your schedule"
+        )
+        stream_schedule = st.checkbox(
+            "Show days as they are generated",
+            value=True,
+            help="Stream the AI response and preview each day as soon as it is ready"
+        )
+        quick_chat_edits = st.checkbox(
+            "Apply chat requests as quick edits",
+            value=True,
+            help="Change only the parts of your schedule a chat request affects instead of rebuilding it"
+        )
         
         st.markdown("---")
         
@@ -84,5 +114,10 @@ def render_preferences_sidebar():
             'peak_hours': peak_hours,
             'break_time': break_time,
             'work_type': work_type,
-            'flexibility': flexibility
+            'flexibility': flexibility,
+            'background_optimization': background_optimization,
+            'stream_schedule': stream_schedule,
+            'quick_chat_edits': quick_chat_edits,
+            'optimization_mode': optimization_mode,
+            'avoid_calendar_conflicts': avoid_calendar_conflicts
         }
@@ -1,17 +1,29 @@
 import streamlit as st
 import datetime
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from matplotlib.patches import Rectangle
+from matplotlib.collections import PolyCollection
+from models.schedule_model import MINUTES_PER_DAY
 from .schedule_themes import get_theme_color
+from .figure_cache import FigureCache, display_cached_figure, display_figure
 
-def render_enhanced_chart(schedule_df, day_index, chart_style, show_priorities, day_theme):
-    """Render enhanced chart with dynamic updates"""
+# Charts stay responsive well past a single day of tasks
+MAX_CHART_TASKS = 500
+
+# Above this many tasks, in-bar text is dropped and row labels are thinned to keep charts legible
+MAX_LABELED_TASKS = 40
+
+# Cap on figure height in inches for row-per-task charts
+MAX_FIGURE_HEIGHT = 40
+
+def render_enhanced_chart(schedule_df, day_index, chart_style, show_priorities, day_theme, entries=None):
+    """Render enhanced chart with dynamic updates, reusing parsed entries when given"""
     
     # Check task count limit
-    if len(schedule_df) > 25:
-        st.error(f"🚫 Too many tasks ({len(schedule_df)}) for chart display. Maximum allowed: 25")
+    if len(schedule_df) > MAX_CHART_TASKS:
+        st.error(f"🚫 Too many tasks ({len(schedule_df)}) for chart display. Maximum allowed: {MAX_CHART_TASKS}")
         st.info("💡 Use filtering options above to reduce the number of tasks")
         return
     
@@ -26,30 +38,24 @@ def render_enhanced_chart(schedule_df, day_index, chart_style, show_priorities,
             st.warning("No schedule data available for chart.")
             return
         
-        # Fix time formats
-        for idx, row in schedule_df_clean.iterrows():
-            start_time = str(row['start_time'])
-            end_time = str(row['end_time'])
-            
-            if start_time == '24:00':
-                schedule_df_clean.loc[idx, 'start_time'] = '00:00'
-            if end_time == '24:00':
-                schedule_df_clean.loc[idx, 'end_time'] = '00:00'
+        # Set up matplotlib with theme colors
+        plt.style.use('dark_background')
         
-        # Convert to datetime
-        today = datetime.date.today()
-        schedule_df_clean['start_datetime'] = schedule_df_clean['start_time'].apply(
-            lambda x: datetime.datetime.combine(today, datetime.datetime.strptime(x, '%H:%M').time())
-        )
-        schedule_df_clean['end_datetime'] = schedule_df_clean['end_time'].apply(
-            lambda x: datetime.datetime.combine(today, datetime.datetime.strptime(x, '%H:%M').time())
-        )
+        # Reuse the rendered image when neither the data nor the options changed
+        cache_key = FigureCache.make_key("schedule_chart", schedule_df, chart_style, show_priorities, day_theme)
+        if display_cached_figure(cache_key):
+            return
         
-        # Sort by start time
-        schedule_df_clean = schedule_df_clean.sort_values('start_datetime')
+        # Minutes since midnight for every row (24:00 wraps to midnight as before)
+        start_minutes, end_minutes = get_minute_columns(schedule_df_clean, entries)
+        midnight = pd.Timestamp(datetime.date.today())
+        schedule_df_clean['start_datetime'] = midnight + pd.to_timedelta(start_minutes, unit='m')
+        schedule_df_clean['end_datetime'] = midnight + pd.to_timedelta(end_minutes, unit='m')
+        schedule_df_clean['start_hour'] = start_minutes / 60
+        schedule_df_clean['duration_hours'] = (end_minutes - start_minutes) / 60
         
-        # Set up matplotlib with theme colors
-        plt.style.use('dark_background')
+        # Sort by start time
+        schedule_df_clean = schedule_df_clean.sort_values('start_datetime', kind='stable')
         
         # Priority color mapping
         if show_priorities:
@@ -73,36 +79,74 @@ def render_enhanced_chart(schedule_df, day_index, chart_style, show_priorities,
         
         # Create chart based on style
         if chart_style == "Bar Chart":
-            render_bar_chart(schedule_df_clean, priority_colors, day_theme)
+            render_bar_chart(schedule_df_clean, priority_colors, day_theme, cache_key)
         elif chart_style == "Compact":
-            render_compact_chart(schedule_df_clean, priority_colors, day_theme)
+            render_compact_chart(schedule_df_clean, priority_colors, day_theme, cache_key)
         else:  # Timeline
-            render_timeline_chart(schedule_df_clean, priority_colors, day_theme)
-        
+            render_timeline_chart(schedule_df_clean, priority_colors, day_theme, cache_key)
+    
     except Exception as e:
         plt.close('all')
         st.error(f"Chart error: {str(e)}")
         st.info("📊 Chart temporarily unavailable - use the table view above")
 
-def render_bar_chart(schedule_df_clean, priority_colors, day_theme):
+def get_minute_columns(schedule_df, entries=None):
+    """
+    Get start and end times of every row as minutes since midnight.
+    
+    Args:
+        schedule_df: Schedule DataFrame with start_time/end_time columns
+        entries: Already-parsed ScheduleEntry objects for the same rows, if available
+    
+    Returns:
+        tuple: Integer numpy arrays of start and end minutes, with 24:00 mapped to 0
+    """
+    if entries is not None:
+        start = np.fromiter((entry.start for entry in entries), dtype=np.int64, count=len(entries))
+        end = np.fromiter((entry.end for entry in entries), dtype=np.int64, count=len(entries))
+        return start % MINUTES_PER_DAY, end % MINUTES_PER_DAY
+    
+    def to_minutes(times):
+        times = times.astype(str).str.strip()
+        times = times.mask(times == '24:00', '00:00')
+        parsed = pd.to_datetime(times, format='%H:%M')
+        return (parsed.dt.hour * 60 + parsed.dt.minute).to_numpy(dtype=np.int64)
+    
+    return to_minutes(schedule_df['start_time']), to_minutes(schedule_df['end_time'])
+
+def get_bar_colors(schedule_df_clean, priority_colors):
+    """Map each row's priority to its bar color"""
+    return schedule_df_clean['priority'].astype(str).map(priority_colors).fillna('#777777').tolist()
+
+def get_time_labels(schedule_df_clean):
+    """Build 'Task\\nHH:MM-HH:MM' labels for every row"""
+    return (schedule_df_clean['task_name'].astype(str) + "\n" +
+            schedule_df_clean['start_time'].astype(str) + "-" +
+            schedule_df_clean['end_time'].astype(str)).tolist()
+
+def get_figure_height(task_count, minimum):
+    """Figure height for a chart with one row per task"""
+    return min(MAX_FIGURE_HEIGHT, max(minimum, task_count * 0.5))
+
+def set_row_labels(ax, labels, fontsize):
+    """Label chart rows, thinning the ticks so at most MAX_LABELED_TASKS are drawn"""
+    step = max(1, -(-len(labels) // MAX_LABELED_TASKS))
+    ax.set_yticks(np.arange(0, len(labels), step))
+    ax.set_yticklabels(labels[::step], fontsize=fontsize, color='white')
+
+def render_bar_chart(schedule_df_clean, priority_colors, day_theme, cache_key=None):
     """Render horizontal bar chart"""
-    schedule_df_clean['duration_hours'] = (
-        schedule_df_clean['end_datetime'] - schedule_df_clean['start_datetime']
-    ).dt.total_seconds() / 3600
-    
-    fig, ax = plt.subplots(figsize=(12, max(6, len(schedule_df_clean) * 0.5)), dpi=80)
+    task_count = len(schedule_df_clean)
+    fig, ax = plt.subplots(figsize=(12, get_figure_height(task_count, 6)), dpi=80)
     
-    y_positions = range(len(schedule_df_clean))
-    colors = [priority_colors.get(str(priority), '#777777') for priority in schedule_df_clean['priority']]
+    y_positions = np.arange(task_count)
+    colors = get_bar_colors(schedule_df_clean, priority_colors)
     
-    bars = ax.barh(y_positions, schedule_df_clean['duration_hours'], 
-                  color=colors, alpha=0.8, edgecolor='white', linewidth=1.5)
+    ax.barh(y_positions, schedule_df_clean['duration_hours'].to_numpy(),
+            color=colors, alpha=0.8, edgecolor='white', linewidth=1.5)
     
     # Labels
-    ax.set_yticks(y_positions)
-    ax.set_yticklabels([f"{row['task_name']}\n{row['start_time']}-{row['end_time']}" 
-                       for idx, row in schedule_df_clean.iterrows()], 
-                      fontsize=10, color='white')
+    set_row_labels(ax, get_time_labels(schedule_df_clean), fontsize=10)
     ax.set_xlabel('Duration (Hours)', fontsize=14, color='white', fontweight='bold')
     ax.set_title(f'Daily Schedule - {day_theme}', fontsize=18, color='white', fontweight='bold', pad=20)
     ax.invert_yaxis()
@@ -114,28 +158,26 @@ def render_bar_chart(schedule_df_clean, priority_colors, day_theme):
     fig.patch.set_facecolor('#000000')
     
     plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+    display_figure(fig, cache_key)
 
-def render_compact_chart(schedule_df_clean, priority_colors, day_theme):
+def render_compact_chart(schedule_df_clean, priority_colors, day_theme, cache_key=None):
     """Render compact timeline chart"""
     fig, ax = plt.subplots(figsize=(14, 4), dpi=80)
     
-    # Create timeline
-    for i, (idx, row) in enumerate(schedule_df_clean.iterrows()):
-        start_time = row['start_datetime']
-        end_time = row['end_datetime']
-        color = priority_colors.get(str(row['priority']), '#777777')
-        
-        # Create compact bar
-        ax.barh(0, (end_time - start_time).total_seconds() / 3600, 
-               left=start_time.hour + start_time.minute/60, 
-               height=0.5, color=color, alpha=0.8, edgecolor='white')
-        
-        # Add task name
-        mid_time = start_time.hour + start_time.minute/60 + (end_time - start_time).total_seconds() / 7200
-        ax.text(mid_time, 0.6, row['task_name'], 
-               rotation=45, ha='left', va='bottom', fontsize=8, color='white')
+    start_hours = schedule_df_clean['start_hour'].to_numpy()
+    duration_hours = schedule_df_clean['duration_hours'].to_numpy()
+    
+    # Draw every task in a single collection
+    ax.broken_barh(list(zip(start_hours, duration_hours)), (-0.25, 0.5),
+                   facecolors=get_bar_colors(schedule_df_clean, priority_colors),
+                   alpha=0.8, edgecolor='white')
+    
+    # Add task names
+    if len(schedule_df_clean) <= MAX_LABELED_TASKS:
+        mid_times = start_hours + duration_hours / 2
+        for mid_time, task_name in zip(mid_times, schedule_df_clean['task_name']):
+            ax.text(mid_time, 0.6, task_name,
+                    rotation=45, ha='left', va='bottom', fontsize=8, color='white')
     
     # Styling
     ax.set_xlim(0, 24)
@@ -152,39 +194,43 @@ def render_compact_chart(schedule_df_clean, priority_colors, day_theme):
     fig.patch.set_facecolor('#000000')
     
     plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+    display_figure(fig, cache_key)
 
-def render_timeline_chart(schedule_df_clean, priority_colors, day_theme):
+def render_timeline_chart(schedule_df_clean, priority_colors, day_theme, cache_key=None):
     """Render full timeline chart"""
-    fig, ax = plt.subplots(figsize=(12, max(8, len(schedule_df_clean) * 0.5)), dpi=80)
-    
-    y_positions = range(len(schedule_df_clean))
-    
-    for i, (idx, row) in enumerate(schedule_df_clean.iterrows()):
-        start_time = row['start_datetime']
-        end_time = row['end_datetime']
-        color = priority_colors.get(str(row['priority']), '#777777')
-        
-        # Create timeline bar
-        duration = end_time - start_time
-        start_num = float(mdates.date2num(start_time))
-        duration_num = float(mdates.date2num(end_time) - start_num)
-        
-        bar = Rectangle((start_num, i - 0.4), duration_num, 0.8,
-                       facecolor=color, alpha=0.8, edgecolor='white', linewidth=2)
-        ax.add_patch(bar)
-        
-        # Add task label
-        text_x = float(start_num + duration_num/2)
-        ax.text(text_x, i, f"{row['task_name']}\n{row['start_time']}-{row['end_time']}", 
-               ha='center', va='center', fontsize=10, color='white', fontweight='bold')
+    task_count = len(schedule_df_clean)
+    fig, ax = plt.subplots(figsize=(12, get_figure_height(task_count, 8)), dpi=80)
+    
+    y_positions = np.arange(task_count)
+    
+    # Bar corners in date units, one row per task, drawn as a single collection
+    start_num = mdates.date2num(schedule_df_clean['start_datetime'].dt.to_pydatetime())
+    end_num = mdates.date2num(schedule_df_clean['end_datetime'].dt.to_pydatetime())
+    bottom = y_positions - 0.4
+    top = y_positions + 0.4
+    verts = np.stack([
+        np.column_stack([start_num, bottom]),
+        np.column_stack([start_num, top]),
+        np.column_stack([end_num, top]),
+        np.column_stack([end_num, bottom])
+    ], axis=1)
+    ax.add_collection(PolyCollection(
+        verts, facecolors=get_bar_colors(schedule_df_clean, priority_colors),
+        alpha=0.8, edgecolors='white', linewidths=2
+    ))
+    
+    # Add task labels
+    if task_count <= MAX_LABELED_TASKS:
+        text_x = (start_num + end_num) / 2
+        for x, y, label in zip(text_x, y_positions, get_time_labels(schedule_df_clean)):
+            ax.text(x, y, label,
+                    ha='center', va='center', fontsize=10, color='white', fontweight='bold')
     
     # Format time axis
     start_min = float(mdates.date2num(schedule_df_clean['start_datetime'].min() - pd.Timedelta(hours=1)))
     end_max = float(mdates.date2num(schedule_df_clean['end_datetime'].max() + pd.Timedelta(hours=1)))
     ax.set_xlim(start_min, end_max)
-    ax.set_ylim(-0.5, len(schedule_df_clean) - 0.5)
+    ax.set_ylim(-0.5, task_count - 0.5)
     
     ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
     ax.xaxis.set_major_locator(mdates.HourLocator(interval=2))
@@ -194,9 +240,7 @@ def render_timeline_chart(schedule_df_clean, priority_colors, day_theme):
     ax.set_ylabel('Scheduled Tasks', fontsize=16, color='white', fontweight='bold')
     ax.set_title(f'Daily Timeline - {day_theme}', fontsize=20, color='white', fontweight='bold', pad=30)
     
-    ax.set_yticks(y_positions)
-    ax.set_yticklabels([row['task_name'] for idx, row in schedule_df_clean.iterrows()], 
-                      fontsize=12, color='white')
+    set_row_labels(ax, schedule_df_clean['task_name'].astype(str).tolist(), fontsize=12)
     
     # Styling
     ax.tick_params(colors='white', labelsize=11)
@@ -205,5 +249,4 @@ def render_timeline_chart(schedule_df_clean, priority_colors, day_theme):
     fig.patch.set_facecolor('#000000')
     
     plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig) 
\ No newline at end of file
+    display_figure(fig, cache_key)
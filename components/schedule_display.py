@@ -1,9 +1,31 @@
 
 import streamlit as st
+from models.schedule_model import Schedule
+from services.structured_output import StructuredOutput
 from .schedule_feedback import render_schedule_feedback
 from .schedule_multiday import render_multi_day_schedule
 from .schedule_single_day import render_single_day_schedule
 
+def get_schedule_model(result):
+    """
+    Parse a stored optimization result into the schedule model once.
+
+    Entries with unusable times are dropped instead of failing the page. The
+    parsed result is kept in session state next to the result it came from,
+    so later reruns reuse it until the stored result is replaced.
+
+    Returns:
+        tuple: (repaired result dict, Schedule), or None if no day is usable
+    """
+    cached = st.session_state.get('optimized_schedule_model')
+    if cached is not None and cached[0] is result:
+        return cached[1]
+
+    repaired = StructuredOutput.repair_schedule(result)
+    parsed = (repaired, Schedule.from_result(repaired)) if repaired is not None else None
+    st.session_state.optimized_schedule_model = (result, parsed)
+    return parsed
+
 def render_schedule_results(result):
     """Render optimized schedule results"""
     if "optimized_schedule" not in result:
@@ -17,7 +39,17 @@ def render_schedule_results(result):
     # Check if this is multi-day format (array of day objects)
     if isinstance(schedule_data, list) and len(schedule_data) > 0 and isinstance(schedule_data[0], dict) and "day" in schedule_data[0]:
         # Multi-day format
-        render_multi_day_schedule(schedule_data)
+        parsed = get_schedule_model(result)
+        if parsed is None:
+            st.warning("⚠️ The schedule has no entries with usable times.")
+        else:
+            repaired, schedule = parsed
+            dropped = (sum(len(day.get("tasks", [])) for day in schedule_data if isinstance(day, dict))
+                       - sum(len(day.entries) for day in schedule.days))
+            if dropped > 0:
+                st.warning(f"⚠️ {dropped} entr{'y' if dropped == 1 else 'ies'} with unusable times "
+                           "could not be shown.")
+            render_multi_day_schedule(repaired["optimized_schedule"], schedule.days)
     else:
         # Single-day format (backward compatibility)
         render_single_day_schedule(schedule_data, day_index=None)
@@ -1,11 +1,18 @@
 import streamlit as st
-import datetime
 import pandas as pd
+from models.schedule_model import DaySchedule, ScheduleEntry
 from .schedule_themes import get_theme_emoji
 from .schedule_single_day import render_single_day_schedule
 
-def render_multi_day_schedule(schedule_data):
-    """Render multi-day schedule with enhanced day-specific charts"""
+def render_multi_day_schedule(schedule_data, days=None):
+    """Render multi-day schedule with enhanced day-specific charts
+
+    days are the already-parsed DaySchedule objects for schedule_data, if
+    available; otherwise each day is parsed and unusable entries are skipped.
+    """
+    if days is None:
+        days = [_parse_day(day_data) for day_data in schedule_data]
+        schedule_data = [day.to_dict() for day in days]
     
     # Initialize session state for active day if not exists
     if 'active_day_index' not in st.session_state:
@@ -53,47 +60,49 @@ def render_multi_day_schedule(schedule_data):
             st.info(f"🎯 **Focus**: {day_data['focus']} | ⚡ **Energy**: {day_data.get('energy_pattern', 'Steady')}")
         
         # Render the selected day with enhanced features
-        render_single_day_schedule(day_data["tasks"], day_index=selected_day, day_theme=day_data.get("theme", ""))
+        render_single_day_schedule(day_data["tasks"], day_index=selected_day, day_theme=day_data.get("theme", ""),
+                                   entries=days[selected_day].entries)
         
         # Add day comparison features for multi-day schedules
         if len(schedule_data) > 2:
-            render_day_comparison(schedule_data, selected_day)
+            render_day_comparison(schedule_data, selected_day, days)
     else:
         # Single day in multi-day format
         day_data = schedule_data[0]
         st.markdown(f"### {get_theme_emoji(day_data.get('theme', ''))} {day_data['day_name']} - {day_data.get('theme', 'Standard')}")
-        render_single_day_schedule(day_data["tasks"], day_index=0, day_theme=day_data.get("theme", ""))
+        render_single_day_schedule(day_data["tasks"], day_index=0, day_theme=day_data.get("theme", ""),
+                                   entries=days[0].entries)
+
+def _parse_day(day_data):
+    """Parse a day, skipping entries whose times cannot be read"""
+    day = DaySchedule.from_dict(dict(day_data, tasks=[]))
+    for task in day_data.get("tasks", []):
+        try:
+            day.entries.append(ScheduleEntry.from_dict(task))
+        except (ValueError, AttributeError, TypeError):
+            continue
+    return day
 
-def render_day_comparison(schedule_data, selected_day):
+def render_day_comparison(schedule_data, selected_day, days):
     """Render day comparison features"""
     st.markdown("### 📈 Day Comparison")
     
     # Calculate metrics for each day
     day_metrics = []
-    for day_data in schedule_data:
-        tasks = day_data["tasks"]
-        work_tasks = [t for t in tasks if t.get("category", "").lower() in ["work", "learning"]]
-        personal_tasks = [t for t in tasks if t.get("category", "").lower() in ["personal", "health"]]
-        
-        # Calculate durations
-        work_duration = sum([
-            (datetime.datetime.strptime(t["end_time"], "%H:%M") - 
-             datetime.datetime.strptime(t["start_time"], "%H:%M")).total_seconds() / 3600 
-            for t in work_tasks
-        ])
+    for day_data, day in zip(schedule_data, days):
+        work_tasks = [e for e in day.entries if str(e.category).lower() in ["work", "learning"]]
+        personal_tasks = [e for e in day.entries if str(e.category).lower() in ["personal", "health"]]
         
-        personal_duration = sum([
-            (datetime.datetime.strptime(t["end_time"], "%H:%M") - 
-             datetime.datetime.strptime(t["start_time"], "%H:%M")).total_seconds() / 3600 
-            for t in personal_tasks
-        ])
+        # Calculate durations from the parsed minute times
+        work_duration = day.minutes_by_category(["work", "learning"]) / 60
+        personal_duration = day.minutes_by_category(["personal", "health"]) / 60
         
         day_metrics.append({
             "day": day_data["day_name"],
             "theme": day_data.get("theme", "Standard"),
             "work_hours": round(work_duration, 1),
             "personal_hours": round(personal_duration, 1),
-            "total_tasks": len(tasks),
+            "total_tasks": len(day.entries),
             "work_tasks": len(work_tasks),
             "personal_tasks": len(personal_tasks)
         })
@@ -110,4 +119,20 @@ def render_day_comparison(schedule_data, selected_day):
     with col2:
         st.markdown("**📋 Task Distribution**")
         st.dataframe(comparison_df[["day", "total_tasks", "work_tasks", "personal_tasks"]], 
-                    use_container_width=True) 
\ No newline at end of file
+                    use_container_width=True)
+
+def render_streaming_preview(days):
+    """Render a lightweight preview of days received so far from a streamed optimization"""
+    st.markdown(f"### ⏳ Generating schedule... {len(days)} day(s) ready")
+    
+    for day_data in sorted(days, key=lambda d: d.get("day", 0)):
+        day_name = day_data.get("day_name", f"Day {day_data.get('day', '?')}")
+        theme = day_data.get("theme", "Standard")
+        with st.expander(f"{get_theme_emoji(theme)} {day_name} - {theme}", expanded=False):
+            tasks = day_data.get("tasks", [])
+            if tasks:
+                preview_df = pd.DataFrame(tasks)
+                columns = [c for c in ["start_time", "end_time", "task_name", "priority"] if c in preview_df.columns]
+                st.dataframe(preview_df[columns], use_container_width=True, hide_index=True)
+            else:
+                st.write("No tasks for this day.")
@@ -1,5 +1,11 @@
 import streamlit as st
 from ui_components import render_schedule_results, get_feedback_status
+from components.schedule_display import get_schedule_model
+from components.schedule_multiday import render_streaming_preview
+from services.model_router import ModelRouter
+
+# How long to wait between checks on a background optimization job
+OPTIMIZATION_POLL_SECONDS = 0.75
 
 def render_schedule_optimization(optimizer, preferences):
     """
@@ -11,14 +17,20 @@ def render_schedule_optimization(optimizer, preferences):
     """
     st.markdown("### 🎯 Schedule Optimization")
 
+    # The local solver schedules without the API, so it only needs tasks
+    local_mode = preferences.get('optimization_mode') == optimizer.MODE_LOCAL
+    optimizer_ready = st.session_state.get('api_initialized', False) or local_mode
+
     # API status indicator
-    if st.session_state.get('api_initialized', False):
+    if local_mode:
+        st.success("🟢 Local Solver Ready")
+    elif st.session_state.get('api_initialized', False):
         st.success("🟢 AI Optimization Ready")
     else:
         st.error("🔴 API Key Required")
 
     # Optimization button and logic
-    if optimizer.tasks and st.session_state.get('api_initialized', False):
+    if optimizer.tasks and optimizer_ready:
         st.markdown("#### 🚀 Generate Schedule")
         
         # Get feedback status using utility function
@@ -39,6 +51,9 @@ def render_schedule_optimization(optimizer, preferences):
         auto_optimize = st.session_state.get('auto_optimize_requested', False)
         
         if st.button(button_text, type="primary", use_container_width=True, help=button_help) or auto_optimize:
+            # A chat request edits the schedule it was written about
+            base_schedule = st.session_state.get('optimized_result') if is_reoptimization else None
+            
             # Clear any existing optimization data first to ensure fresh start
             if hasattr(st.session_state, 'optimized_result'):
                 del st.session_state.optimized_result
@@ -48,41 +63,57 @@ def render_schedule_optimization(optimizer, preferences):
                 st.session_state.auto_optimize_requested = False
                 spinner_text = "🤖 Processing your chat request and updating schedule..."
             
-            with st.spinner(spinner_text):
-                # Include user feedback if available
-                optimization_preferences = preferences.copy()
-                
-                if feedback_status['has_feedback']:
-                    # Add user feedback to preferences for the optimizer
-                    optimization_preferences['user_schedule_request'] = feedback_status['feedback_text']
-                    st.info(f"🔄 **Applying feedback:** {feedback_status['feedback_text'][:100]}{'...' if len(feedback_status['feedback_text']) > 100 else ''}")
+            # Include user feedback if available
+            optimization_preferences = preferences.copy()
+            
+            if feedback_status['has_feedback']:
+                # Add user feedback to preferences for the optimizer
+                optimization_preferences['user_schedule_request'] = feedback_status['feedback_text']
+                st.info(f"🔄 **Applying feedback:** {feedback_status['feedback_text'][:100]}{'...' if len(feedback_status['feedback_text']) > 100 else ''}")
                 
-                result = optimizer.optimize_schedule(optimization_preferences)
-
-                if "error" in result:
-                    st.error(f"❌ {result['error']}")
-                else:
-                    if auto_optimize:
-                        st.success("✅ Schedule updated based on your chat request!")
-                        # Clear feedback flags after successful chat optimization
-                        st.session_state.schedule_chat_submitted = False
-                    elif is_reoptimization:
-                        st.success("✅ Schedule re-optimization complete with your feedback!")
-                        # Clear feedback flags after successful re-optimization
-                        st.session_state.feedback_submitted = False
-                    else:
-                        st.success("✅ Schedule optimization complete!")
+                if base_schedule and preferences.get('quick_chat_edits', True):
+                    # Ask for a patch of the affected entries instead of a whole new schedule
+                    optimization_preferences['base_schedule'] = base_schedule
+            
+            if preferences.get('avoid_calendar_conflicts', False):
+                _add_calendar_availability(optimization_preferences)
+            
+            if preferences.get('background_optimization', False):
+                # Hand the request to the worker pool and poll for the result on later reruns
+                st.session_state.optimization_job = optimizer.submit_optimization(optimization_preferences)
+                st.session_state.optimization_job_context = {
+                    'auto_optimize': auto_optimize,
+                    'is_reoptimization': is_reoptimization,
+                    'spinner_text': spinner_text
+                }
+                st.rerun()
+            
+            with st.spinner(spinner_text):
+                on_day = None
+                if preferences.get('stream_schedule', False):
+                    # Preview each day as soon as the stream delivers it
+                    preview_placeholder = st.empty()
+                    streamed_days = []
                     
-                    # Completely replace with new optimization results
-                    st.session_state.optimized_result = result
-                    # Trigger rerun to immediately show fresh Daily Summary in left column
-                    st.rerun()
+                    def on_day(day):
+                        streamed_days.append(day)
+                        with preview_placeholder.container():
+                            render_streaming_preview(streamed_days)
+                
+                result = optimizer.optimize_schedule(optimization_preferences, on_day=on_day)
+                _apply_optimization_result(optimizer, result, auto_optimize, is_reoptimization)
+        
+        # Poll a running background optimization
+        if 'optimization_job' in st.session_state:
+            _poll_optimization_job(optimizer)
         
         # Show feedback status if active using utility function
         if feedback_status['has_feedback']:
             st.info("💬 **User feedback active** - Next optimization will consider your preferences")
+        
+        _render_routing_stats()
     
-    elif optimizer.tasks and not st.session_state.get('api_initialized', False):
+    elif optimizer.tasks and not optimizer_ready:
         # Show re-optimization option even without API if there's existing result and feedback
         feedback_status = get_feedback_status()
         if hasattr(st.session_state, 'optimized_result') and feedback_status['has_feedback']:
@@ -91,7 +122,130 @@ def render_schedule_optimization(optimizer, preferences):
     # Display optimization results
     if hasattr(st.session_state, 'optimized_result'):
         render_schedule_results(st.session_state.optimized_result)
-    elif not st.session_state.get('api_initialized', False):
+    elif not optimizer_ready:
         st.info("🔧 Configure your API key in the sidebar to enable AI optimization")
     elif not optimizer.tasks:
-        st.info("👈 Add some tasks first to optimize your schedule") 
\ No newline at end of file
+        st.info("👈 Add some tasks first to optimize your schedule") 
+
+def _add_calendar_availability(optimization_preferences):
+    """
+    Add the user's busy calendar time to the preferences as blocked time.
+    
+    One lookup covers every day of the schedule, so both the AI and the
+    local solver plan around existing meetings instead of colliding with them.
+    
+    Args:
+        optimization_preferences: Preferences for this run, updated in place
+    """
+    # Imported here so the calendar integration only loads when it is used
+    from components.google_calendar.auth import is_authenticated
+    from components.google_calendar.availability import get_busy_intervals
+    from components.google_calendar.calendars import PRIMARY_CALENDAR_NAME, resolve_calendar_ids
+    from components.google_calendar.service_factory import CalendarServiceFactory
+    from services.prompt_generator import PromptGenerator
+    
+    if not is_authenticated():
+        return
+    
+    try:
+        service = CalendarServiceFactory.shared().get_service()
+        calendar_ids = ['primary']
+        default_calendar = st.session_state.get('default_calendar', PRIMARY_CALENDAR_NAME)
+        if default_calendar != PRIMARY_CALENDAR_NAME:
+            calendar_ids += resolve_calendar_ids(service, [default_calendar])
+        
+        num_days = PromptGenerator._parse_schedule_duration(
+            optimization_preferences.get('schedule_duration', '1 day (Single day)'))
+        availability = get_busy_intervals(calendar_ids, num_days, service=service)
+    except Exception as e:
+        st.warning(f"⚠️ Could not read your calendar availability: {str(e)}")
+        return
+    
+    optimization_preferences['busy_intervals'] = availability['days']
+    busy_blocks = sum(len(day) for day in availability['days'])
+    if busy_blocks:
+        st.info(f"📅 Scheduling around {busy_blocks} existing calendar commitment(s)")
+
+def _render_routing_stats():
+    """Show which tier built the current schedule and how each tier has performed"""
+    route = st.session_state.get('optimized_result', {}).get('route')
+    if route:
+        built_by = "local solver" if route['model'] is None else route['model']
+        st.caption(f"⚡ Built by {built_by} ({route['reason']})")
+    
+    with st.expander("📊 Model Routing"):
+        tier_stats = ModelRouter.shared().stats()
+        columns = st.columns(len(tier_stats))
+        for column, (tier, stats) in zip(columns, tier_stats.items()):
+            with column:
+                st.metric(f"{tier.title()} tier", stats['requests'],
+                          f"{stats['avg_seconds']:.1f}s avg", delta_color="off")
+                if stats['failures']:
+                    st.caption(f"{stats['failures']} unusable response(s)")
+
+def _poll_optimization_job(optimizer):
+    """Publish the background optimization result, or show its progress until it is finished"""
+    job = st.session_state.optimization_job
+    context = st.session_state.get('optimization_job_context', {})
+    
+    if not job.done():
+        # Only this fragment reruns while waiting, not the whole app
+        _render_optimization_progress()
+        return
+    
+    del st.session_state.optimization_job
+    result = job.result()
+    if "warning" in result:
+        st.warning(f"⚠️ {result['warning']} - showing a locally generated schedule instead")
+    _apply_optimization_result(optimizer, result, context.get('auto_optimize', False),
+                               context.get('is_reoptimization', False))
+
+@st.fragment(run_every=OPTIMIZATION_POLL_SECONDS)
+def _render_optimization_progress():
+    """Show a running background optimization, rerunning the app once it finishes"""
+    job = st.session_state.get('optimization_job')
+    if job is None:
+        return
+    if job.done():
+        # Publish the result with a full app rerun
+        st.rerun()
+    
+    context = st.session_state.get('optimization_job_context', {})
+    st.info(f"{context.get('spinner_text', '🤖 AI is optimizing your schedule...')} ({job.elapsed_seconds:.0f}s)")
+    # A job a worker has picked up runs to completion, so only queued jobs can be cancelled
+    if not job.started() and st.button("✖️ Cancel Optimization", use_container_width=True,
+                                       help="Remove the request from the queue before it starts"):
+        if job.cancel():
+            del st.session_state.optimization_job
+        st.rerun()
+    if job.partial_days:
+        render_streaming_preview(list(job.partial_days))
+
+def _apply_optimization_result(optimizer, result, auto_optimize, is_reoptimization):
+    """Store a finished optimization result and update feedback flags
+    
+    Runs on the script thread, so a job that finishes after it was replaced
+    never reaches the optimizer or the calendar export.
+    """
+    if "error" in result:
+        st.error(f"❌ {result['error']}")
+        return
+    
+    if auto_optimize:
+        st.success("✅ Schedule updated based on your chat request!")
+        # Clear feedback flags after successful chat optimization
+        st.session_state.schedule_chat_submitted = False
+    elif is_reoptimization:
+        st.success("✅ Schedule re-optimization complete with your feedback!")
+        # Clear feedback flags after successful re-optimization
+        st.session_state.feedback_submitted = False
+    else:
+        st.success("✅ Schedule optimization complete!")
+    
+    # Completely replace with new optimization results
+    optimizer.optimized_schedule = result
+    st.session_state.optimized_result = result
+    # Parse once here; the results view reuses it on every rerun
+    get_schedule_model(result)
+    # Trigger rerun to immediately show fresh Daily Summary in left column
+    st.rerun()
@@ -1,15 +1,35 @@
 import streamlit as st
 import datetime
 import pandas as pd
+from models.schedule_model import ScheduleEntry
 from .schedule_themes import get_theme_color
 from .schedule_charts import render_enhanced_chart
 
-def render_single_day_schedule(tasks_data, day_index=None, day_theme=""):
-    """Render a single day's schedule with enhanced interactivity"""
+def render_single_day_schedule(tasks_data, day_index=None, day_theme="", entries=None):
+    """Render a single day's schedule with enhanced interactivity
+
+    entries are the already-parsed ScheduleEntry objects for tasks_data, row
+    for row; without them the entries are parsed here and rows with
+    unusable times are skipped.
+    """
     
     # Create unique key suffix for multi-day support
     key_suffix = f"_day_{day_index}" if day_index is not None else ""
     
+    # The chart and text export work on the parsed minute values
+    if entries is None:
+        entries = []
+        for task in tasks_data:
+            try:
+                entries.append(ScheduleEntry.from_dict(task))
+            except (ValueError, AttributeError, TypeError):
+                continue
+        dropped = len(tasks_data) - len(entries)
+        if dropped > 0:
+            st.warning(f"⚠️ {dropped} entr{'y' if dropped == 1 else 'ies'} with unusable times "
+                       "could not be shown.")
+        tasks_data = [entry.to_dict() for entry in entries]
+
     # Create DataFrame for schedule
     schedule_df = pd.DataFrame(tasks_data)
 
@@ -88,7 +108,7 @@ def render_single_day_schedule(tasks_data, day_index=None, day_theme=""):
     
     # Real-time chart update based on selections
     if show_chart:
-        render_enhanced_chart(schedule_df, day_index, chart_style, show_priorities, day_theme)
+        render_enhanced_chart(schedule_df, day_index, chart_style, show_priorities, day_theme, entries)
     
     # Enhanced download options
     st.markdown("### 📥 Export Options")
@@ -118,11 +138,11 @@ def render_single_day_schedule(tasks_data, day_index=None, day_theme=""):
     with download_col3:
         # Text format with theme information
         text_data = f"CHRONA AI SCHEDULE - {day_theme}\n" + "="*50 + "\n\n"
-        for idx, task in schedule_df.iterrows():
-            text_data += f"{task['start_time']} - {task['end_time']}: {task['task_name']}\n"
-            text_data += f"  Priority: {str(task.get('priority', 'medium')).title()}\n"
-            text_data += f"  Category: {task.get('category', 'General')}\n"
-            text_data += f"  Notes: {task.get('notes', 'No notes')}\n\n"
+        for entry in entries:
+            text_data += f"{entry.start_time} - {entry.end_time}: {entry.task_name}\n"
+            text_data += f"  Priority: {str(entry.priority or 'medium').title()}\n"
+            text_data += f"  Category: {entry.category or 'General'}\n"
+            text_data += f"  Notes: {entry.notes or 'No notes'}\n\n"
         
         if text_data:
             st.download_button(
@@ -1,6 +1,6 @@
 import streamlit as st
-import json
-import re
+from services.structured_output import StructuredOutput
+from services.model_router import ModelRouter
 
 def render_schedule_upload(optimizer):
     """
@@ -244,26 +244,23 @@ def _analyze_schedule_with_ai(schedule_content, optimizer):
         if optimizer.client is None:
             return {"success": False, "error": "AI client not properly initialized"}
             
+        # JSON mode returns a bare task array matching the schema
         response = optimizer.client.models.generate_content(
-            model='gemini-2.0-flash-exp', 
-            contents=analysis_prompt
+            model=ModelRouter.shared().fast_model,
+            contents=analysis_prompt,
+            config=StructuredOutput.config(StructuredOutput.TASK_LIST_SCHEMA)
         )
         
-        response_text = response.text if response.text else ""
+        parsed_tasks = StructuredOutput.load(response.text)
         
-        # Extract JSON from response
-        json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
+        if parsed_tasks is None:
+            return {"success": False, "error": "AI could not parse the schedule format"}
         
-        if json_match:
-            json_str = json_match.group()
-            parsed_tasks = json.loads(json_str)
-            
-            if isinstance(parsed_tasks, list) and len(parsed_tasks) > 0:
-                return {"success": True, "tasks": parsed_tasks}
-            else:
-                return {"success": False, "error": "No valid tasks found in schedule"}
+        parsed_tasks = [task for task in parsed_tasks if isinstance(task, dict)] if isinstance(parsed_tasks, list) else []
+        if parsed_tasks:
+            return {"success": True, "tasks": parsed_tasks}
         else:
-            return {"success": False, "error": "AI could not parse the schedule format"}
+            return {"success": False, "error": "No valid tasks found in schedule"}
             
     except Exception as e:
         return {"success": False, "error": f"Error analyzing schedule: {str(e)}"} 
\ No newline at end of file
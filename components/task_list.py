@@ -2,6 +2,7 @@
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
+from .figure_cache import FigureCache, display_cached_figure, display_figure
 
 def format_duration(minutes):
     """Format minutes into readable duration string"""
@@ -69,60 +70,7 @@ def render_task_summary(tasks):
             # Filter out activities with 0 hours to prevent 0.0% slices
             time_df = time_df[time_df['Hours'] > 0]
             
-            # Create matplotlib pie chart with stable key
-            chart_key = f"task_breakdown_{len(tasks)}_{int(total_duration)}"
-            
-            # Create matplotlib pie chart with better text positioning
-            plt.style.use('default')  # Use default for better visibility
-            fig, ax = plt.subplots(figsize=(10, 8))
-            
-            colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
-            # Use only the colors we need based on filtered data
-            filtered_colors = colors[:len(time_df)]
-            
-            # Create pie chart with legend instead of direct labels
-            pie_result = ax.pie(time_df['Hours'].tolist(), 
-                               colors=filtered_colors, 
-                               autopct='%1.1f%%', 
-                               startangle=90,
-                               textprops={'fontsize': 12, 'fontweight': 'bold'},
-                               pctdistance=0.75)
-            
-            # Handle variable return values from pie()
-            if len(pie_result) == 3:
-                wedges, texts, autotexts = pie_result
-                # Enhance percentage text styling
-                for autotext in autotexts:
-                    autotext.set_fontweight('bold')
-                    autotext.set_fontsize(12)
-            else:
-                wedges, texts = pie_result
-                autotexts = []
-            
-            # Create legend instead of direct labels to prevent overlap
-            ax.legend(wedges, time_df['Activity'].tolist(),
-                     title="Activities",
-                     title_fontsize=14,
-                     fontsize=12,
-                     loc="center left",
-                     bbox_to_anchor=(1, 0, 0.5, 1),
-                     frameon=True,
-                     facecolor='white',
-                     edgecolor='gray')
-            
-            ax.set_title('Daily Time Distribution', fontsize=18, fontweight='bold', pad=30)
-            
-            # Equal aspect ratio ensures that pie is drawn as a circle
-            ax.axis('equal')
-            
-            # Adjust layout with better margins
-            plt.tight_layout(pad=2.0)
-            
-            # Display the chart
-            st.pyplot(fig)
-            
-            # Clear the figure to free memory
-            plt.close(fig)
+            _render_task_breakdown_chart(time_df)
         
         # Add some recommendations based on current tasks
         st.subheader("💡 Quick Recommendations")
@@ -228,3 +176,60 @@ def render_task_list(tasks):
     
     # Remove this automatic call - will be placed elsewhere
     # render_task_summary(tasks)
+
+def _render_task_breakdown_chart(time_df):
+    """Render the task time breakdown pie chart"""
+    # Create matplotlib pie chart with better text positioning
+    plt.style.use('default')  # Use default for better visibility
+    
+    # Reuse the rendered image while the breakdown is unchanged
+    cache_key = FigureCache.make_key("task_breakdown", time_df)
+    if display_cached_figure(cache_key):
+        return
+    
+    fig, ax = plt.subplots(figsize=(10, 8))
+    
+    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
+    # Use only the colors we need based on filtered data
+    filtered_colors = colors[:len(time_df)]
+    
+    # Create pie chart with legend instead of direct labels
+    pie_result = ax.pie(time_df['Hours'].tolist(), 
+                       colors=filtered_colors, 
+                       autopct='%1.1f%%', 
+                       startangle=90,
+                       textprops={'fontsize': 12, 'fontweight': 'bold'},
+                       pctdistance=0.75)
+    
+    # Handle variable return values from pie()
+    if len(pie_result) == 3:
+        wedges, texts, autotexts = pie_result
+        # Enhance percentage text styling
+        for autotext in autotexts:
+            autotext.set_fontweight('bold')
+            autotext.set_fontsize(12)
+    else:
+        wedges, texts = pie_result
+        autotexts = []
+    
+    # Create legend instead of direct labels to prevent overlap
+    ax.legend(wedges, time_df['Activity'].tolist(),
+             title="Activities",
+             title_fontsize=14,
+             fontsize=12,
+             loc="center left",
+             bbox_to_anchor=(1, 0, 0.5, 1),
+             frameon=True,
+             facecolor='white',
+             edgecolor='gray')
+    
+    ax.set_title('Daily Time Distribution', fontsize=18, fontweight='bold', pad=30)
+    
+    # Equal aspect ratio ensures that pie is drawn as a circle
+    ax.axis('equal')
+    
+    # Adjust layout with better margins
+    plt.tight_layout(pad=2.0)
+    
+    # Display the chart and cache the rendered image
+    display_figure(fig, cache_key)
@@ -1,4 +1,5 @@
 
+import importlib
 import streamlit as st
 from config import setup_page_config, get_api_key
 from schedule_optimizer import ScheduleOptimizer
@@ -9,10 +10,16 @@ from ui_components import (
     load_custom_styles
 )
 from components.dashboard import render_dashboard_overview
-from components.task_builder import render_task_builder
-from components.schedule_upload import render_schedule_upload
-from components.analytics import render_analytics
-from components.google_calendar import render_google_calendar_integration
+
+def load_tab_renderer(module_name, function_name):
+    """
+    Import a tab's module on first use and return its render function.
+
+    Tab modules pull in pandas, matplotlib and the Google API clients, so they
+    are loaded only when their tab is selected rather than on every cold start.
+    Python caches the module afterwards, so later reruns pay nothing.
+    """
+    return getattr(importlib.import_module(module_name), function_name)
 
 def main():
     """
@@ -80,15 +87,20 @@ def main():
     
     if selected_tab == "📝 Task Builder":
         # Task Builder tab functionality
+        render_task_builder = load_tab_renderer("components.task_builder", "render_task_builder")
         render_task_builder(st.session_state.optimizer, preferences)
     elif selected_tab == "📄 Schedule Upload":
         # Schedule Upload tab functionality
+        render_schedule_upload = load_tab_renderer("components.schedule_upload", "render_schedule_upload")
         render_schedule_upload(st.session_state.optimizer)
     elif selected_tab == "📅 Google Calendar (WIP)":
         # Google Calendar Integration tab functionality
+        render_google_calendar_integration = load_tab_renderer(
+            "components.google_calendar", "render_google_calendar_integration")
         render_google_calendar_integration(st.session_state.optimizer)
     else:
         # Analytics & Insights tab functionality
+        render_analytics = load_tab_renderer("components.analytics", "render_analytics")
         render_analytics(st.session_state.optimizer, preferences)
 
     # Add some spacing before footer
@@ -0,0 +1,171 @@
+
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+
+# Keys stored as attributes; anything else round-trips through ``extra``
+ENTRY_FIELDS = ('task_name', 'start_time', 'end_time', 'priority', 'category', 'notes')
+DAY_FIELDS = ('day', 'day_name', 'theme', 'tasks')
+
+
+def parse_clock(time_str: str) -> int:
+    """Convert an HH:MM string to minutes since midnight (24:00 is 1440)"""
+    hours, minutes = str(time_str).strip().split(":")[:2]
+    hours, minutes = int(hours), int(minutes)
+    if not (0 <= hours <= 24 and 0 <= minutes < 60) or (hours == 24 and minutes):
+        raise ValueError(f"Invalid time '{time_str}'")
+    return hours * 60 + minutes
+
+
+def format_clock(minutes: int) -> str:
+    """Convert minutes since midnight to an HH:MM string"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def parse_duration_text(text: str) -> int:
+    """Convert summary text like '7 hours 30 minutes' or '7.5 hours' to minutes"""
+    parts = str(text).split()
+    if "hour" not in str(text) or not parts:
+        return 0
+    try:
+        hours = float(parts[0])
+    except ValueError:
+        return 0
+    minutes = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 0
+    return int(round(hours * 60)) + minutes
+
+
+def format_duration_text(minutes: int) -> str:
+    """Convert minutes to summary text like '7 hours 30 minutes'"""
+    return f"{minutes // 60} hours {minutes % 60} minutes"
+
+
+@dataclass(slots=True)
+class ScheduleEntry:
+    """One scheduled block with times held as integer minutes since midnight.
+
+    An end before the start means the block runs past midnight.
+    """
+    task_name: str
+    start: int
+    end: int
+    priority: str = 'medium'
+    category: str = ''
+    notes: str = ''
+    extra: Dict[str, Any] = field(default_factory=dict)
+    keys: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScheduleEntry':
+        """Parse a schedule entry dict, raising ValueError on invalid times"""
+        return cls(
+            task_name=data.get('task_name', ''),
+            start=parse_clock(data.get('start_time', '00:00')),
+            end=parse_clock(data.get('end_time', '00:00')),
+            priority=data.get('priority', 'medium'),
+            category=data.get('category', ''),
+            notes=data.get('notes', ''),
+            extra={key: value for key, value in data.items() if key not in ENTRY_FIELDS},
+            keys=tuple(data.keys())
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the JSON dict shape, keeping the original keys and order"""
+        values = {
+            'task_name': self.task_name,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'priority': self.priority,
+            'category': self.category,
+            'notes': self.notes
+        }
+        values.update(self.extra)
+        keys = self.keys or tuple(values.keys())
+        return {key: values[key] for key in keys if key in values}
+
+    @property
+    def start_time(self) -> str:
+        return format_clock(self.start)
+
+    @property
+    def end_time(self) -> str:
+        return format_clock(self.end)
+
+    @property
+    def crosses_midnight(self) -> bool:
+        return self.end < self.start
+
+    @property
+    def duration_minutes(self) -> int:
+        """Length of the block, wrapping past midnight when needed"""
+        if self.crosses_midnight:
+            return self.end + MINUTES_PER_DAY - self.start
+        return self.end - self.start
+
+
+@dataclass(slots=True)
+class DaySchedule:
+    """One day of an optimized schedule"""
+    day: int
+    day_name: str
+    theme: str = ''
+    entries: List[ScheduleEntry] = field(default_factory=list)
+    extra: Dict[str, Any] = field(default_factory=dict)
+    keys: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DaySchedule':
+        """Parse a day object from the optimized_schedule list"""
+        return cls(
+            day=data.get('day', 1),
+            day_name=data.get('day_name', ''),
+            theme=data.get('theme', ''),
+            entries=[ScheduleEntry.from_dict(task) for task in data.get('tasks', [])],
+            extra={key: value for key, value in data.items() if key not in DAY_FIELDS},
+            keys=tuple(data.keys())
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the JSON day shape"""
+        values = {
+            'day': self.day,
+            'day_name': self.day_name,
+            'theme': self.theme,
+            'tasks': [entry.to_dict() for entry in self.entries]
+        }
+        values.update(self.extra)
+        keys = self.keys or tuple(values.keys())
+        return {key: values[key] for key in keys if key in values}
+
+    def minutes_by_category(self, categories: List[str]) -> int:
+        """Total scheduled minutes for entries in any of the given categories"""
+        wanted = {category.lower() for category in categories}
+        return sum(entry.duration_minutes for entry in self.entries if str(entry.category).lower() in wanted)
+
+
+@dataclass(slots=True)
+class Schedule:
+    """Parsed optimization result: days of entries plus the daily summary"""
+    days: List[DaySchedule] = field(default_factory=list)
+    daily_summary: Optional[Dict[str, Any]] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> 'Schedule':
+        """Parse an optimizer result dict into a Schedule"""
+        return cls(
+            days=[DaySchedule.from_dict(day) for day in result.get('optimized_schedule', [])],
+            daily_summary=result.get('daily_summary'),
+            extra={key: value for key, value in result.items()
+                   if key not in ('optimized_schedule', 'daily_summary')}
+        )
+
+    def to_result(self) -> Dict[str, Any]:
+        """Convert back to the optimizer result dict shape"""
+        result = {'optimized_schedule': [day.to_dict() for day in self.days]}
+        if self.daily_summary is not None:
+            result['daily_summary'] = self.daily_summary
+        result.update(self.extra)
+        return result
+
@@ -1,26 +1,43 @@
-import google.genai as genai
-import json
-import re
+import time
 import streamlit as st
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 
 from services.prompt_generator import PromptGenerator
 from services.fallback_scheduler import FallbackScheduler
 from services.schedule_validator import ScheduleValidator
+from services.response_cache import ResponseCache
+from services.schedule_stream_parser import ScheduleStreamParser
+from services.parallel_day_planner import ParallelDayPlanner
+from services.optimization_worker import OptimizationJob, OptimizationWorkerPool
+from services.structured_output import StructuredOutput
+from services.context_cache import ContextCache
+from services.schedule_patch import SchedulePatch
+from services.model_router import ModelRouter
 
 
 class ScheduleOptimizer:
     """Main schedule optimization coordinator"""
 
+    # Values of preferences['optimization_mode']
+    MODE_AUTO = 'Auto'
+    MODE_STANDARD = 'Standard'
+    MODE_PARALLEL_DAYS = 'Parallel days'
+    MODE_LOCAL = 'Local solver'
+
     def __init__(self):
         self.tasks = []
         self.optimized_schedule = None
         self.client = None
+        self.cache_account = None
+        self.response_cache = ResponseCache.shared()
 
     def initialize_genai(self, api_key: str) -> bool:
         """Initialize Google GenAI"""
         try:
+            # Imported here so the SDK only loads once a key is configured
+            import google.genai as genai
             self.client = genai.Client(api_key=api_key)
+            self.cache_account = ContextCache.account_key(api_key)
             return True
         except Exception as e:
             st.error(f"Optimization error: {str(e)}")
@@ -30,13 +47,57 @@ class ScheduleOptimizer:
         """Add new task"""
         self.tasks.append(task_data)
 
-    def optimize_schedule(self, preferences: Dict) -> Dict:
-        """Optimize schedule using Google GenAI with enhanced error handling"""
+    def optimize_schedule(self, preferences: Dict,
+                          on_day: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Optimize schedule using Google GenAI with enhanced error handling
+
+        When on_day is given the response is streamed and on_day is called
+        with each day of optimized_schedule as soon as it is complete.
+        """
+        readiness_error = self._check_ready(preferences)
+        if readiness_error:
+            return readiness_error
+
+        try:
+            return self._generate_schedule(self.tasks, preferences, on_day)
+        except Exception as e:
+            st.error(f"Optimization error: {str(e)}")
+            return FallbackScheduler.create_fallback_schedule(self.tasks, preferences)
+
+    def submit_optimization(self, preferences: Dict) -> OptimizationJob:
+        """Queue an optimization on the background worker pool and return its job handle"""
+        readiness_error = self._check_ready(preferences)
+        if readiness_error:
+            return OptimizationJob.completed(readiness_error)
+
+        # Snapshot inputs so later edits in the session don't race the worker
+        tasks = [dict(task) for task in self.tasks]
+        partial_days = []
+        on_day = partial_days.append if preferences.get('stream_schedule') else None
+
+        job = OptimizationWorkerPool.shared().submit(
+            self._run_background_optimization, tasks, dict(preferences), on_day
+        )
+        job.partial_days = partial_days
+        return job
+
+    def _run_background_optimization(self, tasks: List[Dict], preferences: Dict,
+                                     on_day: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Worker entry point - must not touch Streamlit APIs"""
+        try:
+            return self._generate_schedule(tasks, preferences, on_day)
+        except Exception as e:
+            result = FallbackScheduler.create_fallback_schedule(tasks, preferences)
+            result["warning"] = f"Optimization error: {str(e)}"
+            return result
+
+    def _check_ready(self, preferences: Dict) -> Optional[Dict]:
+        """Return an error result if optimization cannot run, otherwise None"""
         if not self.tasks:
             return {"error": "No tasks to optimize. Please add some tasks first."}
 
-        # Check if client is initialized
-        if not self.client:
+        # Check if client is initialized (the local solver doesn't need one)
+        if not self.client and preferences.get('optimization_mode') != self.MODE_LOCAL:
             return {"error": "API client not initialized. Please check your API key."}
 
         # Validate tasks before optimization
@@ -44,33 +105,225 @@ class ScheduleOptimizer:
         if validation_errors:
             return {"error": f"Task validation failed: {'; '.join(validation_errors)}"}
 
-        try:
-            prompt = PromptGenerator.generate_schedule_prompt(self.tasks, preferences)
+        return None
 
-            response = self.client.models.generate_content(
-                model='gemini-2.0-flash-exp', contents=prompt)
+    def _generate_schedule(self, tasks: List[Dict], preferences: Dict,
+                           on_day: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Generate a schedule on the tier the router picks, falling back locally on unparseable responses
 
-            response_text = response.text
+        A fast-tier call that fails or returns nothing usable is retried once
+        on the strong tier before the local solver takes over.
+        """
+        num_days = PromptGenerator._parse_schedule_duration(
+            preferences.get('schedule_duration', '1 day (Single day)'))
+        router = ModelRouter.shared()
+        mode = preferences.get('optimization_mode')
+        if mode == self.MODE_LOCAL:
+            route = router.choose(ModelRouter.TIER_LOCAL, "local solver selected")
+        else:
+            route = router.route(len(tasks), num_days, bool(preferences.get('user_schedule_request')),
+                                 allow_local=mode == self.MODE_AUTO)
 
-            if response_text:
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            else:
-                json_match = None
+        routes = [route]
+        if route['tier'] == ModelRouter.TIER_FAST:
+            routes.append(router.choose(ModelRouter.TIER_STRONG, "fast tier failed"))
 
-            if json_match:
-                json_str = json_match.group()
-                try:
-                    result = json.loads(json_str)
-                    self.optimized_schedule = result
-                    return result
-                except json.JSONDecodeError:
-                    return FallbackScheduler.create_fallback_schedule(self.tasks, preferences)
-            else:
-                return FallbackScheduler.create_fallback_schedule(self.tasks, preferences)
+        previewed = set()
 
-        except Exception as e:
-            st.error(f"Optimization error: {str(e)}")
-            return FallbackScheduler.create_fallback_schedule(self.tasks, preferences)
+        def preview(day: Dict):
+            # An escalated attempt only adds the days the failed one didn't deliver
+            if day.get("day") not in previewed:
+                previewed.add(day.get("day"))
+                on_day(day)
+
+        result = None
+        for attempt, route in enumerate(routes, start=1):
+            started = time.monotonic()
+            try:
+                result = self._generate_on_route(route, tasks, preferences, num_days,
+                                                 preview if on_day else None)
+            except Exception:
+                router.record(route, time.monotonic() - started, succeeded=False)
+                if attempt == len(routes):
+                    raise
+                continue
+            router.record(route, time.monotonic() - started, succeeded=result is not None)
+            if result is not None:
+                break
+
+        if result is None:
+            return FallbackScheduler.create_fallback_schedule(tasks, preferences)
+
+        result["route"] = {'tier': route['tier'], 'model': route['model'], 'reason': route['reason']}
+        return result
+
+    def _generate_on_route(self, route: Dict, tasks: List[Dict], preferences: Dict, num_days: int,
+                           on_day: Optional[Callable[[Dict], None]] = None) -> Optional[Dict]:
+        """Generate a schedule on one tier; returns None if the model's response is unusable"""
+        if route['tier'] == ModelRouter.TIER_LOCAL:
+            # Low-latency tier: skip the model and use the constraint scheduler directly
+            result = FallbackScheduler.create_fallback_schedule(tasks, preferences)
+            if on_day:
+                for day in result["optimized_schedule"]:
+                    on_day(day)
+            return result
+
+        model = route['model']
+        if preferences.get('base_schedule') and preferences.get('user_schedule_request'):
+            # A chat tweak of an existing schedule only needs the entries it changes
+            result = self._patch_schedule(preferences, model)
+            if result is not None:
+                if on_day:
+                    for day in result["optimized_schedule"]:
+                        on_day(day)
+                return result
+
+        if preferences.get('optimization_mode') == self.MODE_PARALLEL_DAYS and num_days > 1:
+            return ParallelDayPlanner.create_schedule(
+                tasks, preferences,
+                lambda prompt: self._cached_request(prompt, model, StructuredOutput.DAY_SCHEMA),
+                on_day=on_day)
+
+        prompt = PromptGenerator.generate_schedule_prompt(tasks, preferences)
+
+        # Identical prompts produce identical schedules - serve them from cache
+        cache_key = ResponseCache.make_key(prompt, model)
+        result = self.response_cache.get(cache_key)
+        if result is not None:
+            if on_day:
+                for day in result.get("optimized_schedule", []):
+                    on_day(day)
+            return result
+
+        result = self._send_schedule_prompt(tasks, preferences, prompt, model, on_day)
+        if result is not None:
+            self.response_cache.set(cache_key, result)
+        return result
+
+    def _patch_schedule(self, preferences: Dict, model: str) -> Optional[Dict]:
+        """Apply the chat request to preferences['base_schedule'] as a patch
+
+        Returns None if the model's patch is unusable, so the caller
+        regenerates the whole schedule instead.
+        """
+        # A warning belongs to the run that produced the base, not to the edit
+        base = {key: value for key, value in preferences['base_schedule'].items() if key != 'warning'}
+        prompt = PromptGenerator.generate_patch_prompt(SchedulePatch.encode_schedule(base), preferences)
+
+        cache_key = ResponseCache.make_key(prompt, model)
+        result = self.response_cache.get(cache_key)
+        if result is not None:
+            return result
+
+        response = self.client.models.generate_content(
+            model=model, contents=prompt,
+            config=StructuredOutput.config(StructuredOutput.PATCH_SCHEMA))
+        result = SchedulePatch.apply(base, StructuredOutput.load(response.text))
+        if result is not None:
+            self.response_cache.set(cache_key, result)
+        return result
+
+    def _send_schedule_prompt(self, tasks: List[Dict], preferences: Dict, prompt: str, model: str,
+                              on_day: Optional[Callable[[Dict], None]] = None) -> Optional[Dict]:
+        """Request a full schedule, sending only the dynamic part when the rules are cached
+
+        Falls back to the full prompt if no context cache is available or the
+        API rejects the cached one before any day was streamed; other errors
+        are raised as they would be without a cache.
+        """
+        handle = ContextCache.shared().get_handle(
+            self.client, self.cache_account or "", model,
+            PromptGenerator.static_schedule_instructions())
+        if handle:
+            request = PromptGenerator.generate_schedule_request(tasks, preferences)
+            emitted = []
+
+            def emit(day: Dict):
+                emitted.append(day)
+                on_day(day)
+
+            try:
+                if on_day:
+                    return self._stream_schedule(request, model, emit, cached_content=handle)
+                return self._request_schedule(request, model, cached_content=handle)
+            except Exception as e:
+                # Resending after a day was delivered would deliver it twice
+                if emitted or not ContextCache.is_cache_error(e):
+                    raise
+                # Expired or deleted server-side; it is recreated on the next request
+                ContextCache.shared().invalidate(handle)
+
+        if on_day:
+            return self._stream_schedule(prompt, model, on_day)
+        return self._request_schedule(prompt, model)
+
+    def _cached_request(self, prompt: str, model: str, schema: Optional[Dict] = None) -> Optional[Dict]:
+        """Request and parse a response, serving identical prompts from cache"""
+        cache_key = ResponseCache.make_key(prompt, model)
+        result = self.response_cache.get(cache_key)
+        if result is not None:
+            return result
+
+        result = self._request_schedule(prompt, model, schema)
+        if result is not None:
+            self.response_cache.set(cache_key, result)
+        return result
+
+    def _request_schedule(self, prompt: str, model: str, schema: Optional[Dict] = None,
+                          cached_content: Optional[str] = None) -> Optional[Dict]:
+        """Send the prompt in JSON mode and parse the complete response
+
+        schema defaults to the full schedule; the parallel planner passes the
+        single-day schema. cached_content names a context cache holding the
+        static instructions the prompt leaves out.
+        """
+        response = self.client.models.generate_content(
+            model=model, contents=prompt,
+            config=self._request_config(schema or StructuredOutput.SCHEDULE_SCHEMA, cached_content))
+
+        return self._normalize_result(StructuredOutput.load(response.text))
+
+    def _stream_schedule(self, prompt: str, model: str, on_day: Callable[[Dict], None],
+                         cached_content: Optional[str] = None) -> Optional[Dict]:
+        """Stream the response, emitting each finished day before the rest arrives"""
+        parser = ScheduleStreamParser()
+
+        for chunk in self.client.models.generate_content_stream(
+                model=model, contents=prompt,
+                config=self._request_config(StructuredOutput.SCHEDULE_SCHEMA, cached_content)):
+            for day in parser.feed(chunk.text):
+                day = StructuredOutput.repair_day(day)
+                if day is not None:
+                    on_day(day)
+
+        result = parser.result()
+        if result is None:
+            # Truncated or otherwise damaged; repair it here rather than asking again
+            result = StructuredOutput.load(parser.text)
+        return self._normalize_result(result)
+
+    @staticmethod
+    def _request_config(schema: Dict, cached_content: Optional[str] = None) -> Dict:
+        """Build the generate_content config, referencing a context cache if given"""
+        config = StructuredOutput.config(schema)
+        if cached_content:
+            config["cached_content"] = cached_content
+        return config
+
+    @staticmethod
+    def _normalize_result(result: Optional[Dict]) -> Optional[Dict]:
+        """Parse a response once into the schedule model, repairing it locally
+
+        Returns the result with canonical HH:MM times so downstream consumers
+        can rely on them; entries with unusable times are dropped instead of
+        discarding the response. Returns None only if nothing usable is left.
+        Single-day responses from the parallel planner are repaired the same way.
+        """
+        if not isinstance(result, dict):
+            return None
+        if "optimized_schedule" not in result:
+            return StructuredOutput.repair_day(result)
+        return StructuredOutput.repair_schedule(result)
 
     def validate_tasks(self) -> List[str]:
         """Validate tasks using the validator service"""
@@ -0,0 +1,262 @@
+import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+Interval = Tuple[int, int]
+
+
+class ConstraintScheduler:
+    """Interval-based constraint solver for placing tasks into free time.
+
+    Each day is represented as a sorted list of free ``(start, end)``
+    intervals in minutes since midnight. Tasks are ordered by deadline,
+    priority and size, and each one is placed best-fit into its domain of
+    allowed days and preferred time windows; every placement immediately
+    shrinks the free intervals it touches. Tasks that still do not fit
+    trigger a bounded branch-and-bound repair that displaces lower-weight
+    tasks whenever that increases the total placed priority weight.
+    """
+
+    PRIORITY_WEIGHTS = {'high': 3, 'medium': 2, 'low': 1}
+
+    PREFERRED_WINDOWS = {
+        "Morning (6-12)": (6 * 60, 12 * 60),
+        "Afternoon (12-18)": (12 * 60, 18 * 60),
+        "Evening (18-22)": (18 * 60, 22 * 60)
+    }
+
+    # Upper bound on repair branches explored per solve
+    MAX_REPAIR_ATTEMPTS = 500
+
+    @staticmethod
+    def subtract_intervals(free: List[Interval], blocked: List[Interval]) -> List[Interval]:
+        """Remove blocked intervals from a list of free intervals"""
+        result = []
+        blocked = sorted(blocked)
+        for start, end in sorted(free):
+            cursor = start
+            for block_start, block_end in blocked:
+                if block_end <= cursor or block_start >= end:
+                    continue
+                if block_start > cursor:
+                    result.append((cursor, block_start))
+                cursor = max(cursor, block_end)
+                if cursor >= end:
+                    break
+            if cursor < end:
+                result.append((cursor, end))
+        return result
+
+    @staticmethod
+    def deadline_day_index(deadline: Optional[str], start_date: Optional[datetime.date] = None) -> Optional[int]:
+        """Get the last day index a task may be placed on, or None without a deadline"""
+        if not deadline:
+            return None
+        try:
+            deadline_date = datetime.date.fromisoformat(str(deadline)[:10])
+        except ValueError:
+            return None
+        start_date = start_date or datetime.date.today()
+        return max(0, (deadline_date - start_date).days)
+
+    @staticmethod
+    def solve(tasks: List[Dict], day_free: List[List[Interval]],
+              preferred_days: Optional[List[int]] = None,
+              day_work_slots: Optional[List[List[Interval]]] = None,
+              buffer_minutes: Union[int, List[int]] = 10,
+              start_date: Optional[datetime.date] = None) -> Dict:
+        """Place tasks into the free intervals of each day
+
+        Args:
+            tasks: Task dicts with duration, priority, preferred_time and deadline
+            day_free: Free intervals per day, in minutes since midnight
+            preferred_days: Soft day assignment per task (same order as tasks)
+            day_work_slots: Soft preferred work windows per day
+            buffer_minutes: Gap reserved after each task when room allows, per day or overall
+            start_date: Date of day index 0, used to resolve deadlines
+
+        Returns:
+            dict: ``placements`` maps task index to ``(day, start, end)`` and
+            ``unscheduled`` lists indexes of tasks that could not be placed
+        """
+        solver = _SolverState(tasks, day_free, preferred_days, day_work_slots,
+                              buffer_minutes, start_date)
+        solver.run()
+        return {
+            "placements": {idx: (p[0], p[1], p[2]) for idx, p in solver.placements.items()},
+            "unscheduled": sorted(solver.unscheduled)
+        }
+
+
+class _SolverState:
+    """Mutable search state for a single ConstraintScheduler.solve call"""
+
+    def __init__(self, tasks, day_free, preferred_days, day_work_slots, buffer_minutes, start_date):
+        self.tasks = tasks
+        self.num_days = len(day_free)
+        self.free = [sorted(list(day)) for day in day_free]
+        self.work_slots = day_work_slots or [[] for _ in range(self.num_days)]
+        if isinstance(buffer_minutes, int):
+            buffer_minutes = [buffer_minutes] * self.num_days
+        self.buffers = list(buffer_minutes)
+        self.placements = {}  # task index -> (day, start, end, reserved_end)
+        self.unscheduled = []
+        self.repair_budget = ConstraintScheduler.MAX_REPAIR_ATTEMPTS
+
+        self.durations = [max(1, int(task.get('duration', 0) or 0)) for task in tasks]
+        self.weights = [
+            ConstraintScheduler.PRIORITY_WEIGHTS.get(str(task.get('priority', 'medium')).lower(), 2)
+            for task in tasks
+        ]
+        self.preferred_days = list(preferred_days) if preferred_days else [0] * len(tasks)
+        self.domains = [self._day_domain(i, start_date) for i in range(len(tasks))]
+        self.windows = [
+            ConstraintScheduler.PREFERRED_WINDOWS.get(task.get('preferred_time', ''))
+            for task in tasks
+        ]
+
+    def _day_domain(self, idx, start_date):
+        """Allowed days for a task, most preferred first"""
+        last_day = ConstraintScheduler.deadline_day_index(self.tasks[idx].get('deadline'), start_date)
+        limit = self.num_days if last_day is None else min(self.num_days, last_day + 1)
+        preferred = min(max(self.preferred_days[idx], 0), limit - 1)
+        return sorted(range(limit), key=lambda d: (abs(d - preferred), d))
+
+    def run(self):
+        order = sorted(
+            range(len(self.tasks)),
+            key=lambda i: (len(self.domains[i]), -self.weights[i], -self.durations[i], i)
+        )
+        pending = []
+        for idx in order:
+            if not self._place(idx):
+                pending.append(idx)
+
+        for idx in sorted(pending, key=lambda i: -self.weights[i]):
+            if idx in self.placements:
+                continue
+            if not self._repair(idx):
+                self.unscheduled.append(idx)
+
+        # Tasks displaced during repair get one more chance at leftover space
+        for idx in list(self.unscheduled):
+            if idx not in self.placements:
+                self._place(idx)
+
+        self.unscheduled = [i for i in self.unscheduled if i not in self.placements]
+
+    def _place(self, idx) -> bool:
+        duration = self.durations[idx]
+        for day in self.domains[idx]:
+            for window in self._windows_for(idx, day):
+                slot = self._best_fit(day, window, duration)
+                if slot is None:
+                    continue
+                self._reserve(idx, day, slot[0], slot[1])
+                return True
+        return False
+
+    def _windows_for(self, idx, day):
+        windows = []
+        if self.windows[idx]:
+            windows.append(self.windows[idx])
+        windows.extend(self.work_slots[day] if day < len(self.work_slots) else [])
+        windows.append(None)
+        return windows
+
+    def _best_fit(self, day, window, duration):
+        """Find the tightest free interval in window that fits duration"""
+        best = None
+        best_slack = None
+        for start, end in self.free[day]:
+            if window is not None:
+                start = max(start, window[0])
+                end = min(end, window[1])
+            slack = (end - start) - duration
+            if slack < 0:
+                continue
+            if best_slack is None or slack < best_slack:
+                best = (start, end)
+                best_slack = slack
+                if slack == 0:
+                    break
+        return best
+
+    def _reserve(self, idx, day, start, limit):
+        end = start + self.durations[idx]
+        reserved_end = min(end + self.buffers[day], limit)
+        updated = []
+        for free_start, free_end in self.free[day]:
+            if free_end <= start or free_start >= reserved_end:
+                updated.append((free_start, free_end))
+                continue
+            if free_start < start:
+                updated.append((free_start, start))
+            if reserved_end < free_end:
+                updated.append((reserved_end, free_end))
+        self.free[day] = updated
+        self.placements[idx] = (day, start, end, reserved_end)
+
+    def _release(self, idx):
+        day, start, _, reserved_end = self.placements.pop(idx)
+        merged = []
+        for interval in sorted(self.free[day] + [(start, reserved_end)]):
+            if merged and interval[0] <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], interval[1]))
+            else:
+                merged.append(interval)
+        self.free[day] = merged
+        return day, start, reserved_end
+
+    def _restore(self, idx, placement):
+        day, start, end, reserved_end = placement
+        self._reserve(idx, day, start, reserved_end)
+        self.placements[idx] = placement
+
+    def _repair(self, idx) -> bool:
+        """Branch on displacing one lower-weight task to make room for idx"""
+        allowed_days = set(self.domains[idx])
+        candidates = sorted(
+            (other for other, p in self.placements.items()
+             if p[0] in allowed_days and self.weights[other] <= self.weights[idx]),
+            key=lambda other: (self.weights[other], -self.durations[other])
+        )
+
+        for other in candidates:
+            if self.repair_budget <= 0:
+                return False
+            self.repair_budget -= 1
+
+            # Bound: displacing only helps if the freed space can hold idx
+            day, start, _, reserved_end = self.placements[other]
+            if self._largest_gap_with(day, start, reserved_end) < self.durations[idx]:
+                continue
+
+            original = self.placements[other]
+            self._release(other)
+            if not self._place(idx):
+                self._restore(other, original)
+                continue
+
+            if self._place(other):
+                return True
+
+            if self.weights[other] < self.weights[idx]:
+                # Strictly better objective even though other is dropped
+                self.unscheduled.append(other)
+                return True
+
+            # Equal weight and other no longer fits - undo this branch
+            self._release(idx)
+            self._restore(other, original)
+
+        return False
+
+    def _largest_gap_with(self, day, start, end):
+        """Size of the free interval that would contain [start, end) once released"""
+        gap_start, gap_end = start, end
+        for free_start, free_end in self.free[day]:
+            if free_end == gap_start:
+                gap_start = free_start
+            elif free_start == gap_end:
+                gap_end = free_end
+        return gap_end - gap_start
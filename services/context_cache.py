@@ -0,0 +1,163 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+class ContextCache:
+    """Server-side cache handles for the static schedule instructions.
+
+    The rule book returned by PromptGenerator.static_schedule_instructions is
+    the same for every user and request, so it is registered once per API
+    key and model through the Gemini cached-content API. Requests then send
+    only their dynamic part with the cache name. Handles are extended before
+    their TTL runs out and recreated if that fails; when a model or prompt
+    cannot be cached, creation is retried only after a back-off and callers
+    send the full prompt instead. API calls run outside the shared lock, at
+    most one per handle at a time; requests arriving meanwhile use the
+    current handle, or the full prompt, instead of waiting.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, ttl_seconds: int = 3600, refresh_margin_seconds: int = 300,
+                 retry_after_seconds: int = 600):
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = min(refresh_margin_seconds, ttl_seconds // 2)
+        self.retry_after_seconds = retry_after_seconds
+        # key -> (cache name, expiry as epoch seconds)
+        self._handles = {}
+        # key -> epoch seconds before which creation is not retried
+        self._failed_until = {}
+        # key -> lock held while that handle is being created or refreshed
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'created': 0, 'refreshed': 0, 'failures': 0}
+
+    @classmethod
+    def shared(cls) -> "ContextCache":
+        """Get the process-wide handle cache configured from the environment"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                try:
+                    ttl = int(os.getenv("CHRONA_CONTEXT_CACHE_TTL_SECONDS", "3600"))
+                except ValueError:
+                    ttl = 3600
+                cls._shared = cls(ttl_seconds=max(0, ttl))
+            return cls._shared
+
+    @property
+    def enabled(self) -> bool:
+        """Whether context caching is switched on (a TTL of 0 turns it off)"""
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def account_key(api_key: str) -> str:
+        """Identify an API key without keeping it; caches belong to one key"""
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def make_key(account: str, model: str, text: str) -> str:
+        """Build the handle key from the account, model and cached text"""
+        return hashlib.sha256(f"{account}\n{model}\n{text}".encode("utf-8")).hexdigest()
+
+    def get_handle(self, client, account: str, model: str, text: str) -> Optional[str]:
+        """
+        Get the name of a live cache holding text as the system instruction.
+
+        Args:
+            client: google.genai client for the account
+            account: account_key of the client's API key
+            model: Model the cache is created for
+            text: Static instructions to cache
+
+        Returns:
+            str: Cache name to pass as cached_content, or None if caching is
+            off or unavailable and the full prompt should be sent
+        """
+        if not self.enabled or client is None:
+            return None
+
+        key = self.make_key(account, model, text)
+        with self._lock:
+            if self._failed_until.get(key, 0) > time.time():
+                return None
+            entry = self._handles.get(key)
+            if entry is not None and entry[1] - time.time() > self.refresh_margin_seconds:
+                self._stats['hits'] += 1
+                return entry[0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        if not key_lock.acquire(blocking=False):
+            # Another request is creating or refreshing this handle right now
+            return entry[0] if entry is not None and entry[1] > time.time() else None
+        try:
+            with self._lock:
+                # The previous holder of key_lock may have just renewed the handle
+                entry = self._handles.get(key)
+                if entry is not None and entry[1] - time.time() > self.refresh_margin_seconds:
+                    self._stats['hits'] += 1
+                    return entry[0]
+            if entry is not None and entry[1] > time.time():
+                refreshed = self._refresh(client, key, entry[0])
+                if refreshed is not None:
+                    return refreshed
+            with self._lock:
+                self._handles.pop(key, None)
+            return self._create(client, key, model, text)
+        finally:
+            key_lock.release()
+
+    @staticmethod
+    def is_cache_error(error: Exception) -> bool:
+        """Check whether a failed request was rejected because its cached content is missing or invalid"""
+        return getattr(error, 'code', None) in (400, 403, 404) and 'cache' in str(error).lower()
+
+    def invalidate(self, name: str):
+        """Forget a handle the API rejected, e.g. because it expired server-side"""
+        with self._lock:
+            for key, (cached_name, _) in list(self._handles.items()):
+                if cached_name == name:
+                    del self._handles[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit, creation, refresh and failure counters"""
+        with self._lock:
+            return dict(self._stats, live=len(self._handles))
+
+    def _expiry(self, cached) -> float:
+        """Read a cache's expiry, assuming the requested TTL if it is missing"""
+        expire_time = getattr(cached, 'expire_time', None)
+        return expire_time.timestamp() if expire_time is not None else time.time() + self.ttl_seconds
+
+    def _refresh(self, client, key: str, name: str) -> Optional[str]:
+        """Extend a handle's TTL; returns None if the cache is gone"""
+        try:
+            cached = client.caches.update(name=name, config={'ttl': f"{self.ttl_seconds}s"})
+        except Exception:
+            return None
+        with self._lock:
+            self._handles[key] = (name, self._expiry(cached))
+            self._stats['refreshed'] += 1
+        return name
+
+    def _create(self, client, key: str, model: str, text: str) -> Optional[str]:
+        """Register text as a new cache; backs off if the API refuses it"""
+        try:
+            cached = client.caches.create(model=model, config={
+                'system_instruction': text,
+                'ttl': f"{self.ttl_seconds}s",
+                'display_name': f"chrona-schedule-rules-{key[:12]}"
+            })
+        except Exception:
+            # Unsupported model or too few tokens to cache; don't ask on every request
+            with self._lock:
+                self._failed_until[key] = time.time() + self.retry_after_seconds
+                self._stats['failures'] += 1
+            return None
+        with self._lock:
+            self._handles[key] = (cached.name, self._expiry(cached))
+            self._stats['created'] += 1
+        return cached.name
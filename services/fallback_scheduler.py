@@ -1,6 +1,9 @@
 
 import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from models.schedule_model import MINUTES_PER_DAY, format_clock, parse_clock
+from services.constraint_scheduler import ConstraintScheduler
 
 class FallbackScheduler:
     """Creates fallback schedules when AI optimization fails"""
@@ -98,26 +101,22 @@ class FallbackScheduler:
         day_names = FallbackScheduler._get_day_names(num_days)
         daily_themes = FallbackScheduler._get_daily_themes(num_days)
         
-        # Create schedule for each day
+        # Place every task across all days, then attach the day metadata
+        day_schedules, unscheduled_tasks = FallbackScheduler._plan_days(
+            tasks, day_names, daily_themes, preferences.get('busy_intervals'))
+        
         optimized_schedule = []
         
         for day_idx in range(num_days):
-            day_name = day_names[day_idx]
             daily_theme = daily_themes[day_idx]
-            is_weekend = day_name in ["Saturday", "Sunday"]
-            
-            # Create daily schedule with theme
-            daily_schedule = FallbackScheduler._create_themed_day_schedule(
-                tasks, day_idx, day_name, daily_theme, is_weekend, num_days
-            )
             
             optimized_schedule.append({
                 "day": day_idx + 1,
-                "day_name": day_name,
+                "day_name": day_names[day_idx],
                 "theme": daily_theme["theme"],
                 "focus": daily_theme["focus"],
                 "energy_pattern": daily_theme["work_style"],
-                "tasks": daily_schedule
+                "tasks": day_schedules[day_idx]
             })
         
         # Calculate summary statistics
@@ -146,6 +145,12 @@ class FallbackScheduler:
             "Task distribution varies by day to prevent repetition"
         ]
         
+        if unscheduled_tasks:
+            recommendations.append(
+                f"{len(unscheduled_tasks)} task(s) did not fit into the available time: "
+                + ", ".join(task.get('name', 'Unnamed Task') for task in unscheduled_tasks)
+            )
+        
         return {
             "optimized_schedule": optimized_schedule,
             "daily_summary": {
@@ -157,17 +162,110 @@ class FallbackScheduler:
                 "free_time": "Remaining time for flexibility",
                 "productivity_score": 85,
                 "daily_themes": daily_theme_descriptions,
-                "recommendations": recommendations
+                "recommendations": recommendations,
+                "unscheduled_tasks": [task.get('name', 'Unnamed Task') for task in unscheduled_tasks]
             }
         }
     
     @staticmethod
-    def _create_themed_day_schedule(tasks: List[Dict], day_idx: int, day_name: str, 
-                                   daily_theme: Dict, is_weekend: bool, total_days: int) -> List[Dict]:
-        """Create schedule for a single day with thematic focus"""
-        schedule = []
+    def _create_themed_day_schedule(tasks_for_day: List[Dict], daily_theme: Dict, is_weekend: bool,
+                                   busy_intervals: Optional[List[Tuple[int, int]]] = None) -> List[Dict]:
+        """Create schedule for a single day with thematic focus
+        
+        tasks_for_day are the tasks assigned to this day (see _assign_task_days).
+        busy_intervals are minutes taken by existing calendar events; no task
+        is placed over them.
+        """
+        essential_activities = FallbackScheduler._get_essential_activities(daily_theme, is_weekend)
+        schedule = FallbackScheduler._build_essential_entries(essential_activities, daily_theme)
+        
+        # Sort tasks by priority and theme relevance
+        sorted_tasks = FallbackScheduler._sort_tasks_by_theme(tasks_for_day, daily_theme)
+        
+        # Place every task that fits into the day's free time
+        free = ConstraintScheduler.subtract_intervals(
+            FallbackScheduler._get_free_intervals(essential_activities), busy_intervals or [])
+        result = ConstraintScheduler.solve(
+            sorted_tasks,
+            [free],
+            day_work_slots=[FallbackScheduler._get_work_slot_intervals(daily_theme, is_weekend)],
+            buffer_minutes=FallbackScheduler._get_buffer_minutes(daily_theme)
+        )
+        for idx, (_, start, end) in result["placements"].items():
+            schedule.append(FallbackScheduler._build_task_entry(sorted_tasks[idx], start, end, daily_theme))
+        
+        # Sort schedule by time
+        schedule.sort(key=lambda x: x["start_time"])
+        
+        return schedule
+    
+    @staticmethod
+    def _plan_days(tasks: List[Dict], day_names: List[str], daily_themes: List[Dict],
+                   busy_intervals: Optional[List[List[Tuple[int, int]]]] = None):
+        """Place all tasks across every day with the constraint scheduler
+        
+        busy_intervals holds each day's minutes taken by existing calendar
+        events, which are kept free. Returns the per-day schedules and the
+        tasks that could not be placed.
+        """
+        schedules = []
+        day_free = []
+        day_slots = []
+        day_buffers = []
+        
+        for day_idx, (day_name, daily_theme) in enumerate(zip(day_names, daily_themes)):
+            is_weekend = day_name in ["Saturday", "Sunday"]
+            essential_activities = FallbackScheduler._get_essential_activities(daily_theme, is_weekend)
+            schedules.append(FallbackScheduler._build_essential_entries(essential_activities, daily_theme))
+            day_free.append(ConstraintScheduler.subtract_intervals(
+                FallbackScheduler._get_free_intervals(essential_activities),
+                FallbackScheduler.get_day_busy_intervals(busy_intervals, day_idx)
+            ))
+            day_slots.append(FallbackScheduler._get_work_slot_intervals(daily_theme, is_weekend))
+            day_buffers.append(FallbackScheduler._get_buffer_minutes(daily_theme))
+        
+        # Theme distribution becomes a soft day preference for each task
+        result = ConstraintScheduler.solve(
+            tasks, day_free,
+            preferred_days=FallbackScheduler._assign_task_days(tasks, daily_themes),
+            day_work_slots=day_slots,
+            buffer_minutes=day_buffers
+        )
+        
+        for idx, (day_idx, start, end) in result["placements"].items():
+            schedules[day_idx].append(
+                FallbackScheduler._build_task_entry(tasks[idx], start, end, daily_themes[day_idx])
+            )
+        
+        for schedule in schedules:
+            schedule.sort(key=lambda x: x["start_time"])
+        
+        unscheduled = [tasks[idx] for idx in result["unscheduled"]]
+        return schedules, unscheduled
+    
+    @staticmethod
+    def _assign_task_days(tasks: List[Dict], daily_themes: List[Dict]) -> List[int]:
+        """Assign every task to exactly one day index following the theme distribution
         
-        # Define essential daily activities with theme-based variations
+        A task offered to several days by _distribute_themed_tasks keeps the
+        first of them; a task offered to none goes to the first day.
+        """
+        num_days = len(daily_themes)
+        task_days = [0] * len(tasks)
+        if num_days > 1:
+            positions = {id(task): i for i, task in enumerate(tasks)}
+            assigned = set()
+            for day_idx in range(num_days):
+                for task in FallbackScheduler._distribute_themed_tasks(tasks, day_idx, daily_themes[day_idx], num_days):
+                    position = positions[id(task)]
+                    if position not in assigned:
+                        task_days[position] = day_idx
+                        assigned.add(position)
+        return task_days
+    
+    @staticmethod
+    def _get_essential_activities(daily_theme: Dict, is_weekend: bool) -> List[Dict]:
+        """Get essential daily activities with theme-based variations"""
         if is_weekend:
             # Weekend has more relaxed schedule
             essential_activities = [
@@ -436,7 +534,12 @@ class FallbackScheduler:
                     }
                 ]
         
-        # Add essential activities to schedule
+        return essential_activities
+    
+    @staticmethod
+    def _build_essential_entries(essential_activities: List[Dict], daily_theme: Dict) -> List[Dict]:
+        """Convert essential activities to schedule entries"""
+        schedule = []
         for activity in essential_activities:
             start_dt = datetime.datetime.strptime(activity["start"], "%H:%M")
             end_dt = start_dt + datetime.timedelta(minutes=activity["duration"])
@@ -449,60 +552,52 @@ class FallbackScheduler:
                 "category": activity["category"],
                 "notes": f"Essential activity - {daily_theme['theme']} theme"
             })
-        
-        # Define work slots based on theme
-        work_slots = FallbackScheduler._get_themed_work_slots(daily_theme, is_weekend)
-        
-        # Distribute tasks based on theme
-        tasks_for_day = FallbackScheduler._distribute_themed_tasks(
-            tasks, day_idx, daily_theme, total_days
-        )
-        
-        # Sort tasks by priority and theme relevance
-        sorted_tasks = FallbackScheduler._sort_tasks_by_theme(tasks_for_day, daily_theme)
-        
-        # Schedule user tasks in available slots
-        current_slot = 0
-        if work_slots:
-            current_time = datetime.datetime.strptime(work_slots[0]["start"], "%H:%M")
-            slot_end = datetime.datetime.strptime(work_slots[0]["end"], "%H:%M")
-            
-            for task in sorted_tasks:
-                task_duration = datetime.timedelta(minutes=task['duration'])
-                
-                # Check if task fits in current slot
-                if current_time + task_duration > slot_end:
-                    # Move to next slot
-                    current_slot += 1
-                    if current_slot >= len(work_slots):
-                        break  # No more slots available
-                    current_time = datetime.datetime.strptime(work_slots[current_slot]["start"], "%H:%M")
-                    slot_end = datetime.datetime.strptime(work_slots[current_slot]["end"], "%H:%M")
-                    
-                    # Check again if task fits
-                    if current_time + task_duration > slot_end:
-                        continue  # Skip this task if it doesn't fit
-                
-                end_time = current_time + task_duration
-                
-                schedule.append({
-                    "task_name": task['name'],
-                    "start_time": current_time.strftime("%H:%M"),
-                    "end_time": end_time.strftime("%H:%M"),
-                    "priority": task['priority'],
-                    "category": task['category'],
-                    "notes": f"Duration: {task['duration']} minutes - {daily_theme['theme']} theme"
-                })
-                
-                # Add buffer time between tasks (varies by theme)
-                buffer_time = 15 if daily_theme["work_style"] == "intensive" else 10
-                current_time = end_time + datetime.timedelta(minutes=buffer_time)
-        
-        # Sort schedule by time
-        schedule.sort(key=lambda x: x["start_time"])
-        
         return schedule
     
+    @staticmethod
+    def _build_task_entry(task: Dict, start: int, end: int, daily_theme: Dict) -> Dict:
+        """Convert a placed user task to a schedule entry"""
+        return {
+            "task_name": task['name'],
+            "start_time": format_clock(start % MINUTES_PER_DAY),
+            "end_time": format_clock(end % MINUTES_PER_DAY),
+            "priority": task['priority'],
+            "category": task['category'],
+            "notes": f"Duration: {task['duration']} minutes - {daily_theme['theme']} theme"
+        }
+    
+    @staticmethod
+    def _get_free_intervals(essential_activities: List[Dict]) -> List[Tuple[int, int]]:
+        """Get free time between waking up and the evening routine, in minutes"""
+        starts = [parse_clock(a["start"]) for a in essential_activities]
+        awake = [(min(starts), max(starts))]
+        blocked = [
+            (start, start + activity["duration"])
+            for start, activity in zip(starts, essential_activities)
+        ]
+        return ConstraintScheduler.subtract_intervals(awake, blocked)
+    
+    @staticmethod
+    def get_day_busy_intervals(busy_intervals: Optional[List[List[Tuple[int, int]]]],
+                               day_idx: int) -> List[Tuple[int, int]]:
+        """Get one day's busy calendar intervals, or none if the day has no entry"""
+        if not busy_intervals or day_idx >= len(busy_intervals):
+            return []
+        return [(int(start), int(end)) for start, end in busy_intervals[day_idx]]
+    
+    @staticmethod
+    def _get_work_slot_intervals(daily_theme: Dict, is_weekend: bool) -> List[Tuple[int, int]]:
+        """Get themed work slots as minute intervals"""
+        return [
+            (parse_clock(slot["start"]), parse_clock(slot["end"]))
+            for slot in FallbackScheduler._get_themed_work_slots(daily_theme, is_weekend)
+        ]
+    
+    @staticmethod
+    def _get_buffer_minutes(daily_theme: Dict) -> int:
+        """Get buffer time between tasks (varies by theme)"""
+        return 15 if daily_theme["work_style"] == "intensive" else 10
+    
     @staticmethod
     def _get_themed_work_slots(daily_theme: Dict, is_weekend: bool) -> List[Dict]:
         """Get work slots based on daily theme"""
@@ -0,0 +1,132 @@
+import heapq
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from models.schedule_model import MINUTES_PER_DAY, ScheduleEntry, parse_clock
+
+
+class IntervalIndex:
+    """Static interval index over half-open ``[start, end)`` minute ranges.
+
+    Intervals are sorted by start once and stored as an implicit balanced
+    tree over that order, with each node holding the largest end time in
+    its subtree. Point and range queries skip any subtree that ends before
+    the query begins, giving O(log n + k) lookups for k matches.
+    """
+
+    def __init__(self, intervals: Optional[List[Tuple[int, int, Any]]] = None):
+        self._starts = []
+        self._ends = []
+        self._items = []
+        self._max_end = []
+        if intervals:
+            self._build(intervals)
+
+    @staticmethod
+    def parse_time(time_str: str) -> int:
+        """Convert an HH:MM string to minutes since midnight, accepting 24:00"""
+        return parse_clock(time_str)
+
+    @staticmethod
+    def split_range(start: int, end: int) -> List[Tuple[int, int]]:
+        """Split a time range into same-day pieces, wrapping ranges that cross midnight"""
+        if end > start:
+            return [(start, end)]
+        if end < start:
+            pieces = [(start, MINUTES_PER_DAY)]
+            if end > 0:
+                pieces.append((0, end))
+            return pieces
+        return []
+
+    @classmethod
+    def from_entries(cls, entries: List[Union[Dict, ScheduleEntry]], start_key: str = 'start_time',
+                     end_key: str = 'end_time') -> 'IntervalIndex':
+        """Build an index over schedule entries, keyed by their position in entries
+
+        Each entry is parsed once. Entries that cross midnight (e.g. 23:00-00:30)
+        are indexed as two pieces; entries with unparseable times are skipped.
+        Already-parsed ScheduleEntry objects are used as they are.
+        """
+        intervals = []
+        for position, entry in enumerate(entries):
+            if isinstance(entry, ScheduleEntry):
+                start, end = entry.start, entry.end
+            else:
+                try:
+                    start = cls.parse_time(entry.get(start_key, '00:00'))
+                    end = cls.parse_time(entry.get(end_key, '00:00'))
+                except (ValueError, AttributeError):
+                    continue
+            for piece_start, piece_end in cls.split_range(start, end):
+                intervals.append((piece_start, piece_end, position))
+        return cls(intervals)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def _build(self, intervals):
+        ordered = sorted(intervals, key=lambda interval: (interval[0], interval[1]))
+        self._starts = [interval[0] for interval in ordered]
+        self._ends = [interval[1] for interval in ordered]
+        self._items = [interval[2] for interval in ordered]
+        self._max_end = [0] * len(ordered)
+        self._fill_max_end(0, len(ordered))
+
+    def _fill_max_end(self, lo, hi):
+        """Compute subtree max ends for the implicit tree over [lo, hi)"""
+        if lo >= hi:
+            return 0
+        mid = (lo + hi) // 2
+        self._max_end[mid] = max(
+            self._ends[mid],
+            self._fill_max_end(lo, mid),
+            self._fill_max_end(mid + 1, hi)
+        )
+        return self._max_end[mid]
+
+    def overlapping(self, start: int, end: int) -> List[Any]:
+        """Get the items of every interval overlapping [start, end), in start order"""
+        if end <= start:
+            return []
+        # Nothing starting at or after end can overlap
+        limit = bisect_left(self._starts, end)
+        matches = []
+        self._collect(limit, start, matches, 0, len(self._starts))
+        return matches
+
+    def _collect(self, limit, start, matches, tree_lo, tree_hi):
+        """Walk the implicit tree, visiting only nodes before limit that can end after start"""
+        if tree_lo >= tree_hi or tree_lo >= limit:
+            return
+        mid = (tree_lo + tree_hi) // 2
+        if self._max_end[mid] <= start:
+            return
+        self._collect(limit, start, matches, tree_lo, mid)
+        if mid < limit and self._ends[mid] > start:
+            matches.append(self._items[mid])
+        self._collect(limit, start, matches, mid + 1, tree_hi)
+
+    def overlapping_pairs(self) -> List[Tuple[Any, Any]]:
+        """Get every distinct pair of items whose intervals overlap
+
+        Uses a sort-and-sweep over the indexed intervals with a heap of
+        active end times, so the cost is O(n log n + k) for k overlaps.
+        Items indexed as several pieces are reported at most once per pair,
+        so items must be hashable and orderable (e.g. entry positions).
+        """
+        pairs = []
+        seen = set()
+        active = []  # heap of (end, order, item)
+        for order, (start, end, item) in enumerate(zip(self._starts, self._ends, self._items)):
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            for _, _, other in active:
+                if other == item:
+                    continue
+                key = (other, item) if other < item else (item, other)
+                if key not in seen:
+                    seen.add(key)
+                    pairs.append(key)
+            heapq.heappush(active, (end, order, item))
+        return pairs
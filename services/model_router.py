@@ -0,0 +1,114 @@
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class ModelRouter:
+    """Picks the execution tier for each optimization and records how it went.
+
+    Trivial single-day schedules are built by the local solver without an
+    API call, ordinary ones go to a fast model, and large multi-day or
+    chat-driven ones to a stronger model. Every decision and its latency is
+    kept per tier so the thresholds can be tuned from real traffic.
+    """
+
+    TIER_LOCAL = 'local'
+    TIER_FAST = 'fast'
+    TIER_STRONG = 'strong'
+    TIERS = (TIER_LOCAL, TIER_FAST, TIER_STRONG)
+
+    DEFAULT_FAST_MODEL = 'gemini-2.0-flash'
+    DEFAULT_STRONG_MODEL = 'gemini-2.5-flash'
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, fast_model: str = DEFAULT_FAST_MODEL, strong_model: str = DEFAULT_STRONG_MODEL,
+                 local_max_tasks: int = 3, strong_min_tasks: int = 12, strong_min_days: int = 3,
+                 history_size: int = 50):
+        self.fast_model = fast_model
+        self.strong_model = strong_model
+        self.local_max_tasks = local_max_tasks
+        self.strong_min_tasks = strong_min_tasks
+        self.strong_min_days = strong_min_days
+        self._lock = threading.Lock()
+        self._history = deque(maxlen=history_size)
+        self._metrics = {tier: {'requests': 0, 'failures': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+                         for tier in self.TIERS}
+
+    @classmethod
+    def shared(cls) -> "ModelRouter":
+        """Get the process-wide router configured from the environment"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                try:
+                    thresholds = {
+                        'local_max_tasks': int(os.getenv('CHRONA_ROUTER_LOCAL_MAX_TASKS', 3)),
+                        'strong_min_tasks': int(os.getenv('CHRONA_ROUTER_STRONG_MIN_TASKS', 12)),
+                        'strong_min_days': int(os.getenv('CHRONA_ROUTER_STRONG_MIN_DAYS', 3))
+                    }
+                except ValueError:
+                    thresholds = {}
+                cls._shared = cls(
+                    fast_model=os.getenv('CHRONA_FAST_MODEL') or cls.DEFAULT_FAST_MODEL,
+                    strong_model=os.getenv('CHRONA_STRONG_MODEL') or cls.DEFAULT_STRONG_MODEL,
+                    **thresholds
+                )
+            return cls._shared
+
+    def choose(self, tier: str, reason: str) -> Dict:
+        """Build the route for a tier: its 'tier', 'model' (None for local) and 'reason'"""
+        model = {self.TIER_FAST: self.fast_model, self.TIER_STRONG: self.strong_model}.get(tier)
+        return {'tier': tier, 'model': model, 'reason': reason}
+
+    def route(self, task_count: int, num_days: int, has_feedback: bool = False,
+              allow_local: bool = True) -> Dict:
+        """
+        Pick the tier for a schedule request.
+
+        Args:
+            task_count: Tasks to schedule
+            num_days: Days in the schedule
+            has_feedback: Whether a chat request is being applied
+            allow_local: Whether trivial requests may skip the model
+
+        Returns:
+            dict: Route with 'tier', 'model' and 'reason'
+        """
+        if has_feedback:
+            return self.choose(self.TIER_STRONG, "chat feedback")
+        if num_days >= self.strong_min_days:
+            return self.choose(self.TIER_STRONG, f"{num_days} days")
+        if task_count >= self.strong_min_tasks:
+            return self.choose(self.TIER_STRONG, f"{task_count} tasks")
+        if allow_local and num_days == 1 and task_count <= self.local_max_tasks:
+            return self.choose(self.TIER_LOCAL, f"single day with {task_count} tasks")
+        return self.choose(self.TIER_FAST, f"{num_days} day(s) with {task_count} tasks")
+
+    def record(self, route: Dict, seconds: float, succeeded: bool = True):
+        """Record a routed request's latency and whether it produced a usable schedule"""
+        with self._lock:
+            metrics = self._metrics[route['tier']]
+            metrics['requests'] += 1
+            metrics['total_seconds'] += seconds
+            metrics['max_seconds'] = max(metrics['max_seconds'], seconds)
+            if not succeeded:
+                metrics['failures'] += 1
+            self._history.append(dict(route, seconds=seconds, succeeded=succeeded, time=datetime.now()))
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Get request, failure and latency counters for each tier"""
+        with self._lock:
+            return {
+                tier: dict(metrics, avg_seconds=metrics['total_seconds'] / metrics['requests']
+                           if metrics['requests'] else 0.0)
+                for tier, metrics in self._metrics.items()
+            }
+
+    def recent_decisions(self, limit: Optional[int] = None) -> List[Dict]:
+        """Get the latest routing decisions with their latency, newest first"""
+        with self._lock:
+            decisions = list(reversed(self._history))
+        return decisions[:limit] if limit is not None else decisions
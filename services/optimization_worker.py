@@ -0,0 +1,99 @@
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict
+
+
+class OptimizationJob:
+    """Handle for a schedule optimization running in the worker pool"""
+
+    def __init__(self, job_id: int, future: Future):
+        self.job_id = job_id
+        self.future = future
+        self.submitted_at = time.time()
+        # Days already received while a streamed optimization is still running
+        self.partial_days = []
+
+    @classmethod
+    def completed(cls, result: Dict) -> "OptimizationJob":
+        """Create a job that is already finished with the given result"""
+        future = Future()
+        future.set_result(result)
+        return cls(0, future)
+
+    def done(self) -> bool:
+        """Check whether the optimization has finished"""
+        return self.future.done()
+
+    def result(self) -> Dict:
+        """Get the optimization result, converting worker crashes to error dicts"""
+        try:
+            return self.future.result()
+        except Exception as e:
+            return {"error": f"Background optimization failed: {str(e)}"}
+
+    def started(self) -> bool:
+        """Check whether a worker has picked up the job (it can no longer be cancelled)"""
+        return self.future.running() or self.future.done()
+
+    def cancel(self) -> bool:
+        """Cancel the job if it has not started yet"""
+        return self.future.cancel()
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Seconds since the job was submitted"""
+        return time.time() - self.submitted_at
+
+
+class OptimizationWorkerPool:
+    """Bounded, process-wide thread pool for schedule optimizations.
+
+    The pool is shared by every Streamlit session in the process. Submissions
+    beyond the worker count are queued up to ``max_pending``; anything past
+    that is rejected immediately instead of piling up behind slow requests.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 16):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="chrona-optimizer")
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._ids = itertools.count(1)
+
+    @classmethod
+    def shared(cls) -> "OptimizationWorkerPool":
+        """Get the process-wide pool configured from the environment"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    max_workers=int(os.getenv("CHRONA_OPTIMIZER_WORKERS", "4")),
+                    max_pending=int(os.getenv("CHRONA_OPTIMIZER_QUEUE", "16"))
+                )
+            return cls._shared
+
+    def submit(self, fn: Callable[..., Dict], *args, **kwargs) -> OptimizationJob:
+        """Queue fn for execution and return a job handle immediately"""
+        if not self._slots.acquire(blocking=False):
+            return OptimizationJob.completed({
+                "error": "The optimizer is busy right now. Please try again in a few seconds."
+            })
+
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return OptimizationJob(next(self._ids), future)
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work and release the worker threads"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
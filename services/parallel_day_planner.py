@@ -0,0 +1,147 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from services.prompt_generator import PromptGenerator
+from services.fallback_scheduler import FallbackScheduler
+from models.schedule_model import DaySchedule
+
+
+class ParallelDayPlanner:
+    """Split-and-merge generation for multi-day schedules.
+
+    Each task is assigned to exactly one day up front with the fallback
+    scheduler's theme distribution, then one small prompt per day is sent concurrently. The
+    results are merged back into the regular ``optimized_schedule`` shape so
+    wall-clock time tracks the slowest day rather than the sum of all days.
+    """
+
+    DEFAULT_MAX_CONCURRENCY = 4
+
+    @staticmethod
+    def get_max_concurrency() -> int:
+        """Get the configured number of concurrent day requests"""
+        try:
+            return max(1, int(os.getenv("CHRONA_MAX_PARALLEL_DAYS", ParallelDayPlanner.DEFAULT_MAX_CONCURRENCY)))
+        except ValueError:
+            return ParallelDayPlanner.DEFAULT_MAX_CONCURRENCY
+
+    @staticmethod
+    def create_schedule(tasks: List[Dict], preferences: Dict,
+                        generate_day: Callable[[str], Optional[Dict]],
+                        max_concurrency: Optional[int] = None,
+                        on_day: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Generate every day concurrently with generate_day and merge the results
+
+        generate_day receives a day prompt and returns the parsed day object,
+        or None if the response was unusable. Failed days are filled in with
+        the local fallback schedule for that day.
+        """
+        num_days = PromptGenerator._parse_schedule_duration(
+            preferences.get('schedule_duration', '1 day (Single day)'))
+        day_names = FallbackScheduler._get_day_names(num_days)
+        prompt_themes = PromptGenerator._get_daily_themes(num_days)
+        fallback_themes = FallbackScheduler._get_daily_themes(num_days)
+
+        if max_concurrency is None:
+            max_concurrency = ParallelDayPlanner.get_max_concurrency()
+
+        # Assign tasks to days with the same theme logic the fallback uses
+        task_days = FallbackScheduler._assign_task_days(tasks, fallback_themes)
+        day_tasks = [[task for task, task_day in zip(tasks, task_days) if task_day == day_idx]
+                     for day_idx in range(num_days)]
+        day_prompts = [
+            PromptGenerator.generate_day_prompt(
+                day_tasks[day_idx], preferences, day_idx + 1, num_days,
+                day_names[day_idx], prompt_themes[day_idx])
+            for day_idx in range(num_days)
+        ]
+
+        days = [None] * num_days
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, num_days)) as executor:
+            futures = {
+                executor.submit(generate_day, prompt): day_idx
+                for day_idx, prompt in enumerate(day_prompts)
+            }
+            for future in as_completed(futures):
+                day_idx = futures[future]
+                try:
+                    day = future.result()
+                except Exception:
+                    day = None
+
+                if not ParallelDayPlanner._is_valid_day(day):
+                    day = ParallelDayPlanner._fallback_day(
+                        day_tasks[day_idx], day_idx, day_names[day_idx], fallback_themes[day_idx],
+                        FallbackScheduler.get_day_busy_intervals(preferences.get('busy_intervals'), day_idx))
+
+                # Keep the day identity we asked for regardless of what came back
+                day["day"] = day_idx + 1
+                day["day_name"] = day_names[day_idx]
+                day.setdefault("theme", prompt_themes[day_idx]["theme"])
+                days[day_idx] = day
+
+                if on_day:
+                    on_day(day)
+
+        return {
+            "optimized_schedule": days,
+            "daily_summary": ParallelDayPlanner._build_summary(tasks, day_tasks, days, num_days)
+        }
+
+    @staticmethod
+    def _is_valid_day(day: Optional[Dict]) -> bool:
+        """Check that a generated day has a usable task list with valid times"""
+        if not (isinstance(day, dict) and isinstance(day.get("tasks"), list) and len(day["tasks"]) > 0):
+            return False
+        try:
+            DaySchedule.from_dict(day)
+        except (ValueError, AttributeError, TypeError):
+            return False
+        return True
+
+    @staticmethod
+    def _fallback_day(day_tasks: List[Dict], day_idx: int, day_name: str, daily_theme: Dict,
+                      busy_intervals: Optional[List[Tuple[int, int]]] = None) -> Dict:
+        """Build one day locally from the tasks assigned to it when its model request failed"""
+        is_weekend = day_name in ["Saturday", "Sunday"]
+        return {
+            "day": day_idx + 1,
+            "day_name": day_name,
+            "theme": daily_theme["theme"],
+            "focus": daily_theme["focus"],
+            "energy_pattern": daily_theme["work_style"],
+            "tasks": FallbackScheduler._create_themed_day_schedule(
+                day_tasks, daily_theme, is_weekend, busy_intervals)
+        }
+
+    @staticmethod
+    def _build_summary(tasks: List[Dict], day_tasks: List[List[Dict]], days: List[Dict],
+                       num_days: int) -> Dict:
+        """Build the daily_summary block for a merged schedule"""
+        assigned = [id(task) for tasks_for_day in day_tasks for task in tasks_for_day]
+        assert sorted(assigned) == sorted(id(task) for task in tasks), \
+            "every task must be assigned to exactly one day"
+
+        user_task_minutes = sum(task.get('duration', 0) for task in tasks)
+
+        daily_theme_descriptions = [
+            f"Day {day['day']}: {day.get('theme', 'Balanced')} - {day.get('focus', 'Mixed tasks')}"
+            for day in days
+        ]
+
+        return {
+            "total_work_time": f"{user_task_minutes // 60} hours {user_task_minutes % 60} minutes",
+            "personal_time": "7 hours 0 minutes",
+            "sleep_time": "8 hours",
+            "meal_time": "2 hours",
+            "exercise_time": "45 minutes",
+            "free_time": "Remaining time for flexibility",
+            "productivity_score": 85,
+            "daily_themes": daily_theme_descriptions,
+            "recommendations": [
+                f"Each of the {num_days} days was planned individually around its theme",
+                "Tasks are distributed across days to match daily energy patterns",
+                "Consistent sleep and meal schedules maintained"
+            ]
+        }
@@ -1,9 +1,101 @@
 
 import json
-from typing import List, Dict
+import os
+from typing import List, Dict, Optional, Tuple
 
 class PromptGenerator:
     """Service for generating AI optimization prompts"""
+
+    # Column order of the compact task table
+    TASK_COLUMNS = ("name", "duration_minutes", "priority", "category", "preferred_time", "deadline", "notes")
+
+    # Rough characters per token for English prompts, used for budgeting
+    CHARS_PER_TOKEN = 4
+
+    DEFAULT_TOKEN_BUDGET = 3000
+
+    # Task notes are cut to this length when the prompt is over budget
+    COMPACT_NOTES_LENGTH = 60
+
+    # Theme name keywords and the rule that applies to days with such a theme
+    THEME_RULES = (
+        (("deep",), "DEEP FOCUS days: Schedule complex analytical tasks in morning, minimize interruptions, longer work blocks"),
+        (("communication", "collaboration"), "COMMUNICATION days: Schedule meetings, calls, collaborative work, social tasks"),
+        (("creative", "innovation"), "CREATIVE days: Schedule brainstorming, design work, artistic tasks, flexible timing"),
+        (("strategic", "analysis"), "STRATEGIC days: Schedule planning, goal-setting, analysis, review tasks"),
+        (("implementation", "execution", "results"), "IMPLEMENTATION days: Schedule action items, execution tasks, practical work"),
+        (("personal", "adventure", "recovery"), "PERSONAL days: Schedule family time, hobbies, personal development, relaxed pace"),
+        (("reflection", "integration", "learning"), "REFLECTION days: Schedule review, meditation, planning, lighter workload")
+    )
+
+    TASK_DISTRIBUTION_RULES = """TASK DISTRIBUTION STRATEGY:
+- Distribute similar tasks across different days to avoid repetition
+- Match task types to daily themes (analytical tasks on Deep Focus days, etc.)
+- Create variety in daily schedules - no two days should look the same
+- Balance high-energy and low-energy activities across the week
+- Use different time slots for similar activities on different days"""
+
+    REQUEST_PARSING_RULES = """NATURAL LANGUAGE PROCESSING RULES:
+- "move [task] to [time]" → Reschedule specific task to requested time
+- "add [duration] for [activity]" → Insert new time block for specified activity
+- "make [task] longer/shorter" → Adjust duration of specific task
+- "math in morning" → Move math-related tasks to morning hours (06:00-12:00)
+- "english in evening" → Move English-related tasks to evening hours (18:00-22:00)
+- "earlier"/"later" → Move start times 1-2 hours earlier or later
+- "longer breaks" or "more break time" → Increase buffer periods between activities
+- "morning person"/"evening person" → Schedule important tasks 06:00-12:00 / 18:00-22:00
+- "group similar tasks" → Batch similar activities together
+- "no meetings before [time]" → Avoid scheduling meetings/calls before specified time
+- "I need time for" → Add requested activity to schedule
+Parse specific times ("6 AM", "evening"), durations ("an hour", "1 hour each") and constraints ("not before 9 AM").
+Apply these modifications while maintaining schedule validity, user task requirements, and daily themes."""
+
+    SCHEDULING_ALGORITHM = """=== INTELLIGENT SCHEDULING ALGORITHM ===
+PRIORITY MATRIX:
+1. CRITICAL: Sleep (7.5-8h), Safety, Health emergencies
+2. ESSENTIAL: Meals, Hygiene, Deadlines within 24h
+3. HIGH: User high-priority tasks, Exercise, Family time
+4. MEDIUM: User medium-priority tasks, Social activities
+5. LOW: User low-priority tasks, Optional activities
+TIME SLOTS: Morning (06:00-12:00) complex/creative tasks; Afternoon (12:00-18:00) routine/administrative tasks; Evening (18:00-22:00) social/family time, light activities; Night (22:00-06:00) sleep
+PREFERENCE PARSING RULES:
+- "Morning (6-12)" → 06:00-11:59, "Afternoon (12-18)" → 12:00-17:59, "Evening (18-22)" → 18:00-21:59
+- Notes with specific times (e.g., "6h to 8h30 p.m") → ABSOLUTE PRIORITY
+- "theatre", "cinema", "movie" → Consider venue operating hours
+- Travel/location changes → Add 15-30min buffer time"""
+
+    CIRCADIAN_RULES = """CIRCADIAN RHYTHM OPTIMIZATION:
+- Deep work: 09:00-11:00, 14:00-16:00
+- Creative tasks: 10:00-12:00
+- Physical exercise: 07:00-09:00 or 17:00-19:00
+- Social activities: 19:00-21:00
+- Wind-down: 21:00-22:00"""
+
+    DAILY_STRUCTURE = """=== MANDATORY DAILY STRUCTURE ===
+SLEEP: 6.5-8 hours (recommended: 23:00-07:00 or 22:30-06:30)
+MEALS: Breakfast 07:00-09:00 (30 min), Lunch 12:00-14:00 (45 min), Dinner 18:00-20:00 (45 min)
+HYGIENE: Morning routine 15-30 min after waking, evening routine 15-30 min before sleep
+EXERCISE: 30-60 min (adapt to user preference/schedule)
+FAMILY/PERSONAL: Minimum 1-2 hours quality time
+BUFFER: 10-15 min between different locations/activities"""
+
+    MULTI_DAY_RULES = """=== MULTI-DAY SCHEDULING RULES ===
+1. THEME-BASED DISTRIBUTION: Match tasks to daily themes (analytical → Deep Focus, meetings → Communication)
+2. ENERGY CYCLES: Account for different energy levels throughout the multi-day period
+3. WEEKEND DIFFERENTIATION: Weekend days have relaxed schedules with personal focus
+4. PROGRESSION BUILDING: Create momentum across days (preparation → execution → reflection)
+5. RECOVERY INTEGRATION: Include lighter days after intensive work days
+6. CONSISTENCY: Keep sleep and meal schedules consistent across all days
+7. TASK ROTATION: Rotate similar tasks across different days and time slots"""
+
+    OPTIMIZATION_RULES = """=== ADVANCED OPTIMIZATION RULES ===
+1. Deadline Urgency: Tasks with today's deadline get premium time slots
+2. Energy Matching: Match task complexity to natural energy levels
+3. Context Switching: Minimize transitions between different task types within each day
+4. Realistic Timing: Include preparation, travel, and cleanup time
+5. Stress Prevention: Avoid back-to-back high-intensity activities
+6. Flow State: Group similar tasks for sustained focus
+7. Recovery Periods: Schedule micro-breaks every 90-120 minutes"""
     
     @staticmethod
     def _parse_schedule_duration(duration_str: str) -> int:
@@ -81,17 +173,8 @@ class PromptGenerator:
             return custom_themes
     
     @staticmethod
-    def generate_schedule_prompt(tasks: List[Dict], preferences: Dict) -> str:
-        """Generate prompt for Google GenAI to optimize schedule"""
-
-        # Parse schedule duration
-        schedule_duration_str = preferences.get('schedule_duration', '1 day (Single day)')
-        num_days = PromptGenerator._parse_schedule_duration(schedule_duration_str)
-        
-        # Get daily themes for unique scheduling
-        daily_themes = PromptGenerator._get_daily_themes(num_days)
-        
-        # Extract task details more clearly
+    def _build_task_details(tasks: List[Dict]) -> List[Dict]:
+        """Extract the task fields the model needs"""
         task_details = []
         for task in tasks:
             task_info = {
@@ -104,289 +187,411 @@ class PromptGenerator:
                 "deadline": task.get('deadline', None)
             }
             task_details.append(task_info)
+        return task_details
 
-        # Generate day names for the schedule
-        if num_days == 1:
-            day_description = "single day"
-        elif num_days == 2:
-            day_description = "weekend (Saturday & Sunday)"
-        elif num_days == 3:
-            day_description = "long weekend (Friday, Saturday & Sunday)"
-        elif num_days == 5:
-            day_description = "workweek (Monday to Friday)"
-        elif num_days == 7:
-            day_description = "full week (Monday to Sunday)"
-        elif num_days == 14:
-            day_description = "two weeks (14 days)"
-        else:
-            day_description = f"{num_days} days"
+    @staticmethod
+    def _encode_task_table(task_details: List[Dict], max_notes: Optional[int] = None) -> str:
+        """Encode tasks as a pipe-separated table, far shorter than indented JSON
+
+        Empty values become "-"; notes are cut to max_notes characters when given.
+        """
+        def cell(value, limit=None):
+            text = " ".join(str(value).split()).replace("|", "/") if value not in (None, "") else "-"
+            if text == "No preference":
+                return "-"
+            if limit is not None and len(text) > limit:
+                return text[:limit].rstrip() + "…"
+            return text
 
-        # Create daily theme descriptions
-        theme_descriptions = []
+        rows = [" | ".join(PromptGenerator.TASK_COLUMNS)]
+        for task in task_details:
+            rows.append(" | ".join(
+                cell(task.get(column), max_notes if column == "notes" else None)
+                for column in PromptGenerator.TASK_COLUMNS
+            ))
+        return "\n".join(rows)
+
+    @staticmethod
+    def _format_busy_intervals(intervals: List) -> str:
+        """Format one day's busy minute intervals as HH:MM-HH:MM ranges"""
+        def clock(minutes):
+            # The prompt forbids 24:00, so a block running to midnight ends at 23:59
+            minutes = min(int(minutes), 24 * 60 - 1)
+            return f"{minutes // 60:02d}:{minutes % 60:02d}"
+        return ", ".join(f"{clock(start)}-{clock(end)}" for start, end in intervals)
+
+    @staticmethod
+    def _build_busy_section(preferences: Dict, day_numbers: List[int]) -> str:
+        """Describe existing calendar commitments on the given days as blocked time"""
+        busy_intervals = preferences.get('busy_intervals') or []
+        lines = [
+            f"Day {day_number}: {PromptGenerator._format_busy_intervals(busy_intervals[day_number - 1])}"
+            for day_number in day_numbers
+            if day_number <= len(busy_intervals) and busy_intervals[day_number - 1]
+        ]
+        if not lines:
+            return ""
+        return "\n".join([
+            "=== BLOCKED TIME (EXISTING CALENDAR COMMITMENTS) ===",
+            "The user is already busy at these times. Do NOT schedule any task that overlaps them, "
+            "and do not list them as tasks:"
+        ] + lines)
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Estimate the model tokens in a text without a network call (about 4 characters each)"""
+        return (len(text) + PromptGenerator.CHARS_PER_TOKEN - 1) // PromptGenerator.CHARS_PER_TOKEN
+
+    @staticmethod
+    def get_token_budget() -> int:
+        """Get the configured prompt token budget"""
+        try:
+            return max(500, int(os.getenv("CHRONA_PROMPT_TOKEN_BUDGET", PromptGenerator.DEFAULT_TOKEN_BUDGET)))
+        except ValueError:
+            return PromptGenerator.DEFAULT_TOKEN_BUDGET
+
+    @staticmethod
+    def _fit_to_budget(sections: List[Tuple[int, str]], budget: int) -> List[str]:
+        """Drop optional sections, lowest priority first, until the prompt fits the budget
+
+        Sections are (priority, text) pairs; priority 0 marks a required
+        section that is always kept. Order is preserved.
+        """
+        kept = [(priority, text) for priority, text in sections if text]
+        total = sum(PromptGenerator.estimate_tokens(text) for _, text in kept)
+        for priority in sorted({priority for priority, _ in kept if priority > 0}):
+            if total <= budget:
+                break
+            total -= sum(PromptGenerator.estimate_tokens(text) for p, text in kept if p == priority)
+            kept = [(p, text) for p, text in kept if p != priority]
+        return [text for _, text in kept]
+
+    @staticmethod
+    def _describe_days(num_days: int) -> str:
+        """Describe a schedule length in words"""
+        return {
+            1: "single day",
+            2: "weekend (Saturday & Sunday)",
+            3: "long weekend (Friday, Saturday & Sunday)",
+            5: "workweek (Monday to Friday)",
+            7: "full week (Monday to Sunday)",
+            14: "two weeks (14 days)"
+        }.get(num_days, f"{num_days} days")
+
+    @staticmethod
+    def _build_theme_section(daily_themes: List[Dict]) -> str:
+        """List each day's theme; only needed when days have distinct themes"""
+        lines = [f"=== UNIQUE DAILY THEMES FOR {len(daily_themes)}-DAY SCHEDULE ===",
+                 "CRITICAL: Each day must have a UNIQUE theme and focus. Create distinctly different daily patterns:"]
         for i, theme in enumerate(daily_themes):
-            theme_descriptions.append(f"Day {i+1}: {theme['theme']} - Focus on {theme['focus']} with {theme['energy']} energy in a {theme['style']} style")
-        
-        theme_section = "\n".join(theme_descriptions)
+            description = f"Day {i + 1}: {theme['theme']} - Focus on {theme['focus']} with {theme['energy']} energy"
+            if theme.get('style'):
+                description += f" in a {theme['style']} style"
+            lines.append(description)
+        return "\n".join(lines)
 
-        prompt = f"""
-        You are Chrona AI, an expert schedule optimization system. Your mission is to create a scientifically-optimized {num_days}-day schedule that maximizes productivity while maintaining work-life balance.
+    @staticmethod
+    def _build_theme_rules(daily_themes: List[Dict]) -> str:
+        """Give implementation rules only for the kinds of themes this schedule uses"""
+        names = " ".join(theme['theme'].lower() for theme in daily_themes)
+        rules = [rule for keywords, rule in PromptGenerator.THEME_RULES
+                 if any(keyword in names for keyword in keywords)]
+        if not rules:
+            return ""
+        return "THEME IMPLEMENTATION RULES:\n" + "\n".join(f"- {rule}" for rule in rules)
 
-        === CRITICAL TECHNICAL REQUIREMENTS ===
-        1. TIME FORMAT: ONLY use HH:MM format (00:00 to 23:59). NEVER use 24:00 - use 00:00 for midnight
-        2. PRECISION: Every minute counts - no overlapping times or gaps within each day
-        3. VALIDATION: All times must be chronologically logical within each day
-        4. CONSISTENCY: Maintain exact duration as specified by user
-        5. MULTI-DAY STRUCTURE: Create {num_days} separate daily schedules for the {day_description}
+    @staticmethod
+    def _build_request_section(user_request: str, num_days: int) -> str:
+        """Describe the user's chat request and how to apply it to the existing schedule"""
+        return "\n".join([
+            "=== USER CHAT REQUEST & SCHEDULE MODIFICATIONS ===",
+            "CRITICAL: The user has provided specific instructions about what they want changed in their EXISTING schedule.",
+            "You MUST take their current schedule and modify it based on their natural language request:",
+            f"USER REQUEST: {user_request}",
+            "MODIFICATION APPROACH:",
+            "- START with the existing schedule structure",
+            "- MODIFY only what the user specifically requested",
+            "- MAINTAIN all other tasks and timing that work well",
+            "- ADJUST surrounding tasks only if necessary to accommodate changes",
+            "- PRESERVE user preferences and task requirements",
+            f"- APPLY changes consistently across all {num_days} days where applicable",
+            "- MAINTAIN daily themes while incorporating user requests"
+        ])
 
-        === USER TASKS TO OPTIMIZE ===
-        {json.dumps(task_details, ensure_ascii=False, indent=2)}
+    @staticmethod
+    def _build_output_section(num_days: Optional[int] = None) -> str:
+        """Describe the JSON output shape with a one-day example
 
-        === SCHEDULE DURATION REQUIREMENTS ===
-        Number of Days: {num_days}
-        Schedule Type: {day_description}
-        
-        === UNIQUE DAILY THEMES FOR {str(num_days).upper()}-DAY SCHEDULE ===
-        CRITICAL: Each day must have a UNIQUE theme and focus. Create distinctly different daily patterns:
-        
-        {theme_section}
-        
-        THEME IMPLEMENTATION RULES:
-        - DEEP FOCUS days: Schedule complex analytical tasks in morning, minimize interruptions, longer work blocks
-        - COMMUNICATION days: Schedule meetings, calls, collaborative work, social tasks
-        - CREATIVE days: Schedule brainstorming, design work, artistic tasks, flexible timing
-        - STRATEGIC days: Schedule planning, goal-setting, analysis, review tasks
-        - IMPLEMENTATION days: Schedule action items, execution tasks, practical work
-        - PERSONAL days: Schedule family time, hobbies, personal development, relaxed pace
-        - REFLECTION days: Schedule review, meditation, planning, lighter workload
-        
-        TASK DISTRIBUTION STRATEGY:
-        - Distribute similar tasks across different days to avoid repetition
-        - Match task types to daily themes (analytical tasks on Deep Focus days, etc.)
-        - Create variety in daily schedules - no two days should look the same
-        - Balance high-energy and low-energy activities across the week
-        - Use different time slots for similar activities on different days
-
-        === USER PRODUCTIVITY PROFILE ===
-        Peak Performance Hours: {preferences.get('peak_hours', 'Morning')}
-        Optimal Break Duration: {preferences.get('break_time', '15 minutes')}
-        Work Priority Focus: {preferences.get('work_type', 'Important work')}
-        Schedule Flexibility: {preferences.get('flexibility', 3)}/5 (1=rigid, 5=very flexible)
-
-        {f"""=== USER CHAT REQUEST & SCHEDULE MODIFICATIONS ===
-        CRITICAL: The user has provided specific instructions about what they want changed in their EXISTING schedule.
-        You MUST take their current schedule and modify it based on their natural language request:
-
-        USER REQUEST: {preferences.get('user_schedule_request')}
-
-        MODIFICATION APPROACH:
-        - START with the existing schedule structure
-        - MODIFY only what the user specifically requested
-        - MAINTAIN all other tasks and timing that work well
-        - ADJUST surrounding tasks only if necessary to accommodate changes
-        - PRESERVE user preferences and task requirements
-        - APPLY changes consistently across all {num_days} days where applicable
-        - MAINTAIN daily themes while incorporating user requests
-
-        NATURAL LANGUAGE PROCESSING RULES:
-        - "move [task] to [time]" → Reschedule specific task to requested time
-        - "add [duration] for [activity]" → Insert new time block for specified activity
-        - "make [task] longer/shorter" → Adjust duration of specific task
-        - "more study time" → Increase study/learning activity duration
-        - "math in morning" → Move math-related tasks to morning hours (06:00-12:00)
-        - "english in evening" → Move English-related tasks to evening hours (18:00-22:00)
-        - "1 hour each" → Ensure specified activities get exactly 1 hour duration
-        - "earlier" or "move earlier" → Push start times earlier (subtract 1-2 hours)
-        - "later" or "move later" → Push start times later (add 1-2 hours)
-        - "longer breaks" or "more break time" → Increase buffer periods between activities
-        - "morning person" or "productive in morning" → Schedule important tasks 06:00-12:00
-        - "evening person" or "productive in evening" → Schedule important tasks 18:00-22:00
-        - "group similar tasks" → Batch similar activities together
-        - "no meetings before [time]" → Avoid scheduling meetings/calls before specified time
-        - "I need time for" → Add requested activity to schedule
-        
-        CONTEXTUAL UNDERSTANDING:
-        - Parse specific times mentioned (e.g., "6 AM", "2 PM", "evening", "morning")
-        - Understand duration requests (e.g., "30 minutes", "an hour", "1 hour each")
-        - Recognize task preferences (e.g., "morning workouts", "afternoon meetings")
-        - Identify constraints (e.g., "not before 9 AM", "after 5 PM only")
-        - Understand subject-specific requests (e.g., "math", "english", "study")
-        
-        Apply these modifications while maintaining schedule validity, user task requirements, and daily themes.
-        """ if preferences.get('user_schedule_request') else ''}
-
-        === INTELLIGENT SCHEDULING ALGORITHM ===
-
-        PRIORITY MATRIX:
-        1. CRITICAL: Sleep (7.5-8h), Safety, Health emergencies
-        2. ESSENTIAL: Meals, Hygiene, Deadlines within 24h
-        3. HIGH: User high-priority tasks, Exercise, Family time
-        4. MEDIUM: User medium-priority tasks, Social activities
-        5. LOW: User low-priority tasks, Optional activities
-
-        TIME SLOT OPTIMIZATION:
-        • Morning (06:00-12:00): Cognitive peak - complex/creative tasks
-        • Afternoon (12:00-18:00): Steady energy - routine/administrative tasks
-        • Evening (18:00-22:00): Social/family time, light activities
-        • Night (22:00-06:00): Sleep, recovery, preparation
-
-        PREFERENCE PARSING RULES:
-        - "Morning (6-12)" → Schedule between 06:00-11:59
-        - "Afternoon (12-18)" → Schedule between 12:00-17:59  
-        - "Evening (18-22)" → Schedule between 18:00-21:59
-        - Notes with specific times (e.g., "6h to 8h30 p.m") → ABSOLUTE PRIORITY
-        - "theatre", "cinema", "movie" → Consider venue operating hours
-        - Travel/location changes → Add 15-30min buffer time
-
-        CIRCADIAN RHYTHM OPTIMIZATION:
-        - Deep work: 09:00-11:00, 14:00-16:00
-        - Creative tasks: 10:00-12:00
-        - Physical exercise: 07:00-09:00 or 17:00-19:00
-        - Social activities: 19:00-21:00
-        - Wind-down: 21:00-22:00
-
-        === MANDATORY DAILY STRUCTURE ===
-        SLEEP: 6.5-8 hours (recommended: 23:00-07:00 or 22:30-06:30)
-        MEALS: 
-        - Breakfast: 07:00-09:00 (30 min)
-        - Lunch: 12:00-14:00 (45 min)
-        - Dinner: 18:00-20:00 (45 min)
-        HYGIENE:
-        - Morning routine: 15-30 min after waking
-        - Evening routine: 15-30 min before sleep
-        EXERCISE: 30-60 min (adapt to user preference/schedule)
-        FAMILY/PERSONAL: Minimum 1-2 hours quality time
-        BUFFER: 10-15 min between different locations/activities
-
-        === ENHANCED MULTI-DAY SCHEDULING RULES ===
-        1. THEME-BASED DISTRIBUTION: Match tasks to daily themes (analytical → Deep Focus, meetings → Communication)
-        2. ENERGY CYCLES: Account for different energy levels throughout the multi-day period
-        3. VARIETY MANDATE: Each day must be distinctly different - no repetitive patterns
-        4. WEEKEND DIFFERENTIATION: Weekend days have relaxed schedules with personal focus
-        5. PROGRESSION BUILDING: Create momentum across days (preparation → execution → reflection)
-        6. RECOVERY INTEGRATION: Include lighter days after intensive work days
-        7. CONSISTENCY MAINTENANCE: Keep sleep and meal schedules consistent across all days
-        8. TASK ROTATION: Rotate similar tasks across different days and time slots
-        9. FOCUS SPECIALIZATION: Each day specializes in specific types of work
-        10. TEMPORAL VARIETY: Use different time slots for similar activities on different days
-
-        === ADVANCED OPTIMIZATION RULES ===
-        1. Deadline Urgency: Tasks with today's deadline get premium time slots
-        2. Energy Matching: Match task complexity to natural energy levels and daily themes
-        3. Context Switching: Minimize transitions between different task types within each day
-        4. Realistic Timing: Include preparation, travel, and cleanup time
-        5. Stress Prevention: Avoid back-to-back high-intensity activities
-        6. Flow State: Group similar tasks for sustained focus, especially on themed days
-        7. Recovery Periods: Schedule micro-breaks every 90-120 minutes
-        8. Theme Coherence: Maintain thematic consistency within each day
-        9. Cross-Day Balance: Ensure overall balance across the entire multi-day period
-        10. Adaptive Scheduling: Adjust daily patterns based on theme requirements
-
-        === OUTPUT REQUIREMENTS ===
-        Return ONLY valid JSON with exact structure below. NO additional text or explanations.
-
-        {{
-            "optimized_schedule": [
-                {{
-                    "day": 1,
-                    "day_name": "Monday",
-                    "theme": "Strategic Monday",
-                    "focus": "Weekly planning/priorities",
-                    "energy_pattern": "Fresh start",
-                    "tasks": [
-                        {{
-                            "task_name": "Sleep",
-                            "start_time": "23:00",
-                            "end_time": "07:00",
-                            "priority": "essential",
-                            "category": "Personal",
-                            "notes": "8 hours for optimal recovery and cognitive function"
-                        }},
-                        {{
-                            "task_name": "Morning Routine",
-                            "start_time": "07:00",
-                            "end_time": "07:30",
-                            "priority": "essential",
-                            "category": "Personal",
-                            "notes": "Hygiene, preparation for the day"
-                        }},
-                        {{
-                            "task_name": "[User Task Name]",
-                            "start_time": "HH:MM",
-                            "end_time": "HH:MM",
-                            "priority": "[exact user priority]",
-                            "category": "[exact user category]",
-                            "notes": "Optimally scheduled during [daily theme] as requested"
-                        }}
-                    ]
-                }},
-                {{
-                    "day": 2,
-                    "day_name": "Tuesday",
-                    "theme": "Deep Work Tuesday",
-                    "focus": "Complex/analytical tasks",
-                    "energy_pattern": "Peak focus",
-                    "tasks": [
-                        {{
-                            "task_name": "Sleep",
-                            "start_time": "23:00",
-                            "end_time": "07:00",
-                            "priority": "essential",
-                            "category": "Personal",
-                            "notes": "8 hours for optimal recovery and cognitive function"
-                        }},
-                        {{
-                            "task_name": "Morning Routine",
-                            "start_time": "07:00",
-                            "end_time": "07:30",
-                            "priority": "essential",
-                            "category": "Personal",
-                            "notes": "Hygiene, preparation for the day"
-                        }}
-                    ]
-                }}
-            ],
-            "daily_summary": {{
+        Without num_days the day count is left to the request.
+        """
+        example_day = {
+            "day": 1,
+            "day_name": "Monday",
+            "theme": "Strategic Monday",
+            "focus": "Weekly planning/priorities",
+            "energy_pattern": "Fresh start",
+            "tasks": [
+                {"task_name": "Sleep", "start_time": "23:00", "end_time": "07:00", "priority": "essential",
+                 "category": "Personal", "notes": "8 hours for optimal recovery"},
+                {"task_name": "[User Task Name]", "start_time": "HH:MM", "end_time": "HH:MM",
+                 "priority": "[exact user priority]", "category": "[exact user category]",
+                 "notes": "Why this slot was chosen"}
+            ]
+        }
+        example = {
+            "optimized_schedule": [example_day],
+            "daily_summary": {
                 "total_work_time": "X hours Y minutes",
-                "personal_time": "X hours Y minutes", 
+                "personal_time": "X hours Y minutes",
                 "sleep_time": "8 hours",
                 "meal_time": "2 hours",
                 "exercise_time": "X minutes",
                 "free_time": "X hours Y minutes",
                 "productivity_score": 85,
-                "daily_themes": [
-                    "Day 1: Strategic Monday - Focus on weekly planning",
-                    "Day 2: Deep Work Tuesday - Complex analytical tasks"
-                ],
-                "recommendations": [
-                    "Each day follows a unique theme for optimal variety",
-                    "Tasks are distributed to match daily energy patterns",
-                    "Consistent sleep and meal schedules maintained",
-                    "Daily themes create focused work environments"
-                ]
-            }}
-        }}
-
-        CRITICAL NOTES:
-        - Create exactly {num_days} day objects in the optimized_schedule array
-        - Each day MUST have a unique theme, focus, and energy pattern
-        - Use appropriate day names based on the schedule type
-        - Distribute user tasks strategically across days matching daily themes
-        - Ensure each day is a complete 24-hour schedule with distinct characteristics
-        - Make each day genuinely unique and optimized for its specific theme
-
-        === QUALITY ASSURANCE CHECKLIST ===
-        ✓ All user tasks scheduled across the {num_days} days
-        ✓ Each day has a unique theme and focus
-        ✓ Tasks are matched to appropriate daily themes
-        ✓ Specific time requests in notes honored
-        ✓ No time overlaps or impossible sequences within each day
-        ✓ Realistic duration for each activity
-        ✓ Proper energy-task matching with themes
-        ✓ Adequate buffer times included
-        ✓ Work-life balance maintained across all days
-        ✓ JSON format is valid and complete
-        ✓ Each day has genuinely different scheduling patterns
-        ✓ Tasks are distributed strategically across themed days
-        ✓ Daily themes are properly implemented in task selection
+                "daily_themes": ["Day 1: Strategic Monday - Focus on weekly planning"],
+                "recommendations": ["Short, specific recommendation"]
+            }
+        }
+        return "\n".join([
+            "=== OUTPUT REQUIREMENTS ===",
+            "Return ONLY valid JSON with exact structure below. NO additional text or explanations.",
+            json.dumps(example, ensure_ascii=False, separators=(",", ":")),
+            f"- Create exactly {num_days} day objects in the optimized_schedule array" if num_days
+            else "- Create exactly one day object per requested day in the optimized_schedule array",
+            "- Each day is a complete 24-hour schedule containing the essential activities and the user tasks placed on it"
+        ])
+
+    @staticmethod
+    def generate_schedule_prompt(tasks: List[Dict], preferences: Dict,
+                                 token_budget: Optional[int] = None) -> str:
+        """Generate prompt for Google GenAI to optimize schedule
+
+        The prompt is assembled from sections, leaving out those that do not
+        apply to the schedule length. Tasks are sent as a compact table. If
+        the estimate still exceeds token_budget (CHRONA_PROMPT_TOKEN_BUDGET
+        by default), optional guidance is dropped lowest priority first and
+        then task notes are shortened; tasks themselves are never dropped.
         """
+        if token_budget is None:
+            token_budget = PromptGenerator.get_token_budget()
+
+        # Parse schedule duration
+        schedule_duration_str = preferences.get('schedule_duration', '1 day (Single day)')
+        num_days = PromptGenerator._parse_schedule_duration(schedule_duration_str)
+        multi_day = num_days > 1
+
+        # Get daily themes for unique scheduling; up to two days share one balanced theme
+        daily_themes = PromptGenerator._get_daily_themes(num_days)
+        themed = num_days > 2
+
+        task_details = PromptGenerator._build_task_details(tasks)
+        day_description = PromptGenerator._describe_days(num_days)
+
+        def build(max_notes=None):
+            user_request = preferences.get('user_schedule_request')
+            sections = [
+                (0, "\n".join([
+                    f"You are Chrona AI, an expert schedule optimization system. Create a scientifically-optimized "
+                    f"{num_days}-day schedule that maximizes productivity while maintaining work-life balance.",
+                    "=== CRITICAL TECHNICAL REQUIREMENTS ===",
+                    "1. TIME FORMAT: ONLY use HH:MM format (00:00 to 23:59). NEVER use 24:00 - use 00:00 for midnight",
+                    "2. PRECISION: Every minute counts - no overlapping times or gaps within each day",
+                    "3. VALIDATION: All times must be chronologically logical within each day",
+                    "4. CONSISTENCY: Maintain exact duration as specified by user",
+                    f"5. MULTI-DAY STRUCTURE: Create {num_days} separate daily schedules for the {day_description}"
+                    if multi_day else "5. SINGLE DAY: Create one complete daily schedule"
+                ])),
+                (0, "=== USER TASKS TO OPTIMIZE (duration in minutes) ===\n"
+                    + PromptGenerator._encode_task_table(task_details, max_notes)),
+                (0, PromptGenerator._build_theme_section(daily_themes) if themed else ""),
+                (3, PromptGenerator._build_theme_rules(daily_themes) if themed else ""),
+                (2, PromptGenerator.TASK_DISTRIBUTION_RULES if multi_day else ""),
+                (0, "\n".join([
+                    "=== USER PRODUCTIVITY PROFILE ===",
+                    f"Peak Performance Hours: {preferences.get('peak_hours', 'Morning')}",
+                    f"Optimal Break Duration: {preferences.get('break_time', '15 minutes')}",
+                    f"Work Priority Focus: {preferences.get('work_type', 'Important work')}",
+                    f"Schedule Flexibility: {preferences.get('flexibility', 3)}/5 (1=rigid, 5=very flexible)"
+                ])),
+                (0, PromptGenerator._build_busy_section(preferences, list(range(1, num_days + 1)))),
+                (0, PromptGenerator._build_request_section(user_request, num_days) if user_request else ""),
+                (4, PromptGenerator.REQUEST_PARSING_RULES if user_request else ""),
+                (5, PromptGenerator.SCHEDULING_ALGORITHM),
+                (1, PromptGenerator.CIRCADIAN_RULES),
+                (6, PromptGenerator.DAILY_STRUCTURE),
+                (1, PromptGenerator.MULTI_DAY_RULES if multi_day else ""),
+                (2, PromptGenerator.OPTIMIZATION_RULES),
+                (0, PromptGenerator._build_output_section(num_days))
+            ]
+            return "\n\n".join(PromptGenerator._fit_to_budget(sections, token_budget))
+
+        prompt = build()
+        if PromptGenerator.estimate_tokens(prompt) > token_budget:
+            prompt = build(max_notes=PromptGenerator.COMPACT_NOTES_LENGTH)
         return prompt
+
+    @staticmethod
+    def static_schedule_instructions() -> str:
+        """Get the schedule instructions shared by every user and request
+
+        This is the rule book of generate_schedule_prompt with nothing
+        request-specific in it, so it can be cached once on the model side
+        and each call only sends generate_schedule_request. Rules that apply
+        only to some requests say when they apply.
+        """
+        theme_rules = "\n".join(f"- {rule}" for _, rule in PromptGenerator.THEME_RULES)
+        return "\n\n".join([
+            "\n".join([
+                "You are Chrona AI, an expert schedule optimization system. Each request gives the number of days, "
+                "the user's tasks and productivity profile, and possibly daily themes, blocked calendar time and a "
+                "chat request. Create a scientifically-optimized schedule that maximizes productivity while "
+                "maintaining work-life balance.",
+                "=== CRITICAL TECHNICAL REQUIREMENTS ===",
+                "1. TIME FORMAT: ONLY use HH:MM format (00:00 to 23:59). NEVER use 24:00 - use 00:00 for midnight",
+                "2. PRECISION: Every minute counts - no overlapping times or gaps within each day",
+                "3. VALIDATION: All times must be chronologically logical within each day",
+                "4. CONSISTENCY: Maintain exact duration as specified by user",
+                "5. MULTI-DAY STRUCTURE: Create one separate daily schedule for every requested day",
+                "6. BLOCKED TIME: Never schedule anything that overlaps BLOCKED TIME listed in the request"
+            ]),
+            "=== WHEN DAILY THEMES ARE GIVEN ===\nTHEME IMPLEMENTATION RULES:\n" + theme_rules
+            + "\n" + PromptGenerator.TASK_DISTRIBUTION_RULES,
+            "=== WHEN A USER CHAT REQUEST IS GIVEN ===\n"
+            "Start from the existing schedule structure, modify only what the user requested and keep "
+            "everything else that works.\n" + PromptGenerator.REQUEST_PARSING_RULES,
+            PromptGenerator.SCHEDULING_ALGORITHM,
+            PromptGenerator.CIRCADIAN_RULES,
+            PromptGenerator.DAILY_STRUCTURE,
+            PromptGenerator.MULTI_DAY_RULES + "\n(Apply these only to schedules of more than one day.)",
+            PromptGenerator.OPTIMIZATION_RULES,
+            PromptGenerator._build_output_section()
+        ])
+
+    @staticmethod
+    def generate_schedule_request(tasks: List[Dict], preferences: Dict) -> str:
+        """Generate the request-specific part of the schedule prompt
+
+        Sent on its own when static_schedule_instructions is cached.
+        """
+        num_days = PromptGenerator._parse_schedule_duration(
+            preferences.get('schedule_duration', '1 day (Single day)'))
+        daily_themes = PromptGenerator._get_daily_themes(num_days)
+        user_request = preferences.get('user_schedule_request')
+
+        sections = [
+            f"Create a {num_days}-day schedule for the {PromptGenerator._describe_days(num_days)}. "
+            f"Create exactly {num_days} day objects in the optimized_schedule array.",
+            "=== USER TASKS TO OPTIMIZE (duration in minutes) ===\n"
+            + PromptGenerator._encode_task_table(PromptGenerator._build_task_details(tasks)),
+            PromptGenerator._build_theme_section(daily_themes) if num_days > 2 else "",
+            "\n".join([
+                "=== USER PRODUCTIVITY PROFILE ===",
+                f"Peak Performance Hours: {preferences.get('peak_hours', 'Morning')}",
+                f"Optimal Break Duration: {preferences.get('break_time', '15 minutes')}",
+                f"Work Priority Focus: {preferences.get('work_type', 'Important work')}",
+                f"Schedule Flexibility: {preferences.get('flexibility', 3)}/5 (1=rigid, 5=very flexible)"
+            ]),
+            PromptGenerator._build_busy_section(preferences, list(range(1, num_days + 1))),
+            PromptGenerator._build_request_section(user_request, num_days) if user_request else ""
+        ]
+        return "\n\n".join(section for section in sections if section)
+
+    @staticmethod
+    def generate_day_prompt(tasks: List[Dict], preferences: Dict, day_number: int,
+                            num_days: int, day_name: str, theme: Dict) -> str:
+        """Generate a prompt for one day of a multi-day schedule
+
+        Used by split-and-merge generation: tasks are already assigned to the
+        day, so the model only has to place them within a single 24 hours.
+        """
+        task_details = PromptGenerator._build_task_details(tasks)
+
+        user_request = preferences.get('user_schedule_request')
+        request_section = ""
+        if user_request:
+            request_section = "\n".join([
+                "=== USER CHAT REQUEST ===",
+                "Apply this request where it concerns this day, keeping everything else valid:",
+                f"USER REQUEST: {user_request}"
+            ])
+
+        example_day = {
+            "day": day_number,
+            "day_name": day_name,
+            "theme": theme.get('theme', 'Balanced'),
+            "focus": theme.get('focus', 'Mixed tasks'),
+            "energy_pattern": theme.get('energy', 'Steady'),
+            "tasks": [{
+                "task_name": "[Task Name]",
+                "start_time": "HH:MM",
+                "end_time": "HH:MM",
+                "priority": "[exact user priority or essential]",
+                "category": "[exact user category]",
+                "notes": "Why this slot was chosen"
+            }]
+        }
+
+        sections = [
+            "\n".join([
+                f"You are Chrona AI, an expert schedule optimization system. Create the schedule for day {day_number} of a {num_days}-day plan.",
+                "=== CRITICAL TECHNICAL REQUIREMENTS ===",
+                "1. TIME FORMAT: ONLY use HH:MM format (00:00 to 23:59). NEVER use 24:00 - use 00:00 for midnight",
+                "2. PRECISION: No overlapping times within the day",
+                "3. CONSISTENCY: Maintain exact duration as specified by user",
+                "4. COMPLETENESS: Schedule every task listed below on this day"
+            ]),
+            "\n".join([
+                "=== DAY ===",
+                f"Day {day_number}: {day_name}",
+                f"Theme: {theme.get('theme', 'Balanced')} - Focus on {theme.get('focus', 'Mixed tasks')} "
+                f"with {theme.get('energy', 'Steady')} energy"
+            ]),
+            "=== USER TASKS FOR THIS DAY (duration in minutes) ===\n" + PromptGenerator._encode_task_table(task_details),
+            "\n".join([
+                "=== USER PRODUCTIVITY PROFILE ===",
+                f"Peak Performance Hours: {preferences.get('peak_hours', 'Morning')}",
+                f"Optimal Break Duration: {preferences.get('break_time', '15 minutes')}",
+                f"Work Priority Focus: {preferences.get('work_type', 'Important work')}",
+                f"Schedule Flexibility: {preferences.get('flexibility', 3)}/5 (1=rigid, 5=very flexible)"
+            ]),
+            PromptGenerator._build_busy_section(preferences, [day_number]),
+            request_section,
+            PromptGenerator.DAILY_STRUCTURE + "\nHonor specific times mentioned in task notes and preferred_time windows.",
+            "\n".join([
+                "=== OUTPUT REQUIREMENTS ===",
+                "Return ONLY valid JSON for this single day. NO additional text or explanations.",
+                json.dumps(example_day, ensure_ascii=False, separators=(",", ":"))
+            ])
+        ]
+        return "\n\n".join(section for section in sections if section)
+
+    @staticmethod
+    def generate_patch_prompt(schedule_table: str, preferences: Dict) -> str:
+        """Generate a prompt asking for only the entries a chat request changes
+
+        schedule_table is the existing schedule as encoded by
+        SchedulePatch.encode_schedule.
+        """
+        num_days = PromptGenerator._parse_schedule_duration(
+            preferences.get('schedule_duration', '1 day (Single day)'))
+
+        sections = [
+            "You are Chrona AI, an expert schedule optimization system. Edit the user's existing schedule "
+            "to satisfy their request with as few changes as possible.",
+            "=== CURRENT SCHEDULE ===\n" + schedule_table,
+            PromptGenerator._build_busy_section(preferences, list(range(1, num_days + 1))),
+            f"=== USER REQUEST ===\n{preferences.get('user_schedule_request', '')}",
+            "\n".join([
+                "=== PATCH RULES ===",
+                "- Return ONLY the operations needed; never repeat entries that stay the same",
+                "- update: give day and index of the entry, plus every field that changes",
+                "- remove: give day and index of the entry",
+                "- add: give day, task_name, start_time, end_time, priority and category (index null)",
+                "- Day and index always refer to the CURRENT SCHEDULE table above",
+                "- If the change needs room, also move or shorten the neighbouring entries",
+                "- Edited days must have no overlapping entries and must not overlap BLOCKED TIME",
+                "- TIME FORMAT: ONLY HH:MM (00:00 to 23:59), never 24:00",
+                "- Keep each task's duration unless the user asks to change it"
+            ])
+        ]
+        return "\n\n".join(section for section in sections if section)
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """Content-addressed cache for parsed AI responses.
+
+    Entries are keyed by a SHA-256 hash of the model name and prompt text.
+    A bounded in-memory LRU tier serves repeated requests within a process,
+    and an optional SQLite tier keeps responses across restarts. Both tiers
+    honour the same TTL.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: int = 86400,
+                 db_path: Optional[str] = None, max_disk_entries: int = 1000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.db_path:
+            self._init_db()
+
+    @classmethod
+    def shared(cls) -> "ResponseCache":
+        """Get the process-wide cache configured from the environment"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    max_entries=int(os.getenv("CHRONA_CACHE_MAX_ENTRIES", "128")),
+                    ttl_seconds=int(os.getenv("CHRONA_CACHE_TTL_SECONDS", "86400")),
+                    db_path=os.getenv("CHRONA_CACHE_DB") or None
+                )
+            return cls._shared
+
+    @staticmethod
+    def make_key(prompt: str, model: str = "") -> str:
+        """Build a stable cache key from the model name and prompt"""
+        return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached response for key, or None on a miss"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(payload)
+                del self._memory[key]
+
+        payload = self._disk_get(key, now)
+        if payload is None:
+            self.misses += 1
+            return None
+
+        # Promote disk hits into the memory tier
+        self._memory_set(key, payload, now + self.ttl_seconds)
+        self.hits += 1
+        return json.loads(payload)
+
+    def set(self, key: str, value: Dict):
+        """Store a parsed response under key in every enabled tier"""
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+
+        self._memory_set(key, payload, expires_at)
+        self._disk_set(key, payload, now, expires_at)
+
+    def clear(self):
+        """Remove all entries from every tier"""
+        with self._lock:
+            self._memory.clear()
+
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM response_cache")
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters and the current memory tier size"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "disk_enabled": bool(self.db_path)
+        }
+
+    def _memory_set(self, key: str, payload: str, expires_at: float):
+        with self._lock:
+            self._memory[key] = (expires_at, payload)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_response_cache_access ON response_cache (last_access)"
+            )
+
+    def _disk_get(self, key: str, now: float) -> Optional[str]:
+        if not self.db_path:
+            return None
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT payload, expires_at FROM response_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row[1] <= now:
+                    conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                    return None
+                conn.execute(
+                    "UPDATE response_cache SET last_access = ? WHERE key = ?", (now, key)
+                )
+                return row[0]
+        except sqlite3.Error:
+            return None
+
+    def _disk_set(self, key: str, payload: str, now: float, expires_at: float):
+        if not self.db_path:
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, payload, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, payload, expires_at, now)
+                )
+                # Evict expired entries, then the least recently used beyond the limit
+                conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+                conn.execute(
+                    "DELETE FROM response_cache WHERE key IN ("
+                    "SELECT key FROM response_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,)
+                )
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,126 @@
+from typing import Any, Dict, Optional
+
+from models.schedule_model import ENTRY_FIELDS, MINUTES_PER_DAY, Schedule, ScheduleEntry
+from services.schedule_validator import ScheduleValidator
+from services.structured_output import StructuredOutput
+
+
+class SchedulePatch:
+    """Incremental edits of an existing schedule.
+
+    For a chat request the model sees the current schedule as a compact
+    table and returns only the entries that change, addressed by day and
+    row index. The patch is applied locally to a copy of the schedule, so
+    a small tweak costs a few entries of output instead of a full schedule.
+    Patches that reference unknown entries, carry unusable times or add
+    overlaps are rejected and the caller regenerates the schedule instead.
+    """
+
+    COLUMNS = ("day", "index", "start", "end", "task_name", "priority", "category")
+
+    OPERATIONS = ("update", "remove", "add")
+
+    @staticmethod
+    def encode_schedule(result: Dict) -> str:
+        """Encode a schedule as a pipe-separated table of addressable entries"""
+        def cell(value):
+            return " ".join(str(value).split()).replace("|", "/") if value not in (None, "") else "-"
+
+        rows = [" | ".join(SchedulePatch.COLUMNS)]
+        for day in result.get("optimized_schedule", []):
+            for index, task in enumerate(day.get("tasks", [])):
+                rows.append(" | ".join(cell(value) for value in (
+                    day.get("day"), index, task.get("start_time"), task.get("end_time"),
+                    task.get("task_name"), task.get("priority"), task.get("category")
+                )))
+        return "\n".join(rows)
+
+    @staticmethod
+    def apply(result: Dict, patch: Any) -> Optional[Dict]:
+        """
+        Apply a patch to a copy of a schedule.
+
+        Updates and removals refer to row indexes of the schedule as sent, so
+        they are resolved before any entry moves; additions come last and
+        every edited day is re-sorted by start time.
+
+        Args:
+            result: Existing optimization result
+            patch: Parsed patch with an "operations" list
+
+        Returns:
+            dict: The edited result, or None if the patch is empty or invalid
+        """
+        if not isinstance(patch, dict) or not isinstance(patch.get("operations"), list):
+            return None
+        operations = patch["operations"]
+        if not operations or not isinstance(result, dict):
+            return None
+
+        try:
+            schedule = Schedule.from_result(result)
+        except (ValueError, AttributeError, TypeError):
+            return None
+        days = {day.day: day for day in schedule.days}
+        updates = {}
+        removals = set()
+        additions = []
+        for operation in operations:
+            if not isinstance(operation, dict) or operation.get("op") not in SchedulePatch.OPERATIONS:
+                return None
+            day = days.get(operation.get("day"))
+            if day is None:
+                return None
+            if operation["op"] == "add":
+                additions.append((day, operation))
+                continue
+            index = operation.get("index")
+            if not isinstance(index, int) or not 0 <= index < len(day.entries):
+                return None
+            if operation["op"] == "remove":
+                removals.add((day.day, index))
+            else:
+                updates[(day.day, index)] = operation
+
+        edited = {number for number, _ in list(updates) + list(removals)}
+        edited.update(day.day for day, _ in additions)
+        conflicts_before = {number: len(ScheduleValidator.detect_schedule_conflicts(days[number].entries))
+                            for number in edited}
+
+        for (number, index), operation in updates.items():
+            entry = SchedulePatch._entry(operation, days[number].entries[index].to_dict())
+            if entry is None:
+                return None
+            days[number].entries[index] = entry
+        for number in edited:
+            days[number].entries = [entry for index, entry in enumerate(days[number].entries)
+                                    if (number, index) not in removals]
+        for day, operation in additions:
+            entry = SchedulePatch._entry(operation, {})
+            if entry is None:
+                return None
+            day.entries.append(entry)
+
+        for number in edited:
+            day = days[number]
+            # Blocks running in from the previous night (sleep) stay at the top
+            day.entries.sort(key=lambda entry: entry.start - (MINUTES_PER_DAY if entry.crosses_midnight else 0))
+            # Keep whatever overlaps the schedule already had, but never add new ones
+            if len(ScheduleValidator.detect_schedule_conflicts(day.entries)) > conflicts_before[number]:
+                return None
+        return schedule.to_result()
+
+    @staticmethod
+    def _entry(operation: Dict, base: Dict) -> Optional[ScheduleEntry]:
+        """Build an entry from base with the fields the operation sets, or None if unusable"""
+        fields = dict(base)
+        fields.update({key: operation[key] for key in ENTRY_FIELDS if operation.get(key) not in (None, "")})
+        if not fields.get("task_name") or "start_time" not in fields or "end_time" not in fields:
+            return None
+        try:
+            fields["start_time"] = StructuredOutput.repair_clock(fields["start_time"])
+            fields["end_time"] = StructuredOutput.repair_clock(fields["end_time"])
+            entry = ScheduleEntry.from_dict(fields)
+        except (ValueError, AttributeError, TypeError):
+            return None
+        return entry if entry.duration_minutes > 0 else None
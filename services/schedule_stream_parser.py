@@ -0,0 +1,111 @@
+import json
+from typing import Dict, List, Optional
+
+
+class ScheduleStreamParser:
+    """Incremental JSON parser for streamed schedule responses.
+
+    Text chunks are fed as they arrive from the model. The parser tracks
+    string/escape state and nesting depth in a single pass, and hands back
+    each element of the top-level ``optimized_schedule`` array as soon as
+    its closing brace has been received. Anything before the first ``{``
+    (prose, code fences) is ignored.
+    """
+
+    SCHEDULE_KEY = "optimized_schedule"
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._root_start = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_key = None
+        self._array_depth = None
+        self._day_start = None
+        self._root_end = None
+        self.days = []
+
+    def feed(self, chunk: Optional[str]) -> List[Dict]:
+        """Consume a chunk of text and return any day objects completed by it"""
+        if not chunk:
+            return []
+
+        self._text += chunk
+        completed = []
+
+        text = self._text
+        for i in range(self._pos, len(text)):
+            char = text[i]
+
+            if self._root_start is None:
+                if char == "{":
+                    self._root_start = i
+                    self._depth = 1
+                continue
+
+            if self._root_end is not None:
+                break
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = text[self._string_start + 1:i]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char in "{[":
+                if char == "{" and self._array_depth is not None and self._depth == self._array_depth:
+                    self._day_start = i
+                if char == "[" and self._depth == 1 and self._last_key == self.SCHEDULE_KEY:
+                    self._array_depth = 2
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if char == "}" and self._day_start is not None and self._depth == self._array_depth:
+                    day = self._parse(text[self._day_start:i + 1])
+                    self._day_start = None
+                    if isinstance(day, dict):
+                        self.days.append(day)
+                        completed.append(day)
+                elif char == "]" and self._depth == 1 and self._array_depth == 2:
+                    # The schedule array is closed; later arrays are not days
+                    self._array_depth = None
+                if self._depth == 0:
+                    self._root_end = i
+
+        self._pos = len(text)
+        return completed
+
+    def result(self) -> Optional[Dict]:
+        """Parse the complete response once streaming has finished"""
+        if self._root_start is None:
+            return None
+
+        end = self._text.rfind("}")
+        if end < self._root_start:
+            return None
+
+        result = self._parse(self._text[self._root_start:end + 1])
+        return result if isinstance(result, dict) else None
+
+    @property
+    def text(self) -> str:
+        """All text received so far"""
+        return self._text
+
+    @staticmethod
+    def _parse(fragment: str):
+        try:
+            return json.loads(fragment)
+        except json.JSONDecodeError:
+            return None
@@ -1,6 +1,8 @@
 
-import datetime
-from typing import List, Dict
+from typing import List, Dict, Union
+
+from models.schedule_model import ScheduleEntry
+from services.interval_index import IntervalIndex
 
 class ScheduleValidator:
     """Service for validating schedules and detecting conflicts"""
@@ -23,21 +25,17 @@ class ScheduleValidator:
         return errors
 
     @staticmethod
-    def detect_schedule_conflicts(schedule: List[Dict]) -> List[str]:
-        """Detect time conflicts in schedule"""
-        conflicts = []
-
-        for i, task1 in enumerate(schedule):
-            for j, task2 in enumerate(schedule[i + 1:], i + 1):
-                start1 = datetime.datetime.strptime(task1.get('start_time', '00:00'), '%H:%M').time()
-                end1 = datetime.datetime.strptime(task1.get('end_time', '00:00'), '%H:%M').time()
-                start2 = datetime.datetime.strptime(task2.get('start_time', '00:00'), '%H:%M').time()
-                end2 = datetime.datetime.strptime(task2.get('end_time', '00:00'), '%H:%M').time()
-
-                # Check for overlap
-                if (start1 < end2 and start2 < end1):
-                    conflicts.append(
-                        f"Time conflict between '{task1.get('task_name')}' and '{task2.get('task_name')}'"
-                    )
-
-        return conflicts
+    def detect_schedule_conflicts(schedule: List[Union[Dict, ScheduleEntry]]) -> List[str]:
+        """Detect time conflicts in schedule entries (dicts or parsed ScheduleEntry objects)"""
+        # Parse each entry once, then sweep the sorted intervals for overlaps
+        index = IntervalIndex.from_entries(schedule)
+
+        names = [
+            entry.task_name if isinstance(entry, ScheduleEntry) else entry.get('task_name')
+            for entry in schedule
+        ]
+
+        return [
+            f"Time conflict between '{names[i]}' and '{names[j]}'"
+            for i, j in sorted(index.overlapping_pairs())
+        ]
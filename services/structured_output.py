@@ -0,0 +1,239 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from models.schedule_model import DaySchedule, Schedule, ScheduleEntry, format_clock, parse_clock
+
+
+def _object(properties: Dict[str, Dict], required: List[str]) -> Dict:
+    """Build an OBJECT schema whose properties are generated in the given order"""
+    return {
+        "type": "OBJECT",
+        "properties": properties,
+        "required": required,
+        "property_ordering": list(properties)
+    }
+
+
+_STRING = {"type": "STRING"}
+
+_ENTRY_SCHEMA = _object({
+    "task_name": _STRING,
+    "start_time": {"type": "STRING", "description": "HH:MM, 00:00 to 23:59"},
+    "end_time": {"type": "STRING", "description": "HH:MM, 00:00 to 23:59"},
+    "priority": _STRING,
+    "category": _STRING,
+    "notes": _STRING
+}, ["task_name", "start_time", "end_time", "priority", "category"])
+
+_DAY_SCHEMA = _object({
+    "day": {"type": "INTEGER"},
+    "day_name": _STRING,
+    "theme": _STRING,
+    "focus": _STRING,
+    "energy_pattern": _STRING,
+    "tasks": {"type": "ARRAY", "items": _ENTRY_SCHEMA}
+}, ["day", "day_name", "tasks"])
+
+
+class StructuredOutput:
+    """JSON-mode requests and local repair of model responses.
+
+    Requests carry a response schema and the JSON MIME type, so the model
+    returns bare JSON in the schedule shape and responses are parsed with a
+    single ``json.loads``. Anything that still fails to parse or validate
+    (truncated output, stray prose, a bad time) is repaired locally, keeping
+    every usable day and entry instead of discarding the whole response.
+    """
+
+    MIME_TYPE = "application/json"
+
+    DAY_SCHEMA = _DAY_SCHEMA
+
+    SCHEDULE_SCHEMA = _object({
+        "optimized_schedule": {"type": "ARRAY", "items": _DAY_SCHEMA},
+        "daily_summary": _object({
+            "total_work_time": _STRING,
+            "personal_time": _STRING,
+            "sleep_time": _STRING,
+            "meal_time": _STRING,
+            "exercise_time": _STRING,
+            "free_time": _STRING,
+            "productivity_score": {"type": "INTEGER"},
+            "daily_themes": {"type": "ARRAY", "items": _STRING},
+            "recommendations": {"type": "ARRAY", "items": _STRING}
+        }, ["total_work_time", "productivity_score", "recommendations"])
+    }, ["optimized_schedule", "daily_summary"])
+
+    TASK_LIST_SCHEMA = {
+        "type": "ARRAY",
+        "items": _object({
+            "name": _STRING,
+            "duration": {"type": "INTEGER", "description": "Minutes"},
+            "priority": {"type": "STRING", "enum": ["high", "medium", "low"]},
+            "category": _STRING,
+            "notes": _STRING,
+            "preferred_time": _STRING,
+            "deadline": {"type": "STRING", "nullable": True, "description": "YYYY-MM-DD"}
+        }, ["name", "duration", "priority", "category"])
+    }
+
+    PATCH_SCHEMA = _object({
+        "operations": {"type": "ARRAY", "items": _object({
+            "op": {"type": "STRING", "enum": ["update", "remove", "add"]},
+            "day": {"type": "INTEGER"},
+            "index": {"type": "INTEGER", "nullable": True, "description": "Row index within the day; null for add"},
+            "task_name": _STRING,
+            "start_time": {"type": "STRING", "description": "HH:MM, 00:00 to 23:59"},
+            "end_time": {"type": "STRING", "description": "HH:MM, 00:00 to 23:59"},
+            "priority": _STRING,
+            "category": _STRING,
+            "notes": _STRING
+        }, ["op", "day"])}
+    }, ["operations"])
+
+    @staticmethod
+    def config(schema: Dict) -> Dict:
+        """Build the generate_content config requesting JSON that matches schema"""
+        return {"response_mime_type": StructuredOutput.MIME_TYPE, "response_schema": schema}
+
+    @staticmethod
+    def load(text: Optional[str]) -> Any:
+        """Parse a JSON response, repairing it locally if it is not valid as-is"""
+        if not text:
+            return None
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+        repaired = StructuredOutput.repair_json(text)
+        if repaired is None:
+            return None
+        try:
+            return json.loads(repaired)
+        except json.JSONDecodeError:
+            return None
+
+    @staticmethod
+    def repair_json(text: str) -> Optional[str]:
+        """Recover the JSON value in a response in one pass
+
+        Skips anything before the first ``{`` or ``[`` (prose, code fences)
+        and after the value ends, drops trailing commas, and cuts truncated
+        output back to the last complete object or array before closing
+        every bracket still open.
+        """
+        starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+        if not starts:
+            return None
+
+        out = []
+        stack = []
+        in_string = False
+        escape = False
+        # Output length and open brackets right after the last complete container
+        checkpoint = None
+
+        for char in text[min(starts):]:
+            if in_string:
+                out.append(char)
+                if escape:
+                    escape = False
+                elif char == "\\":
+                    escape = True
+                elif char == '"':
+                    in_string = False
+                continue
+
+            if char == '"':
+                in_string = True
+            elif char in "{[":
+                stack.append("}" if char == "{" else "]")
+            elif char in "}]":
+                if not stack or char != stack[-1]:
+                    break
+                StructuredOutput._strip_trailing_comma(out)
+                stack.pop()
+                out.append(char)
+                if not stack:
+                    return "".join(out)
+                checkpoint = (len(out), list(stack))
+                continue
+            out.append(char)
+
+        # Truncated: keep everything up to the last complete container
+        if checkpoint is None:
+            return None
+        length, open_brackets = checkpoint
+        out = out[:length]
+        StructuredOutput._strip_trailing_comma(out)
+        return "".join(out) + "".join(reversed(open_brackets))
+
+    @staticmethod
+    def _strip_trailing_comma(out: List[str]):
+        """Remove whitespace and one trailing comma from the end of the output"""
+        while out and out[-1].isspace():
+            out.pop()
+        if out and out[-1] == ",":
+            out.pop()
+
+    @staticmethod
+    def repair_clock(value: Any) -> str:
+        """Normalize times like '9:00', '09:00:00' or '9:30 PM' to HH:MM"""
+        text = str(value).strip().upper()
+        suffix = text[-2:] if text.endswith(("AM", "PM")) else ""
+        minutes = parse_clock(text[:-2].strip() if suffix else text)
+        if suffix:
+            hours = (minutes // 60) % 12 + (12 if suffix == "PM" else 0)
+            minutes = hours * 60 + minutes % 60
+        return format_clock(minutes % (24 * 60))
+
+    @staticmethod
+    def repair_day(day: Any) -> Optional[Dict]:
+        """Parse one day into the schedule model, dropping entries with unusable times
+
+        Returns the canonical day dict, or None if no entry survives.
+        """
+        if not isinstance(day, dict) or not isinstance(day.get("tasks"), list):
+            return None
+
+        entries = []
+        for task in day["tasks"]:
+            if not isinstance(task, dict):
+                continue
+            try:
+                entries.append(ScheduleEntry.from_dict(dict(
+                    task,
+                    start_time=StructuredOutput.repair_clock(task.get("start_time", "")),
+                    end_time=StructuredOutput.repair_clock(task.get("end_time", ""))
+                )))
+            except (ValueError, AttributeError, TypeError):
+                continue
+        if not entries:
+            return None
+
+        try:
+            parsed = DaySchedule.from_dict(dict(day, tasks=[]))
+        except (ValueError, AttributeError, TypeError):
+            return None
+        parsed.entries = entries
+        return parsed.to_dict()
+
+    @staticmethod
+    def repair_schedule(result: Any) -> Optional[Dict]:
+        """Parse a full response into the schedule model, keeping every usable day
+
+        Returns the result with canonical HH:MM times, or None if it has no
+        usable day at all.
+        """
+        if not isinstance(result, dict) or not isinstance(result.get("optimized_schedule"), list):
+            return None
+
+        days = [StructuredOutput.repair_day(day) for day in result["optimized_schedule"]]
+        days = [day for day in days if day is not None]
+        if not days:
+            return None
+
+        summary = result.get("daily_summary")
+        schedule = Schedule.from_result(dict(result, optimized_schedule=days,
+                                             daily_summary=summary if isinstance(summary, dict) else None))
+        return schedule.to_result()
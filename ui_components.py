@@ -1,14 +1,27 @@
 # Main UI components module - now uses modular imports
+import importlib
+
 from components.header import render_header, render_footer
 from components.preferences import render_preferences_sidebar
-from components.task_form import render_task_form
-from components.task_list import render_task_list
-from components.schedule_display import render_schedule_results
-from components.schedule_feedback import render_schedule_feedback, get_feedback_status, clear_feedback
 from components.styles import load_custom_styles
 
-# Load styles when module is imported
-load_custom_styles()
+# Components that pull in pandas/matplotlib are imported on first access
+_LAZY_COMPONENTS = {
+    'render_task_form': 'components.task_form',
+    'render_task_list': 'components.task_list',
+    'render_schedule_results': 'components.schedule_display',
+    'render_schedule_feedback': 'components.schedule_feedback',
+    'get_feedback_status': 'components.schedule_feedback',
+    'clear_feedback': 'components.schedule_feedback'
+}
+
+def __getattr__(name):
+    """Import heavy components the first time they are requested"""
+    if name in _LAZY_COMPONENTS:
+        value = getattr(importlib.import_module(_LAZY_COMPONENTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Re-export all components for backward compatibility
 __all__ = [
@@ -20,5 +33,6 @@ __all__ = [
     'render_schedule_results',
     'render_schedule_feedback',
     'get_feedback_status',
-    'clear_feedback'
+    'clear_feedback',
+    'load_custom_styles'
 ]
\ No newline at end of file